@@ -0,0 +1,57 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.spatial import autogenerate_filter
+
+config = context.config
+# Callers that own logging (tests, app code running migrations) set attributes['configure_logger'] = False.
+if config.config_file_name is not None and config.attributes.get('configure_logger', True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    # `-x database_url=...` or a URL set on the Config wins over the app settings.
+    x_args = context.get_x_argument(as_dictionary=True)
+    return x_args.get('database_url') or config.get_main_option('sqlalchemy.url') or get_settings().database_url
+
+
+def run_migrations_offline() -> None:
+    context.configure(url=database_url(), target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = config.attributes.get('connection')
+    if connectable is not None:
+        context.configure(
+            connection=connectable,
+            target_metadata=target_metadata,
+            include_object=autogenerate_filter(connectable.dialect.name),
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(database_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=autogenerate_filter(connection.dialect.name),
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
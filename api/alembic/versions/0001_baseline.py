@@ -0,0 +1,180 @@
+"""Baseline schema, exactly as `Base.metadata.create_all` built it before migrations were introduced.
+
+Databases that were built with `create_all` back then are stamped at this revision
+(`alembic stamp 0001`) instead of upgraded through it. Do not add objects here; later
+schema goes in its own revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0001'
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+JOB_TYPE_ENUM = sa.Enum(
+    'ingest_satellite',
+    'compute_ndvi',
+    'aggregate_ndvi',
+    'fetch_weather',
+    'generate_recommendations',
+    'cleanup_artifacts',
+    name='job_type_enum',
+)
+JOB_STATUS_ENUM = sa.Enum('running', 'success', 'failed', name='job_status_enum')
+QUALITY_FLAG_ENUM = sa.Enum('OK', 'CLOUDY', 'NO_DATA', name='quality_flag_enum')
+REC_TYPE_ENUM = sa.Enum('GRAZE_NOW', 'AVOID_WATERLOG', 'MONITOR_STRESS', 'LOW_DATA', name='rec_type_enum')
+SEVERITY_ENUM = sa.Enum('info', 'warning', name='severity_enum')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'config_thresholds',
+        sa.Column('key', sa.String(length=100), nullable=False),
+        sa.Column('value', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_table(
+        'farms',
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'job_runs',
+        sa.Column('job_type', JOB_TYPE_ENUM, nullable=False),
+        sa.Column('farm_id', sa.String(length=36), nullable=True),
+        sa.Column('status', JOB_STATUS_ENUM, nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('stats_json', sa.JSON(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(['farm_id'], ['farms.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_job_runs_farm_id', 'job_runs', ['farm_id'])
+    op.create_index('ix_job_runs_job_type', 'job_runs', ['job_type'])
+    op.create_index('ix_job_runs_status', 'job_runs', ['status'])
+    op.create_table(
+        'paddocks',
+        sa.Column('farm_id', sa.String(length=36), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('geom_geojson', sa.JSON(), nullable=False),
+        sa.Column('area_ha', sa.Float(), nullable=False),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['farm_id'], ['farms.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_paddocks_farm_id', 'paddocks', ['farm_id'])
+    op.create_table(
+        'recommendations',
+        sa.Column('farm_id', sa.String(length=36), nullable=False),
+        sa.Column('created_for_week_start', sa.Date(), nullable=False),
+        sa.Column('summary_md', sa.Text(), nullable=False),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['farm_id'], ['farms.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('farm_id', 'created_for_week_start', name='uq_farm_week'),
+    )
+    op.create_index('ix_recommendations_created_for_week_start', 'recommendations', ['created_for_week_start'])
+    op.create_index('ix_recommendations_farm_id', 'recommendations', ['farm_id'])
+    op.create_table(
+        'satellite_scenes',
+        sa.Column('farm_id', sa.String(length=36), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=False),
+        sa.Column('scene_date', sa.Date(), nullable=False),
+        sa.Column('cloud_pct', sa.Float(), nullable=True),
+        sa.Column('red_uri', sa.String(length=1024), nullable=True),
+        sa.Column('nir_uri', sa.String(length=1024), nullable=True),
+        sa.Column('mask_uri', sa.String(length=1024), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['farm_id'], ['farms.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('farm_id', 'scene_date', 'source', name='uq_farm_scene_source'),
+    )
+    op.create_index('ix_satellite_scenes_farm_id', 'satellite_scenes', ['farm_id'])
+    op.create_index('ix_satellite_scenes_scene_date', 'satellite_scenes', ['scene_date'])
+    op.create_table(
+        'weather_daily',
+        sa.Column('farm_id', sa.String(length=36), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('rain_mm', sa.Float(), nullable=False),
+        sa.Column('temp_min_c', sa.Float(), nullable=False),
+        sa.Column('temp_max_c', sa.Float(), nullable=False),
+        sa.Column('wind_kph', sa.Float(), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(['farm_id'], ['farms.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_weather_daily_date', 'weather_daily', ['date'])
+    op.create_index('ix_weather_daily_farm_id', 'weather_daily', ['farm_id'])
+    op.create_index('ix_weather_daily_fetched_at', 'weather_daily', ['fetched_at'])
+    op.create_table(
+        'paddock_observations',
+        sa.Column('paddock_id', sa.String(length=36), nullable=False),
+        sa.Column('obs_date', sa.Date(), nullable=False),
+        sa.Column('ndvi_mean', sa.Float(), nullable=False),
+        sa.Column('ndvi_p10', sa.Float(), nullable=True),
+        sa.Column('ndvi_p50', sa.Float(), nullable=True),
+        sa.Column('ndvi_p90', sa.Float(), nullable=True),
+        sa.Column('cloud_pct', sa.Float(), nullable=True),
+        sa.Column('quality_flag', QUALITY_FLAG_ENUM, nullable=False),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['paddock_id'], ['paddocks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('paddock_id', 'obs_date', name='uq_paddock_obs_date'),
+    )
+    op.create_index('ix_paddock_observations_obs_date', 'paddock_observations', ['obs_date'])
+    op.create_index('ix_paddock_observations_paddock_id', 'paddock_observations', ['paddock_id'])
+    op.create_table(
+        'paddock_recommendations',
+        sa.Column('recommendation_id', sa.String(length=36), nullable=False),
+        sa.Column('paddock_id', sa.String(length=36), nullable=False),
+        sa.Column('rec_type', REC_TYPE_ENUM, nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('severity', SEVERITY_ENUM, nullable=False),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['paddock_id'], ['paddocks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['recommendation_id'], ['recommendations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_paddock_recommendations_recommendation_id', 'paddock_recommendations', ['recommendation_id']
+    )
+
+
+def downgrade() -> None:
+    for table in (
+        'paddock_recommendations',
+        'paddock_observations',
+        'weather_daily',
+        'satellite_scenes',
+        'recommendations',
+        'paddocks',
+        'job_runs',
+        'farms',
+        'config_thresholds',
+    ):
+        op.drop_table(table)
+    # Dropping a table leaves PostgreSQL enum types behind.
+    for enum in (JOB_TYPE_ENUM, JOB_STATUS_ENUM, QUALITY_FLAG_ENUM, REC_TYPE_ENUM, SEVERITY_ENUM):
+        enum.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,136 @@
+"""Denormalize farm_id onto paddock_observations and add farm/date and paddock/date-desc indexes.
+
+On PostgreSQL nothing here holds a lock that blocks reads or writes for longer than a
+catalog update:
+
+* the column is added nullable without a default (metadata only);
+* the backfill walks the primary key in batches, committing each one, so only the rows
+  of the current batch are locked;
+* the foreign key is added NOT VALID and validated afterwards, which only takes a SHARE
+  UPDATE EXCLUSIVE lock;
+* the NOT NULL rule is a NOT VALID check added after the backfill, validated the same
+  way, and SET NOT NULL then reuses it instead of scanning the table (PostgreSQL 12+);
+* indexes are built and dropped CONCURRENTLY.
+
+Code that predates the column can keep writing observations during the backfill; a sweep
+fills those rows. From the moment the check is added, writes without farm_id are rejected,
+so stop the old observation writers (the Celery workers) before running this revision or
+accept that their jobs fail until the new code is deployed. Tune with
+`-x backfill_batch_size=50000` and `-x backfill_pause_ms=0`. Other dialects (SQLite in
+development) rebuild the table instead.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+import time
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import context, op
+
+revision: str = '0002'
+down_revision: str | None = '0001'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+FK_NAME = 'fk_paddock_observations_farm_id_farms'
+NOT_NULL_CHECK = 'ck_paddock_observations_farm_id_not_null'
+FARM_DATE_INDEX = 'ix_paddock_observations_farm_obs_date'
+PADDOCK_DATE_DESC_INDEX = 'ix_paddock_observations_paddock_obs_date_desc'
+PADDOCK_INDEX = 'ix_paddock_observations_paddock_id'
+
+NEXT_BATCH_END = sa.text(
+    'SELECT max(id) FROM (SELECT id FROM paddock_observations WHERE id > :after ORDER BY id LIMIT :size) AS batch'
+)
+FILL_FARM_ID = (
+    'UPDATE paddock_observations SET farm_id = '
+    '(SELECT paddocks.farm_id FROM paddocks WHERE paddocks.id = paddock_observations.paddock_id) '
+    'WHERE farm_id IS NULL'
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        _upgrade_postgresql()
+    else:
+        _upgrade_generic()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(PADDOCK_INDEX, 'paddock_observations', ['paddock_id'], postgresql_concurrently=True)
+            op.drop_index(PADDOCK_DATE_DESC_INDEX, 'paddock_observations', postgresql_concurrently=True)
+            op.drop_index(FARM_DATE_INDEX, 'paddock_observations', postgresql_concurrently=True)
+        op.drop_column('paddock_observations', 'farm_id')
+        return
+
+    op.create_index(PADDOCK_INDEX, 'paddock_observations', ['paddock_id'])
+    op.drop_index(PADDOCK_DATE_DESC_INDEX, 'paddock_observations')
+    op.drop_index(FARM_DATE_INDEX, 'paddock_observations')
+    with op.batch_alter_table('paddock_observations') as batch:
+        batch.drop_constraint(FK_NAME, type_='foreignkey')
+        batch.drop_column('farm_id')
+
+
+def _upgrade_postgresql() -> None:
+    op.add_column('paddock_observations', sa.Column('farm_id', sa.String(length=36), nullable=True))
+    op.execute(
+        f'ALTER TABLE paddock_observations ADD CONSTRAINT {FK_NAME} '
+        'FOREIGN KEY (farm_id) REFERENCES farms (id) ON DELETE CASCADE NOT VALID'
+    )
+
+    with op.get_context().autocommit_block():
+        _backfill()
+        op.execute(FILL_FARM_ID)
+        # NOT VALID still checks every new write; added any earlier it would reject old code during the backfill.
+        op.execute(
+            f'ALTER TABLE paddock_observations ADD CONSTRAINT {NOT_NULL_CHECK} CHECK (farm_id IS NOT NULL) NOT VALID'
+        )
+        # Rows written between the sweep above and the constraint; none can appear after it.
+        op.execute(FILL_FARM_ID)
+        op.execute(f'ALTER TABLE paddock_observations VALIDATE CONSTRAINT {FK_NAME}')
+        op.execute(f'ALTER TABLE paddock_observations VALIDATE CONSTRAINT {NOT_NULL_CHECK}')
+        op.execute('ALTER TABLE paddock_observations ALTER COLUMN farm_id SET NOT NULL')
+        op.execute(f'ALTER TABLE paddock_observations DROP CONSTRAINT {NOT_NULL_CHECK}')
+
+        op.create_index(FARM_DATE_INDEX, 'paddock_observations', ['farm_id', 'obs_date'], postgresql_concurrently=True)
+        op.create_index(
+            PADDOCK_DATE_DESC_INDEX,
+            'paddock_observations',
+            ['paddock_id', sa.text('obs_date DESC')],
+            postgresql_concurrently=True,
+        )
+        # The unique (paddock_id, obs_date) constraint and the new index both lead with paddock_id.
+        op.drop_index(PADDOCK_INDEX, 'paddock_observations', postgresql_concurrently=True)
+
+
+def _upgrade_generic() -> None:
+    with op.batch_alter_table('paddock_observations') as batch:
+        batch.add_column(sa.Column('farm_id', sa.String(length=36), nullable=True))
+        batch.create_foreign_key(FK_NAME, 'farms', ['farm_id'], ['id'], ondelete='CASCADE')
+    _backfill()
+    with op.batch_alter_table('paddock_observations') as batch:
+        batch.alter_column('farm_id', existing_type=sa.String(length=36), nullable=False)
+    op.create_index(FARM_DATE_INDEX, 'paddock_observations', ['farm_id', 'obs_date'])
+    op.create_index(PADDOCK_DATE_DESC_INDEX, 'paddock_observations', ['paddock_id', sa.text('obs_date DESC')])
+    op.drop_index(PADDOCK_INDEX, 'paddock_observations')
+
+
+def _backfill() -> None:
+    """Copy each observation's farm from its paddock, one primary-key range per statement."""
+    options = context.get_x_argument(as_dictionary=True)
+    batch_size = int(options.get('backfill_batch_size', 50_000))
+    pause = int(options.get('backfill_pause_ms', 0)) / 1000.0
+    connection = op.get_bind()
+
+    after = ''
+    while True:
+        upto = connection.execute(NEXT_BATCH_END, {'after': after, 'size': batch_size}).scalar()
+        if upto is None:
+            return
+        connection.execute(sa.text(f'{FILL_FARM_ID} AND id > :after AND id <= :upto'), {'after': after, 'upto': upto})
+        after = upto
+        if pause:
+            time.sleep(pause)
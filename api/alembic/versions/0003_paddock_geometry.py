@@ -0,0 +1,56 @@
+"""Add paddocks.geom (PostGIS geometry with a GiST index) and recompute area_ha geodesically.
+
+PostgreSQL: enables the postgis extension, fills geom from geom_geojson and area_ha from
+ST_Area on the geography, then builds the GiST index CONCURRENTLY. Paddock tables are
+small (one row per paddock), so the fill is a single statement. Other dialects store the
+GeoJSON text and recompute area_ha with the NumPy geometry engine.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+import json
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.db.spatial import Geometry
+from app.services.geometry import batch_area_hectares
+
+revision: str = '0003'
+down_revision: str | None = '0002'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+GEOM_INDEX = 'ix_paddocks_geom'
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS postgis')
+        op.add_column('paddocks', sa.Column('geom', Geometry(), nullable=True))
+        op.execute('UPDATE paddocks SET geom = ST_SetSRID(ST_GeomFromGeoJSON(geom_geojson::text), 4326)')
+        op.execute('UPDATE paddocks SET area_ha = ST_Area(geography(geom)) / 10000.0')
+        with op.get_context().autocommit_block():
+            op.create_index(GEOM_INDEX, 'paddocks', ['geom'], postgresql_using='gist', postgresql_concurrently=True)
+        return
+
+    op.add_column('paddocks', sa.Column('geom', Geometry(), nullable=True))
+    connection = op.get_bind()
+    paddocks = sa.table('paddocks', sa.column('id'), sa.column('geom_geojson'), sa.column('geom'), sa.column('area_ha'))
+    rows = connection.execute(sa.select(paddocks.c.id, paddocks.c.geom_geojson)).all()
+    geometries = [json.loads(geom) if isinstance(geom, str) else geom for _, geom in rows]
+    for (paddock_id, _), geometry, area in zip(rows, geometries, batch_area_hectares(geometries)):
+        connection.execute(
+            paddocks.update()
+            .where(paddocks.c.id == paddock_id)
+            .values(geom=json.dumps(geometry, separators=(',', ':')), area_ha=float(area))
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(GEOM_INDEX, 'paddocks', postgresql_concurrently=True)
+    op.drop_column('paddocks', 'geom')
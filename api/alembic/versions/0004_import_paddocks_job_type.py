@@ -0,0 +1,28 @@
+"""Add the `import_paddocks` job type for background paddock imports.
+
+PostgreSQL cannot use a new enum value in the transaction that adds it, so ADD VALUE runs in
+an autocommit block. Other dialects store the enum as VARCHAR and need nothing. Enum values
+cannot be dropped in PostgreSQL, so the downgrade leaves it in place.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = '0004'
+down_revision: str | None = '0003'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE job_type_enum ADD VALUE IF NOT EXISTS 'import_paddocks'")
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,27 @@
+"""Add farms.data_version, the counter behind the read endpoints' ETags.
+
+On PostgreSQL 11+ adding a NOT NULL column with a constant default only updates the
+catalog, so existing farms start at version 0 without a table rewrite.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0005'
+down_revision: str | None = '0004'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column('farms', sa.Column('data_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('farms') as batch:
+        batch.drop_column('data_version')
@@ -0,0 +1,87 @@
+"""Add keyset pagination indexes, the `ingest_pipeline` job type, unique weather days and observation summaries.
+
+`weather_daily` used to gain a full set of rows on every fetch, so duplicates of a
+(farm_id, date) are deleted first, keeping the most recently fetched one. On PostgreSQL the
+unique constraint is attached to an index built CONCURRENTLY, and the other indexes are
+built the same way. Old workers still insert duplicate forecast rows, which would make the
+unique index build fail, so keep the Celery workers stopped until the new code runs.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '0006'
+down_revision: str | None = '0005'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+WEATHER_UNIQUE = 'uq_weather_farm_date'
+KEYSET_INDEXES = (
+    ('ix_farms_created_at_id', 'farms', ['created_at', 'id']),
+    ('ix_job_runs_farm_started_at_id', 'job_runs', ['farm_id', 'started_at', 'id']),
+    ('ix_job_runs_started_at_id', 'job_runs', ['started_at', 'id']),
+    ('ix_paddocks_farm_created_at_id', 'paddocks', ['farm_id', 'created_at', 'id']),
+)
+DELETE_WEATHER_DUPLICATES = (
+    'DELETE FROM weather_daily WHERE EXISTS ('
+    'SELECT 1 FROM weather_daily AS newer '
+    'WHERE newer.farm_id = weather_daily.farm_id AND newer.date = weather_daily.date '
+    'AND (newer.fetched_at > weather_daily.fetched_at '
+    'OR (newer.fetched_at = weather_daily.fetched_at AND newer.id > weather_daily.id)))'
+)
+
+
+def upgrade() -> None:
+    _create_summaries_table()
+    op.execute(DELETE_WEATHER_DUPLICATES)
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE job_type_enum ADD VALUE IF NOT EXISTS 'ingest_pipeline'")
+            for name, table, columns in KEYSET_INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True)
+            op.create_index(
+                WEATHER_UNIQUE, 'weather_daily', ['farm_id', 'date'], unique=True, postgresql_concurrently=True
+            )
+            op.execute(f'ALTER TABLE weather_daily ADD CONSTRAINT {WEATHER_UNIQUE} UNIQUE USING INDEX {WEATHER_UNIQUE}')
+        return
+
+    for name, table, columns in KEYSET_INDEXES:
+        op.create_index(name, table, columns)
+    with op.batch_alter_table('weather_daily') as batch:
+        batch.create_unique_constraint(WEATHER_UNIQUE, ['farm_id', 'date'])
+
+
+def downgrade() -> None:
+    # Enum values cannot be dropped in PostgreSQL, so `ingest_pipeline` stays.
+    with op.batch_alter_table('weather_daily') as batch:
+        batch.drop_constraint(WEATHER_UNIQUE, type_='unique')
+    for name, table, _ in KEYSET_INDEXES:
+        op.drop_index(name, table)
+    op.drop_table('farm_observation_summaries')
+
+
+def _create_summaries_table() -> None:
+    op.create_table(
+        'farm_observation_summaries',
+        sa.Column('farm_id', sa.String(length=36), nullable=False),
+        sa.Column('obs_date', sa.Date(), nullable=False),
+        sa.Column('paddock_count', sa.Integer(), nullable=False),
+        sa.Column('ndvi_mean', sa.Float(), nullable=True),
+        sa.Column('bucket_very_low', sa.Integer(), nullable=False),
+        sa.Column('bucket_low', sa.Integer(), nullable=False),
+        sa.Column('bucket_medium', sa.Integer(), nullable=False),
+        sa.Column('bucket_high', sa.Integer(), nullable=False),
+        sa.Column('quality_ok', sa.Integer(), nullable=False),
+        sa.Column('quality_cloudy', sa.Integer(), nullable=False),
+        sa.Column('quality_no_data', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(['farm_id'], ['farms.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('farm_id', 'obs_date', name='uq_farm_observation_summary_date'),
+    )
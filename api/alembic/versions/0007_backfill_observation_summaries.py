@@ -0,0 +1,47 @@
+"""Fill farm_observation_summaries from the observations that predate it.
+
+The dates listing and overview read only the summaries, which ingest keeps current from
+here on; without this every upgraded farm would list no dates until its next ingest.
+Each farm is rebuilt with the same rollup ingest uses. On PostgreSQL every farm commits on
+its own, so only one farm's summary rows are locked at a time.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.orm import Session
+
+from app.services.observation_summary import rebuild_observation_summaries
+
+revision: str = '0007'
+down_revision: str | None = '0006'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    farm_ids = connection.execute(sa.text('SELECT DISTINCT farm_id FROM paddock_observations')).scalars().all()
+    if connection.dialect.name != 'postgresql':
+        _rebuild(connection, farm_ids)
+        return
+
+    with op.get_context().autocommit_block():
+        _rebuild(connection, farm_ids)
+
+
+def downgrade() -> None:
+    # 0006 drops the table; the rows are derived, so there is nothing to restore here.
+    pass
+
+
+def _rebuild(connection: sa.Connection, farm_ids: Sequence[str]) -> None:
+    with Session(bind=connection) as db:
+        for farm_id in farm_ids:
+            rebuild_observation_summaries(db, farm_id)
+            # Ends the farm's transaction on PostgreSQL; inside the migration's transaction (SQLite) it only flushes.
+            db.commit()
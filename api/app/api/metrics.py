@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import registry
+
+router = APIRouter()
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@router.get('/metrics', include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
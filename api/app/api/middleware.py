@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    http_request_duration,
+    http_request_statements,
+    http_requests_in_flight,
+    http_response_size,
+    request_statements,
+)
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, response size and SQL statements per route.
+
+    Routes are labelled by their path template (FastAPI leaves the matched route in the
+    scope), so ids in the URL do not create new series.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = [500, 0]
+        statements = [0]
+
+        async def send_with_metrics(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                response[0] = message['status']
+            elif message['type'] == 'http.response.body':
+                response[1] += len(message.get('body', b''))
+            await send(message)
+
+        token = request_statements.set(statements)
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            http_requests_in_flight.dec()
+            request_statements.reset(token)
+            route = getattr(scope.get('route'), 'path_format', UNMATCHED_ROUTE)
+            method = scope['method']
+            http_request_duration.observe((method, route, str(response[0])), time.perf_counter() - started)
+            http_response_size.observe((method, route), response[1])
+            http_request_statements.observe((method, route), statements[0])
@@ -0,0 +1,36 @@
+from fastapi import Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.services.data_version import data_etag, etag_matches, get_data_version, get_data_version_async
+
+# Clients may keep the response but must revalidate it; browsers then send If-None-Match on their own.
+CONDITIONAL_CACHE_CONTROL = 'private, no-cache'
+
+
+def conditional_get(db: Session, request: Request, response: Response, farm_id: str, *parts: object) -> Response | None:
+    """Tag `response` with the farm's data ETag; a 304 response to return instead when the client has it.
+
+    Costs one primary-key lookup, so call it before the endpoint's own queries. Unknown
+    farms get no ETag and fall through to the endpoint.
+    """
+    return _conditional(request, response, farm_id, get_data_version(db, farm_id), parts)
+
+
+async def conditional_get_async(
+    db: AsyncSession, request: Request, response: Response, farm_id: str, *parts: object
+) -> Response | None:
+    return _conditional(request, response, farm_id, await get_data_version_async(db, farm_id), parts)
+
+
+def _conditional(
+    request: Request, response: Response, farm_id: str, version: int | None, parts: tuple
+) -> Response | None:
+    if version is None:
+        return None
+    etag = data_etag(farm_id, version, request.url.path, *parts)
+    headers = {'ETag': etag, 'Cache-Control': CONDITIONAL_CACHE_CONTROL}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
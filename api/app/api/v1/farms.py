@@ -2,17 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.v1.pagination import PageParams, page_params, paginate
 from app.db.session import get_db
 from app.models.farm import Farm
 from app.schemas.farm import FarmCreate, FarmOut, FarmUpdate
 
 router = APIRouter()
 
+# Listing selects exactly the FarmOut fields, so rows serialize without building models.
+FARM_LIST_COLUMNS = (Farm.id, Farm.name, Farm.description, Farm.latitude, Farm.longitude, Farm.created_at)
+
 
 @router.get('', response_model=dict)
-def list_farms(db: Session = Depends(get_db)) -> dict:
-    farms = db.scalars(select(Farm).order_by(Farm.created_at.desc())).all()
-    return {'data': [FarmOut.model_validate(farm).model_dump() for farm in farms], 'meta': {'count': len(farms)}}
+def list_farms(page: PageParams = Depends(page_params), db: Session = Depends(get_db)) -> dict:
+    return paginate(db, select(*FARM_LIST_COLUMNS), Farm.created_at, Farm.id, page)
 
 
 @router.post('', response_model=dict, status_code=status.HTTP_201_CREATED)
@@ -1,8 +1,23 @@
 from fastapi import APIRouter
 
+from app.services.forecast_cache import forecast_cache
+from app.services.thresholds import threshold_cache
+from app.services.vector_tiles import get_tile_cache
+
 router = APIRouter()
 
 
 @router.get('/health')
 def health_check() -> dict:
     return {'data': {'status': 'ok'}}
+
+
+@router.get('/health/caches')
+def cache_stats() -> dict:
+    return {
+        'data': {
+            'thresholds': threshold_cache.stats(),
+            'forecasts': forecast_cache.stats(),
+            'tiles': get_tile_cache().stats(),
+        }
+    }
@@ -1,51 +1,103 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import desc, select
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from kombu.exceptions import OperationalError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.v1.pagination import PageParams, page_params, paginate
 from app.db.session import get_db
+from app.models.enums import JobStatus, JobType
+from app.models.farm import Farm
 from app.models.job_run import JobRun
-from app.services.pipeline_service import ingest_satellite_scenes
-from app.services.recommendation_service import generate_weekly_recommendations
-from app.services.weather_service import fetch_weather_forecast
+from app.services.job_runs import (
+    PIPELINE_STAGES,
+    duration_percentiles,
+    job_progress,
+    mark_pipeline_stage,
+    serialize_job_run,
+    start_pipeline_run,
+)
+from app.workers.tasks import enqueue_ingest_pipeline
 
 router = APIRouter()
 
+JOB_RUN_LIST_COLUMNS = (
+    JobRun.id,
+    JobRun.job_type,
+    JobRun.farm_id,
+    JobRun.status,
+    JobRun.started_at,
+    JobRun.finished_at,
+    JobRun.stats_json,
+    JobRun.error,
+)
 
-@router.post('/farms/{farm_id}/jobs/ingest', response_model=dict)
-async def run_ingest_pipeline(farm_id: str, db: Session = Depends(get_db)) -> dict:
-    scenes = ingest_satellite_scenes(db, farm_id)
-    weather = await fetch_weather_forecast(db, farm_id)
-    recommendation = generate_weekly_recommendations(db, farm_id)
-    return {
-        'data': {
-            'farm_id': farm_id,
-            'scenes_processed': len(scenes),
-            'weather_days': len(weather),
-            'recommendation_id': recommendation.id,
-        }
-    }
+
+@router.post('/farms/{farm_id}/jobs/ingest', response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+def run_ingest_pipeline(farm_id: str, db: Session = Depends(get_db)) -> dict:
+    if not db.get(Farm, farm_id):
+        raise HTTPException(status_code=404, detail='Farm not found')
+
+    run = start_pipeline_run(db, farm_id)
+    try:
+        enqueue_ingest_pipeline(farm_id, run.id)
+    except OperationalError as exc:
+        mark_pipeline_stage(db, run.id, PIPELINE_STAGES[0], 'failed', error=f'Could not enqueue pipeline: {exc}')
+        raise HTTPException(status_code=503, detail='Job queue unavailable') from exc
+
+    db.refresh(run)
+    return {'data': {'run_id': run.id, 'farm_id': farm_id, **_run_status(run)}}
 
 
 @router.get('/jobs/runs', response_model=dict)
 def job_runs(
     farm_id: str | None = Query(default=None),
+    run_status: JobStatus | None = Query(default=None, alias='status'),
+    job_type: JobType | None = Query(default=None),
+    started_after: datetime | None = Query(default=None),
+    started_before: datetime | None = Query(default=None),
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
 ) -> dict:
-    stmt = select(JobRun)
+    stmt = select(*JOB_RUN_LIST_COLUMNS)
     if farm_id:
         stmt = stmt.where(JobRun.farm_id == farm_id)
-    rows = db.scalars(stmt.order_by(desc(JobRun.started_at)).limit(200)).all()
-    payload = [
-        {
-            'id': row.id,
-            'job_type': row.job_type.value,
-            'farm_id': row.farm_id,
-            'status': row.status.value,
-            'started_at': row.started_at,
-            'finished_at': row.finished_at,
-            'stats_json': row.stats_json,
-            'error': row.error,
-        }
-        for row in rows
-    ]
-    return {'data': payload, 'meta': {'count': len(payload)}}
+    if run_status:
+        stmt = stmt.where(JobRun.status == run_status)
+    if job_type:
+        stmt = stmt.where(JobRun.job_type == job_type)
+    if started_after:
+        stmt = stmt.where(JobRun.started_at >= started_after)
+    if started_before:
+        stmt = stmt.where(JobRun.started_at < started_before)
+    return paginate(db, stmt, JobRun.started_at, JobRun.id, page)
+
+
+@router.get('/jobs/runs/stats', response_model=dict)
+def job_run_stats(
+    days: int = Query(default=7, ge=1, le=90),
+    farm_id: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+) -> dict:
+    since = datetime.utcnow() - timedelta(days=days)
+    payload = duration_percentiles(db, since, farm_id)
+    return {'data': payload, 'meta': {'count': len(payload), 'since': since}}
+
+
+@router.get('/jobs/runs/{run_id}', response_model=dict)
+def job_run(run_id: str, db: Session = Depends(get_db)) -> dict:
+    run = db.get(JobRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail='Job run not found')
+    return {'data': {**serialize_job_run(run), **_run_status(run)}}
+
+
+def _run_status(run: JobRun) -> dict:
+    stages = (run.stats_json or {}).get('stages') or {}
+    return {
+        'status': run.status.value,
+        'done': run.status != JobStatus.running,
+        'progress': job_progress(run),
+        'stages': [{'name': name, **entry} for name, entry in stages.items()],
+    }
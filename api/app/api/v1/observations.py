@@ -1,41 +1,117 @@
+from collections.abc import Iterator
 from datetime import date
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import distinct, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.api.v1.conditional import conditional_get
+from app.db.session import SessionLocal, get_db
+from app.models.farm import Farm
+from app.models.farm_observation_summary import FarmObservationSummary
 from app.models.paddock import Paddock
 from app.models.paddock_observation import PaddockObservation
 from app.schemas.observation import ObservationForDate
 from app.schemas.paddock import PaddockObservationPoint, PaddockObservationSeries
 from app.services.ndvi import ndvi_bucket, trend_direction, trend_slope
+from app.services.observation_export import EXPORT_MEDIA_TYPES, csv_chunks, export_batches, export_query, ndjson_chunks
+from app.services.observation_series import farm_series
+from app.services.observation_summary import SUMMARY_READ_COLUMNS, serialize_summary
 
 router = APIRouter()
 
 
 @router.get('/farms/{farm_id}/observations/dates', response_model=dict)
-def list_observation_dates(farm_id: str, db: Session = Depends(get_db)) -> dict:
+def list_observation_dates(
+    farm_id: str, request: Request, response: Response, db: Session = Depends(get_db)
+) -> dict | Response:
+    not_modified = conditional_get(db, request, response, farm_id)
+    if not_modified is not None:
+        return not_modified
     stmt = (
-        select(distinct(PaddockObservation.obs_date))
-        .join(Paddock, Paddock.id == PaddockObservation.paddock_id)
-        .where(Paddock.farm_id == farm_id)
-        .order_by(PaddockObservation.obs_date.desc())
+        select(FarmObservationSummary.obs_date)
+        .where(FarmObservationSummary.farm_id == farm_id)
+        .order_by(FarmObservationSummary.obs_date.desc())
     )
     dates = [row for row in db.scalars(stmt).all()]
     return {'data': {'dates': dates}}
 
 
+@router.get('/farms/{farm_id}/observations/overview', response_model=dict)
+def farm_observation_overview(
+    farm_id: str,
+    limit: int = Query(default=30, ge=1, le=366, description='Most recent observation dates to include.'),
+    db: Session = Depends(get_db),
+) -> dict:
+    stmt = (
+        select(*SUMMARY_READ_COLUMNS)
+        .where(FarmObservationSummary.farm_id == farm_id)
+        .order_by(FarmObservationSummary.obs_date.desc())
+        .limit(limit)
+    )
+    summaries = [serialize_summary(row) for row in db.execute(stmt).mappings()]
+    return {'data': summaries, 'meta': {'count': len(summaries)}}
+
+
+@router.get('/farms/{farm_id}/observations/export', response_class=StreamingResponse)
+def export_observations(
+    farm_id: str,
+    start: date | None = Query(default=None, description='First observation date, inclusive.'),
+    end: date | None = Query(default=None, description='Last observation date, inclusive.'),
+    export_format: Literal['ndjson', 'csv'] = Query(default='ndjson', alias='format'),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail='start must not be after end')
+    if db.get(Farm, farm_id) is None:
+        raise HTTPException(status_code=404, detail='Farm not found')
+
+    stmt = export_query(farm_id, start, end)
+    encode = csv_chunks if export_format == 'csv' else ndjson_chunks
+
+    def stream() -> Iterator[str]:
+        # The request-scoped session is closed before the body streams, so the export owns one.
+        with SessionLocal() as export_db:
+            yield from encode(export_batches(export_db, stmt))
+
+    filename = f'observations-{farm_id}.{export_format}'
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get('/farms/{farm_id}/observations/series', response_model=dict)
+def farm_observation_series(
+    farm_id: str,
+    since: date | None = Query(default=None, description='Only observations on or after this date.'),
+    max_points: int | None = Query(default=None, ge=1, le=1000, description='Downsample each series to this many.'),
+    db: Session = Depends(get_db),
+) -> dict:
+    if db.get(Farm, farm_id) is None:
+        raise HTTPException(status_code=404, detail='Farm not found')
+    series = farm_series(db, farm_id, since, max_points)
+    return {'data': series, 'meta': {'count': len(series), 'since': since, 'max_points': max_points}}
+
+
 @router.get('/farms/{farm_id}/observations', response_model=dict)
 def observations_by_date(
     farm_id: str,
+    request: Request,
+    response: Response,
     observation_date: date = Query(alias='date'),
     db: Session = Depends(get_db),
-) -> dict:
+) -> dict | Response:
+    not_modified = conditional_get(db, request, response, farm_id, observation_date)
+    if not_modified is not None:
+        return not_modified
     stmt = (
         select(PaddockObservation, Paddock)
         .join(Paddock, Paddock.id == PaddockObservation.paddock_id)
-        .where(Paddock.farm_id == farm_id, PaddockObservation.obs_date == observation_date)
+        .where(PaddockObservation.farm_id == farm_id, PaddockObservation.obs_date == observation_date)
         .order_by(Paddock.name.asc())
     )
     rows = db.execute(stmt).all()
@@ -1,34 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from kombu.exceptions import OperationalError
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.v1.pagination import PageParams, page_params, paginate
+from app.core.config import get_settings
 from app.db.session import get_db
+from app.models.enums import JobStatus, JobType
 from app.models.farm import Farm
 from app.models.paddock import Paddock
-from app.schemas.paddock import PaddockCreate, PaddockImportRequest, PaddockOut, PaddockUpdate
-from app.services.geometry import polygon_area_hectares
+from app.models.paddock_observation import PaddockObservation
+from app.schemas.paddock import PaddockCreate, PaddockIntersectRequest, PaddockOut, PaddockUpdate
+from app.services.data_version import bump_data_version
+from app.services.geometry import bbox_polygon
+from app.services.job_runs import finish_job_run, job_progress, start_job_run
+from app.services.mask_cache import invalidate_paddock_masks
+from app.services.ndvi_tiles import invalidate_ndvi_tiles
+from app.services.observation_summary import refresh_observation_summaries
+from app.services.paddock_import import (
+    ImportFormatError,
+    import_paddock_features,
+    iter_features,
+    scan_feature_collection,
+    store_import_upload,
+)
+from app.services.paddock_spatial import intersects_clause, parse_bbox
+from app.services.vector_tiles import invalidate_paddock_tiles
+from app.workers.tasks import enqueue_paddock_import
 
 router = APIRouter()
 
+PADDOCK_LIST_COLUMNS = (
+    Paddock.id,
+    Paddock.farm_id,
+    Paddock.name,
+    Paddock.geom_geojson,
+    Paddock.area_ha,
+    Paddock.created_at,
+)
+
 
 @router.get('/farms/{farm_id}/paddocks', response_model=dict)
-def list_paddocks(farm_id: str, db: Session = Depends(get_db)) -> dict:
+def list_paddocks(
+    farm_id: str,
+    bbox: str | None = Query(default=None, description='minLon,minLat,maxLon,maxLat; paddocks intersecting it.'),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+) -> dict:
     _ensure_farm(db, farm_id)
-    paddocks = db.scalars(select(Paddock).where(Paddock.farm_id == farm_id).order_by(Paddock.created_at.asc())).all()
-    return {
-        'data': [PaddockOut.model_validate(paddock).model_dump() for paddock in paddocks],
-        'meta': {'count': len(paddocks)},
-    }
+    stmt = select(*PADDOCK_LIST_COLUMNS).where(Paddock.farm_id == farm_id)
+    if bbox is not None:
+        try:
+            bounds = parse_bbox(bbox)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        stmt = stmt.where(intersects_clause(db, farm_id, bbox_polygon(bounds)))
+    return paginate(db, stmt, Paddock.created_at, Paddock.id, page, descending=False)
+
+
+@router.post('/farms/{farm_id}/paddocks/intersecting', response_model=dict)
+def intersecting_paddocks(farm_id: str, payload: PaddockIntersectRequest, db: Session = Depends(get_db)) -> dict:
+    _ensure_farm(db, farm_id)
+    stmt = (
+        select(*PADDOCK_LIST_COLUMNS)
+        .where(Paddock.farm_id == farm_id, intersects_clause(db, farm_id, payload.geometry))
+        .order_by(Paddock.created_at, Paddock.id)
+    )
+    rows = [dict(row) for row in db.execute(stmt).mappings()]
+    return {'data': rows, 'meta': {'count': len(rows)}}
 
 
 @router.post('/farms/{farm_id}/paddocks', response_model=dict, status_code=status.HTTP_201_CREATED)
 def create_paddock(farm_id: str, payload: PaddockCreate, db: Session = Depends(get_db)) -> dict:
     _ensure_farm(db, farm_id)
-    area = polygon_area_hectares(payload.geom_geojson)
-    paddock = Paddock(farm_id=farm_id, name=payload.name, geom_geojson=payload.geom_geojson, area_ha=area)
+    paddock = Paddock(farm_id=farm_id, name=payload.name, geom_geojson=payload.geom_geojson)
     db.add(paddock)
+    bump_data_version(db, farm_id)
     db.commit()
     db.refresh(paddock)
+    invalidate_paddock_tiles([paddock.geom_geojson])
+    invalidate_ndvi_tiles([paddock.geom_geojson])
     return {'data': PaddockOut.model_validate(paddock).model_dump()}
 
 
@@ -39,15 +94,20 @@ def update_paddock(paddock_id: str, payload: PaddockUpdate, db: Session = Depend
         raise HTTPException(status_code=404, detail='Paddock not found')
 
     patch = payload.model_dump(exclude_unset=True)
+    previous_geometry = paddock.geom_geojson
     if 'geom_geojson' in patch:
         paddock.geom_geojson = patch['geom_geojson']
-        paddock.area_ha = polygon_area_hectares(paddock.geom_geojson)
+        invalidate_paddock_masks(paddock.id)
     if 'name' in patch:
         paddock.name = patch['name']
 
     db.add(paddock)
+    bump_data_version(db, paddock.farm_id)
     db.commit()
     db.refresh(paddock)
+    invalidate_paddock_tiles([previous_geometry, paddock.geom_geojson])
+    if 'geom_geojson' in patch:
+        invalidate_ndvi_tiles([previous_geometry, paddock.geom_geojson])
     return {'data': PaddockOut.model_validate(paddock).model_dump()}
 
 
@@ -56,40 +116,69 @@ def delete_paddock(paddock_id: str, db: Session = Depends(get_db)) -> None:
     paddock = db.get(Paddock, paddock_id)
     if not paddock:
         raise HTTPException(status_code=404, detail='Paddock not found')
+    obs_dates = db.scalars(select(PaddockObservation.obs_date).where(PaddockObservation.paddock_id == paddock_id)).all()
+    geometry = paddock.geom_geojson
     db.delete(paddock)
+    db.flush()
+    refresh_observation_summaries(db, paddock.farm_id, obs_dates)
+    bump_data_version(db, paddock.farm_id)
     db.commit()
+    invalidate_paddock_masks(paddock_id)
+    invalidate_paddock_tiles([geometry])
+    invalidate_ndvi_tiles([geometry])
 
 
 @router.post('/farms/{farm_id}/paddocks/import', response_model=dict, status_code=status.HTTP_201_CREATED)
-def import_paddocks(farm_id: str, payload: PaddockImportRequest, db: Session = Depends(get_db)) -> dict:
-    _ensure_farm(db, farm_id)
-
-    fc = payload.feature_collection
-    if fc.get('type') != 'FeatureCollection':
-        raise HTTPException(status_code=400, detail='feature_collection must be a GeoJSON FeatureCollection')
-
-    created = []
-    failures = []
-    for idx, feature in enumerate(fc.get('features', [])):
-        try:
-            geom = feature.get('geometry', {})
-            if geom.get('type') != 'Polygon':
-                raise ValueError('Feature geometry must be Polygon')
-            name = feature.get('properties', {}).get('name') or f'Imported Paddock {idx + 1}'
-            paddock = Paddock(
-                farm_id=farm_id,
-                name=name,
-                geom_geojson=geom,
-                area_ha=polygon_area_hectares(geom),
-            )
-            db.add(paddock)
-            db.flush()
-            created.append(PaddockOut.model_validate(paddock).model_dump())
-        except Exception as exc:  # noqa: BLE001
-            failures.append({'index': idx, 'error': str(exc)})
-
+async def import_paddocks(farm_id: str, request: Request, response: Response, db: Session = Depends(get_db)) -> dict:
+    """Import a GeoJSON FeatureCollection streamed from the body, bare or as `{"feature_collection": ...}`.
+
+    Uploads up to `paddock_import_background_features` features are imported in the request (201);
+    larger ones are stored and imported by a background job (202 with the run to poll).
+    """
+    await run_in_threadpool(_ensure_farm, db, farm_id)
+    with SpooledTemporaryFile(max_size=get_settings().paddock_import_spool_mb * 1024 * 1024) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+        return await run_in_threadpool(_import_upload, db, farm_id, upload, response)
+
+
+def _import_upload(db: Session, farm_id: str, upload: BinaryIO, response: Response) -> dict:
+    settings = get_settings()
+    try:
+        total = scan_feature_collection(upload)
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    upload.seek(0)
+    if total > settings.paddock_import_background_features:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return _start_background_import(db, farm_id, upload, total)
+
+    result = import_paddock_features(db, farm_id, iter_features(upload), chunk_size=settings.paddock_import_chunk_size)
+    return {'data': result.rows, 'meta': {'count': result.created, 'failures': result.failures}}
+
+
+def _start_background_import(db: Session, farm_id: str, upload: BinaryIO, total: int) -> dict:
+    run = start_job_run(db, JobType.import_paddocks, farm_id)
+    run.stats_json = {'total': total, 'processed': 0}
     db.commit()
-    return {'data': created, 'meta': {'count': len(created), 'failures': failures}}
+    upload_uri = store_import_upload(upload, farm_id, run.id)
+    try:
+        enqueue_paddock_import(farm_id, run.id, upload_uri)
+    except OperationalError as exc:
+        finish_job_run(db, run, JobStatus.failed, run.stats_json, f'Could not enqueue import: {exc}')
+        raise HTTPException(status_code=503, detail='Job queue unavailable') from exc
+
+    db.refresh(run)
+    return {
+        'data': {
+            'run_id': run.id,
+            'farm_id': farm_id,
+            'status': run.status.value,
+            'done': run.status != JobStatus.running,
+            'progress': job_progress(run),
+        }
+    }
 
 
 def _ensure_farm(db: Session, farm_id: str) -> None:
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Query
+from sqlalchemy import Select
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, keyset_page
+
+
+@dataclass(frozen=True)
+class PageParams:
+    cursor: str | None
+    limit: int
+
+
+def page_params(
+    cursor: str | None = Query(default=None, description='Opaque `next_cursor` from the previous page.'),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def paginate(
+    db: Session,
+    stmt: Select,
+    timestamp_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    page: PageParams,
+    descending: bool = True,
+) -> dict:
+    try:
+        rows, next_cursor = keyset_page(db, stmt, timestamp_column, id_column, page.cursor, page.limit, descending)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {'data': rows, 'meta': {'count': len(rows), 'next_cursor': next_cursor}}
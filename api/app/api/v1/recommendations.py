@@ -1,9 +1,10 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.v1.conditional import conditional_get
 from app.db.session import get_db
 from app.models.paddock_recommendation import PaddockRecommendation
 from app.models.recommendation import Recommendation
@@ -18,7 +19,12 @@ router = APIRouter()
 
 
 @router.get('/farms/{farm_id}/recommendations/latest', response_model=dict)
-def latest_recommendation(farm_id: str, db: Session = Depends(get_db)) -> dict:
+def latest_recommendation(
+    farm_id: str, request: Request, response: Response, db: Session = Depends(get_db)
+) -> dict | Response:
+    not_modified = conditional_get(db, request, response, farm_id)
+    if not_modified is not None:
+        return not_modified
     rec = get_latest_recommendation(db, farm_id)
     if not rec:
         raise HTTPException(status_code=404, detail='No recommendations available')
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1 import farms, health, jobs, observations, paddocks, recommendations, weather
+from app.api.v1 import farms, health, jobs, observations, paddocks, recommendations, scenes, tiles, weather
 
 api_router = APIRouter()
 api_router.include_router(health.router, tags=['health'])
@@ -10,3 +10,5 @@ api_router.include_router(observations.router, tags=['observations'])
 api_router.include_router(weather.router, tags=['weather'])
 api_router.include_router(recommendations.router, tags=['recommendations'])
 api_router.include_router(jobs.router, tags=['jobs'])
+api_router.include_router(scenes.router, tags=['scenes'])
+api_router.include_router(tiles.router, tags=['tiles'])
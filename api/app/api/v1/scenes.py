@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.models.farm import Farm
+from app.models.satellite_scene import SatelliteScene
+from app.services.ndvi_tiles import scene_has_bands
+
+router = APIRouter()
+
+
+@router.get('/farms/{farm_id}/scenes', response_model=dict)
+def list_scenes(farm_id: str, db: Session = Depends(get_db)) -> dict:
+    """The farm's registered scenes, newest first; `has_bands` marks those that NDVI tiles can render."""
+    if db.get(Farm, farm_id) is None:
+        raise HTTPException(status_code=404, detail='Farm not found')
+    scenes = db.scalars(
+        select(SatelliteScene)
+        .where(SatelliteScene.farm_id == farm_id)
+        .order_by(SatelliteScene.scene_date.desc(), SatelliteScene.source)
+    ).all()
+    rows = [
+        {
+            'id': scene.id,
+            'scene_date': scene.scene_date,
+            'source': scene.source,
+            'cloud_pct': scene.cloud_pct,
+            'has_bands': scene_has_bands(scene),
+        }
+        for scene in scenes
+    ]
+    return {'data': rows, 'meta': {'count': len(rows)}}
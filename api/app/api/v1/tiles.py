@@ -0,0 +1,71 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.models.satellite_scene import SatelliteScene
+from app.services.image_encoding import IMAGE_MEDIA_TYPES, webp_available
+from app.services.ndvi_tiles import NDVI_TILE_MAX_ZOOM, NDVI_TILE_MIN_ZOOM, ndvi_tile, scene_has_bands
+from app.services.vector_tiles import PADDOCK_TILE_MAX_ZOOM, PADDOCK_TILE_MIN_ZOOM, paddock_tile
+
+router = APIRouter()
+
+MVT_MEDIA_TYPE = 'application/vnd.mapbox-vector-tile'
+TILE_CACHE_CONTROL = 'public, max-age=60'
+
+
+@router.get('/tiles/paddocks/{z}/{x}/{y}.mvt', response_class=Response)
+def paddock_vector_tile(
+    z: int,
+    x: int,
+    y: int,
+    farm_id: str | None = Query(default=None, description='Only this farm\'s paddocks; all farms when omitted.'),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Paddock polygons as a Mapbox Vector Tile (layer `paddocks`) with latest NDVI and recommendation.
+
+    Tiles without paddocks are 204 No Content, which map clients treat as empty.
+    """
+    _ensure_tile(z, x, y, PADDOCK_TILE_MIN_ZOOM, PADDOCK_TILE_MAX_ZOOM)
+    data, source = paddock_tile(db, z, x, y, farm_id)
+    headers = {'Cache-Control': TILE_CACHE_CONTROL, 'X-Tile-Cache': source}
+    if not data:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+    return Response(content=data, media_type=MVT_MEDIA_TYPE, headers=headers)
+
+
+@router.get('/tiles/scenes/{scene_id}/ndvi/{z}/{x}/{y}.{image_format}', response_class=Response)
+def scene_ndvi_tile(
+    scene_id: str,
+    z: int,
+    x: int,
+    y: int,
+    image_format: Literal['png', 'webp'],
+    db: Session = Depends(get_db),
+) -> Response:
+    """A scene's NDVI, colour-mapped and clipped to its farm's paddocks, as a 256 px PNG or WebP XYZ tile.
+
+    Tiles without paddock pixels are 204 No Content. WebP uses Pillow (406 on a server without it).
+    """
+    _ensure_tile(z, x, y, NDVI_TILE_MIN_ZOOM, NDVI_TILE_MAX_ZOOM)
+    if image_format == 'webp' and not webp_available():
+        raise HTTPException(status_code=406, detail='WebP tiles are not available on this server; request .png')
+    scene = db.get(SatelliteScene, scene_id)
+    if not scene:
+        raise HTTPException(status_code=404, detail='Scene not found')
+    if not scene_has_bands(scene):
+        raise HTTPException(status_code=404, detail='Scene bands are not in the object store')
+
+    data, source = ndvi_tile(db, scene, z, x, y, image_format)
+    headers = {'Cache-Control': TILE_CACHE_CONTROL, 'X-Tile-Cache': source}
+    if not data:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+    return Response(content=data, media_type=IMAGE_MEDIA_TYPES[image_format], headers=headers)
+
+
+def _ensure_tile(z: int, x: int, y: int, min_zoom: int, max_zoom: int) -> None:
+    if not min_zoom <= z <= max_zoom:
+        raise HTTPException(status_code=404, detail=f'Tiles exist for zooms {min_zoom}-{max_zoom}')
+    if not (0 <= x < 2**z and 0 <= y < 2**z):
+        raise HTTPException(status_code=404, detail='Tile not found')
@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.api.v1.conditional import conditional_get_async
+from app.db.session import get_async_db
 from app.schemas.weather import WeatherDailyOut
-from app.services.weather_service import fetch_weather_forecast, get_weather_forecast
+from app.services.weather_service import fetch_weather_forecast_async, get_weather_forecast_async
 
 router = APIRouter()
 
 
 @router.get('/farms/{farm_id}/weather/forecast', response_model=dict)
-async def weather_forecast(farm_id: str, db: Session = Depends(get_db)) -> dict:
-    data = get_weather_forecast(db, farm_id)
+async def weather_forecast(
+    farm_id: str, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+) -> dict | Response:
+    not_modified = await conditional_get_async(db, request, response, farm_id)
+    if not_modified is not None:
+        return not_modified
+    data = await get_weather_forecast_async(db, farm_id)
     if not data:
-        data = await fetch_weather_forecast(db, farm_id)
+        data = await fetch_weather_forecast_async(db, farm_id)
+        # Storing the forecast bumped the data version past the ETag; the next poll gets the new one.
+        if 'etag' in response.headers:
+            del response.headers['etag']
 
     payload = [WeatherDailyOut.model_validate(item).model_dump() for item in data]
     return {'data': payload, 'meta': {'count': len(payload)}}
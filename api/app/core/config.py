@@ -20,10 +20,40 @@ class Settings(BaseSettings):
 
     openweather_api_key: str | None = None
     openweather_base_url: str = 'https://api.openweathermap.org/data/2.5'
+    openweather_max_connections: int = 20
+    openweather_max_concurrency: int = 10
+    openweather_max_retries: int = 3
+    openweather_backoff_seconds: float = 0.5
+    # Upper bound on any retry wait, including a server-sent Retry-After.
+    openweather_max_backoff_seconds: float = 30.0
+    openweather_timeout_seconds: float = 20.0
 
     mapbox_access_token: str | None = None
 
     scenes_lookback_days: int = 30
+    threshold_cache_check_seconds: float = 5.0
+    recommendation_fanout_chunk_size: int = 25
+    weather_refresh_batch_size: int = 100
+    weather_cell_degrees: float = 0.1
+    weather_cache_ttl_seconds: float = 1800.0
+    object_store_root: str = './data/object_store'
+    mask_cache_dir: str = './data/cache/masks'
+    mask_cache_max_mb: int = 512
+    tile_cache_dir: str = './data/cache/tiles'
+    tile_cache_max_mb: int = 256
+    ndvi_tile_cache_dir: str = './data/cache/ndvi_tiles'
+    ndvi_tile_cache_max_mb: int = 1024
+    tile_memory_cache_entries: int = 2048
+    # Other processes invalidate only the shared disk cache; memory entries go stale for at most this long.
+    tile_memory_ttl_seconds: float = 30.0
+    paddock_import_chunk_size: int = 1000
+    # Uploads with more features than this import as a background job.
+    paddock_import_background_features: int = 2000
+    # Validation processes for background imports; 0 or 1 validates in the worker itself.
+    paddock_import_workers: int = 4
+    paddock_import_spool_mb: int = 16
+    metrics_enabled: bool = True
+    worker_metrics_port: int = 0
     seed_demo_data: bool = True
 
 
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import abc
+import contextvars
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from typing import TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+TASK_BUCKETS = (0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+
+MetricT = TypeVar('MetricT', bound='_Metric')
+
+
+class _Metric(abc.ABC):
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def samples(self) -> Iterable[tuple[str, tuple, float]]:
+        """Yield `(sample name, label pairs, value)` for every series, in exposition order."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Drop the recorded values; callbacks registered at import time are kept."""
+
+
+class Gauge(_Metric):
+    """Set/inc/dec gauge; `set_function` registers a callback that is read at scrape time instead."""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+        self._functions: dict[tuple, Callable[[], float | None]] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: tuple = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def set_function(self, labels: tuple, function: Callable[[], float | None]) -> None:
+        with self._lock:
+            self._functions[labels] = function
+
+    def samples(self) -> Iterable[tuple[str, tuple, float]]:
+        with self._lock:
+            items = list(self._values.items())
+            functions = list(self._functions.items())
+        for labels, value in items:
+            yield self.name, tuple(zip(self.labelnames, labels)), value
+        for labels, function in functions:
+            value = function()
+            if value is not None:
+                yield self.name, tuple(zip(self.labelnames, labels)), float(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: one non-cumulative count per bucket plus +Inf, then the sum.
+        self._series: dict[tuple, list[float]] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self) -> Iterable[tuple[str, tuple, float]]:
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in items:
+            pairs = tuple(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), series):
+                cumulative += count
+                yield f'{self.name}_bucket', (*pairs, ('le', _format_value(bound))), cumulative
+            yield f'{self.name}_sum', pairs, series[-1]
+            yield f'{self.name}_count', pairs, cumulative
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Registry:
+    """In-process metrics rendered in the Prometheus text exposition format (0.0.4).
+
+    Updates are a dict lookup, a bisect and a few adds under an uncontended lock, cheap
+    enough for the request middleware to stay on in production.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: MetricT) -> MetricT:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, pairs, value in metric.samples():
+                if pairs:
+                    rendered = ','.join(f'{key}="{_escape(str(label))}"' for key, label in pairs)
+                    lines.append(f'{name}{{{rendered}}} {_format_value(value)}')
+                else:
+                    lines.append(f'{name} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self) -> None:
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+registry = Registry()
+
+http_request_duration = registry.register(
+    Histogram('http_request_duration_seconds', 'HTTP request latency by route.', ('method', 'route', 'status'))
+)
+http_response_size = registry.register(
+    Histogram('http_response_size_bytes', 'HTTP response body size by route.', ('method', 'route'), SIZE_BUCKETS)
+)
+http_request_statements = registry.register(
+    Histogram(
+        'http_request_sql_statements',
+        'SQL statements executed per HTTP request.',
+        ('method', 'route'),
+        STATEMENT_BUCKETS,
+    )
+)
+http_requests_in_flight = registry.register(Gauge('http_requests_in_flight', 'HTTP requests currently being served.'))
+db_pool_checked_out = registry.register(
+    Gauge('db_pool_checked_out', 'Connections currently checked out of the pool.', ('pool',))
+)
+db_pool_overflow = registry.register(Gauge('db_pool_overflow', 'Connections open beyond the pool size.', ('pool',)))
+db_pool_size = registry.register(Gauge('db_pool_size', 'Configured pool size.', ('pool',)))
+celery_task_duration = registry.register(
+    Histogram('celery_task_duration_seconds', 'Celery task run time.', ('task', 'state'), TASK_BUCKETS)
+)
+
+# Per-request statement counter; the middleware sets a fresh one-element list for each request.
+request_statements: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    'request_statements', default=None
+)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_request_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = request_statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def register_pool(name: str, engine: Engine) -> None:
+    """Export checked-out/overflow/size gauges for a QueuePool-style pool, read at scrape time."""
+    pool = engine.pool
+    if not all(callable(getattr(pool, attribute, None)) for attribute in ('checkedout', 'overflow', 'size')):
+        return
+    db_pool_checked_out.set_function((name,), pool.checkedout)
+    # QueuePool.overflow() counts up from -pool_size; only connections past the pool size are overflow.
+    db_pool_overflow.set_function((name,), lambda: max(0, pool.overflow()))
+    db_pool_size.set_function((name,), pool.size)
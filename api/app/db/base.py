@@ -1,6 +1,7 @@
 from app.models.base import Base
 from app.models.config_threshold import ConfigThreshold
 from app.models.farm import Farm
+from app.models.farm_observation_summary import FarmObservationSummary
 from app.models.job_run import JobRun
 from app.models.paddock import Paddock
 from app.models.paddock_observation import PaddockObservation
@@ -13,6 +14,7 @@ __all__ = [
     'Base',
     'ConfigThreshold',
     'Farm',
+    'FarmObservationSummary',
     'JobRun',
     'Paddock',
     'PaddockObservation',
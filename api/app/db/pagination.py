@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(timestamp: datetime, row_id: str) -> str:
+    payload = json.dumps([timestamp.isoformat(), row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(timestamp), str(row_id)
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+        raise InvalidCursor('Invalid pagination cursor.') from exc
+
+
+def keyset_page(
+    db: Session,
+    stmt: Select,
+    timestamp_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: str | None,
+    limit: int,
+    descending: bool = True,
+) -> tuple[list[dict], str | None]:
+    """One page of `stmt` ordered by (timestamp, id), resuming after `cursor`.
+
+    Seeks past the cursor with a row-value comparison instead of OFFSET, so with a matching
+    composite index every page costs the same however deep into the listing it is. Rows come
+    back as plain mappings; the selected columns must include both key columns.
+    """
+    key = tuple_(timestamp_column, id_column)
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        # Typed literals so dialects that store datetimes as text (SQLite) compare like for like.
+        position = tuple_(literal(timestamp, timestamp_column.type), literal(row_id, id_column.type))
+        stmt = stmt.where(key < position if descending else key > position)
+    if descending:
+        stmt = stmt.order_by(timestamp_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(timestamp_column.asc(), id_column.asc())
+
+    rows = [dict(row) for row in db.execute(stmt.limit(limit + 1)).mappings()]
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last[timestamp_column.key], last[id_column.key])
@@ -1,6 +1,8 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import get_settings
@@ -10,6 +12,23 @@ settings = get_settings()
 engine = create_engine(settings.database_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+ASYNC_DRIVERS = {'postgresql': 'psycopg', 'sqlite': 'aiosqlite'}
+
+
+def async_database_url(url: str) -> str:
+    """Same database as `url`, addressed through its asyncio driver (psycopg async, aiosqlite)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f'No async driver configured for {backend!r} databases.')
+    return parsed.set(drivername=f'{backend}+{driver}').render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(async_database_url(settings.database_url), pool_pre_ping=True)
+# Objects stay readable after commit: lazy refreshes would need an await the caller cannot make.
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -17,3 +36,8 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
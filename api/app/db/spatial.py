@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+
+from sqlalchemy import Text, func
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement, FunctionElement
+from sqlalchemy.types import TypeDecorator, UserDefinedType
+
+SRID = 4326
+
+
+class _PostGISGeometry(UserDefinedType):
+    cache_ok = True
+
+    def get_col_spec(self, **kw) -> str:
+        return f'geometry(Geometry, {SRID})'
+
+
+class Geometry(TypeDecorator):
+    """GeoJSON geometry stored as PostGIS `geometry(Geometry, 4326)` on PostgreSQL and as GeoJSON text elsewhere.
+
+    Values are GeoJSON dicts on both sides; on PostgreSQL binds go through ST_GeomFromGeoJSON
+    and selects through ST_AsGeoJSON, so spatial SQL sees a real geometry.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(_PostGISGeometry())
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value: dict | str | None, dialect: Dialect) -> str | None:
+        # Bulk writers may pass GeoJSON they have already serialized.
+        if value is None or isinstance(value, str):
+            return value
+        return json.dumps(value, separators=(',', ':'))
+
+    def process_result_value(self, value: str | None, dialect: Dialect) -> dict | None:
+        return json.loads(value) if value else None
+
+    def bind_expression(self, bindvalue):
+        return _FromGeoJSON(bindvalue)
+
+    def column_expression(self, column):
+        return _AsGeoJSON(column, type_=self)
+
+
+class _FromGeoJSON(FunctionElement):
+    inherit_cache = True
+
+
+class _AsGeoJSON(FunctionElement):
+    inherit_cache = True
+
+    def __init__(self, *clauses, type_=None) -> None:
+        super().__init__(*clauses)
+        self.type = type_
+
+
+@compiles(_FromGeoJSON)
+@compiles(_AsGeoJSON)
+def _compile_passthrough(element, compiler, **kw) -> str:
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(_FromGeoJSON, 'postgresql')
+def _compile_from_geojson_postgresql(element, compiler, **kw) -> str:
+    return f'ST_SetSRID(ST_GeomFromGeoJSON({compiler.process(element.clauses, **kw)}), {SRID})'
+
+
+@compiles(_AsGeoJSON, 'postgresql')
+def _compile_as_geojson_postgresql(element, compiler, **kw) -> str:
+    return f'ST_AsGeoJSON({compiler.process(element.clauses, **kw)})'
+
+
+def postgis_enabled(dialect: Dialect) -> bool:
+    return dialect.name == 'postgresql'
+
+
+def geometry_literal(geom_geojson: dict) -> ColumnElement:
+    """A bound GeoJSON value as a PostGIS geometry, for spatial predicates."""
+    return func.ST_SetSRID(func.ST_GeomFromGeoJSON(json.dumps(geom_geojson, separators=(',', ':'))), SRID)
+
+
+def geodesic_area_hectares(geom_geojson: dict) -> ColumnElement:
+    """PostGIS ellipsoidal area of a GeoJSON geometry, evaluated by the database."""
+    return func.ST_Area(func.geography(geometry_literal(geom_geojson))) / 10_000.0
+
+
+def autogenerate_filter(dialect_name: str) -> Callable[..., bool]:
+    """Alembic `include_object` hook that skips schema items declared `.ddl_if(dialect=...)` for another dialect."""
+
+    def include_object(obj, name, type_, reflected, compare_to) -> bool:
+        ddl_if = getattr(obj, '_ddl_if', None)
+        return ddl_if is None or ddl_if.dialect is None or ddl_if.dialect == dialect_name
+
+    return include_object
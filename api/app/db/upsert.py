@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.base import Base
+
+
+def upsert_rows(
+    db: Session,
+    model: type[Base],
+    rows: Sequence[dict],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> int:
+    """Set-based `INSERT ... ON CONFLICT DO UPDATE` for the rows; does not commit.
+
+    PostgreSQL and SQLite share the same statement shape. Other dialects fall back to one
+    keyed SELECT followed by ORM updates/inserts.
+    """
+    if not rows:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return _select_then_write(db, model, rows, conflict_columns, update_columns)
+
+    stmt = insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={column: stmt.excluded[column] for column in update_columns},
+    )
+    db.execute(stmt, list(rows))
+    return len(rows)
+
+
+def _select_then_write(
+    db: Session,
+    model: type[Base],
+    rows: Sequence[dict],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> int:
+    key_columns = [getattr(model, column) for column in conflict_columns]
+    keys = [tuple(row[column] for column in conflict_columns) for row in rows]
+    existing = {
+        tuple(getattr(obj, column) for column in conflict_columns): obj
+        for obj in db.scalars(select(model).where(tuple_(*key_columns).in_(keys)))
+    }
+    for key, row in zip(keys, rows):
+        obj = existing.get(key)
+        if obj is None:
+            db.add(model(**row))
+            continue
+        for column in update_columns:
+            setattr(obj, column, row[column])
+    db.flush()
+    return len(rows)
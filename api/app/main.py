@@ -3,10 +3,14 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api import metrics
+from app.api.middleware import MetricsMiddleware
 from app.api.v1.router import api_router
 from app.core.config import get_settings
+from app.core.metrics import register_pool
 from app.db.base import Base
-from app.db.session import engine, SessionLocal
+from app.db.session import async_engine, engine, SessionLocal
+from app.services.openweather_client import close_openweather_client
 from app.services.seed import seed_demo_data
 
 settings = get_settings()
@@ -21,6 +25,8 @@ async def lifespan(_: FastAPI):
         with SessionLocal() as db:
             seed_demo_data(db)
     yield
+    await close_openweather_client()
+    await async_engine.dispose()
 
 
 app = FastAPI(title=settings.app_name, version='0.1.0', lifespan=lifespan)
@@ -31,4 +37,9 @@ app.add_middleware(
     allow_methods=['*'],
     allow_headers=['*'],
 )
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    register_pool('sync', engine)
+    register_pool('async', async_engine.sync_engine)
+    app.include_router(metrics.router)
 app.include_router(api_router, prefix=settings.api_v1_prefix)
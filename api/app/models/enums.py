@@ -32,3 +32,5 @@ class JobType(str, enum.Enum):
     fetch_weather = 'fetch_weather'
     generate_recommendations = 'generate_recommendations'
     cleanup_artifacts = 'cleanup_artifacts'
+    ingest_pipeline = 'ingest_pipeline'
+    import_paddocks = 'import_paddocks'
@@ -1,4 +1,4 @@
-from sqlalchemy import Float, String, Text
+from sqlalchemy import Float, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -6,10 +6,13 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 
 class Farm(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = 'farms'
+    __table_args__ = (Index('ix_farms_created_at_id', 'created_at', 'id'),)
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
     latitude: Mapped[float] = mapped_column(Float, nullable=False)
     longitude: Mapped[float] = mapped_column(Float, nullable=False)
+    # Bumped with every write that changes what the farm's read endpoints return; their ETags derive from it.
+    data_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
 
     paddocks = relationship('Paddock', back_populates='farm', cascade='all, delete-orphan')
@@ -0,0 +1,27 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, UUIDPrimaryKeyMixin
+
+
+class FarmObservationSummary(UUIDPrimaryKeyMixin, Base):
+    """Per-farm, per-date rollup of `paddock_observations`, rewritten whenever that date's observations change."""
+
+    __tablename__ = 'farm_observation_summaries'
+    __table_args__ = (UniqueConstraint('farm_id', 'obs_date', name='uq_farm_observation_summary_date'),)
+
+    farm_id: Mapped[str] = mapped_column(ForeignKey('farms.id', ondelete='CASCADE'), nullable=False)
+    obs_date: Mapped[date] = mapped_column(Date, nullable=False)
+    paddock_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Mean over paddocks with data; null when every paddock is NO_DATA.
+    ndvi_mean: Mapped[float | None] = mapped_column(Float)
+    bucket_very_low: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bucket_low: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bucket_medium: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bucket_high: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    quality_ok: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    quality_cloudy: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    quality_no_data: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, JSON, Text
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, JSON, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, UUIDPrimaryKeyMixin
@@ -9,6 +9,10 @@ from app.models.enums import JobStatus, JobType
 
 class JobRun(UUIDPrimaryKeyMixin, Base):
     __tablename__ = 'job_runs'
+    __table_args__ = (
+        Index('ix_job_runs_started_at_id', 'started_at', 'id'),
+        Index('ix_job_runs_farm_started_at_id', 'farm_id', 'started_at', 'id'),
+    )
 
     job_type: Mapped[JobType] = mapped_column(Enum(JobType, name='job_type_enum'), nullable=False, index=True)
     farm_id: Mapped[str | None] = mapped_column(ForeignKey('farms.id', ondelete='SET NULL'), index=True)
@@ -1,16 +1,51 @@
-from sqlalchemy import Float, ForeignKey, JSON, String
+from sqlalchemy import DDL, Float, ForeignKey, Index, JSON, String, event, inspect
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.db.spatial import Geometry, geodesic_area_hectares, postgis_enabled
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+from app.services.geometry import polygon_area_hectares
 
 
 class Paddock(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = 'paddocks'
+    __table_args__ = (
+        Index('ix_paddocks_farm_created_at_id', 'farm_id', 'created_at', 'id'),
+        Index('ix_paddocks_geom', 'geom', postgresql_using='gist').ddl_if(dialect='postgresql'),
+    )
 
     farm_id: Mapped[str] = mapped_column(ForeignKey('farms.id', ondelete='CASCADE'), nullable=False, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     geom_geojson: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # Spatial copy of geom_geojson (PostGIS geometry, or GeoJSON text without PostGIS), written with it.
+    geom: Mapped[dict | None] = mapped_column(Geometry, deferred=True)
     area_ha: Mapped[float] = mapped_column(Float, nullable=False)
 
     farm = relationship('Farm', back_populates='paddocks')
     observations = relationship('PaddockObservation', back_populates='paddock', cascade='all, delete-orphan')
+
+
+event.listen(
+    Paddock.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS postgis').execute_if(dialect='postgresql'),
+)
+
+
+@event.listens_for(Paddock, 'before_insert')
+def _geometry_on_insert(mapper, connection, target: Paddock) -> None:
+    _sync_geometry(connection, target)
+
+
+@event.listens_for(Paddock, 'before_update')
+def _geometry_on_update(mapper, connection, target: Paddock) -> None:
+    if inspect(target).attrs.geom_geojson.history.has_changes():
+        _sync_geometry(connection, target)
+
+
+def _sync_geometry(connection, target: Paddock) -> None:
+    """Write `geom` and `area_ha` from `geom_geojson`; with PostGIS the area is computed by the database."""
+    target.geom = target.geom_geojson
+    if postgis_enabled(connection.dialect):
+        target.area_ha = geodesic_area_hectares(target.geom_geojson)
+    else:
+        target.area_ha = polygon_area_hectares(target.geom_geojson)
@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import Date, Enum, Float, ForeignKey, UniqueConstraint
+from sqlalchemy import Date, Enum, Float, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -9,11 +9,14 @@ from app.models.enums import QualityFlag
 
 class PaddockObservation(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = 'paddock_observations'
-    __table_args__ = (UniqueConstraint('paddock_id', 'obs_date', name='uq_paddock_obs_date'),)
-
-    paddock_id: Mapped[str] = mapped_column(
-        ForeignKey('paddocks.id', ondelete='CASCADE'), nullable=False, index=True
+    __table_args__ = (
+        UniqueConstraint('paddock_id', 'obs_date', name='uq_paddock_obs_date'),
+        Index('ix_paddock_observations_farm_obs_date', 'farm_id', 'obs_date'),
     )
+
+    paddock_id: Mapped[str] = mapped_column(ForeignKey('paddocks.id', ondelete='CASCADE'), nullable=False)
+    # Copy of the paddock's farm so farm-scoped reads filter and sort without joining paddocks.
+    farm_id: Mapped[str] = mapped_column(ForeignKey('farms.id', ondelete='CASCADE'), nullable=False)
     obs_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     ndvi_mean: Mapped[float] = mapped_column(Float, nullable=False)
     ndvi_p10: Mapped[float | None] = mapped_column(Float)
@@ -25,3 +28,11 @@ class PaddockObservation(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     )
 
     paddock = relationship('Paddock', back_populates='observations')
+
+
+# Latest-first reads of one paddock's history (series, recommendation windows).
+Index(
+    'ix_paddock_observations_paddock_obs_date_desc',
+    PaddockObservation.paddock_id,
+    PaddockObservation.obs_date.desc(),
+)
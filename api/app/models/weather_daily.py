@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, String
+from sqlalchemy import Date, DateTime, Float, ForeignKey, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, UUIDPrimaryKeyMixin
@@ -8,6 +8,7 @@ from app.models.base import Base, UUIDPrimaryKeyMixin
 
 class WeatherDaily(UUIDPrimaryKeyMixin, Base):
     __tablename__ = 'weather_daily'
+    __table_args__ = (UniqueConstraint('farm_id', 'date', name='uq_weather_farm_date'),)
 
     farm_id: Mapped[str] = mapped_column(ForeignKey('farms.id', ondelete='CASCADE'), nullable=False, index=True)
     date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
@@ -40,8 +40,17 @@ class PaddockImportItem(BaseModel):
     geom_geojson: dict
 
 
-class PaddockImportRequest(BaseModel):
-    feature_collection: dict
+class PaddockIntersectRequest(BaseModel):
+    geometry: dict
+
+    @field_validator('geometry')
+    @classmethod
+    def validate_geometry(cls, value: dict) -> dict:
+        if value.get('type') not in ('Polygon', 'MultiPolygon'):
+            raise ValueError('Only GeoJSON Polygon or MultiPolygon geometries are supported.')
+        if not value.get('coordinates'):
+            raise ValueError('GeoJSON geometry requires coordinates.')
+        return value
 
 
 class PaddockObservationPoint(BaseModel):
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import hashlib
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.farm import Farm
+
+# Part of every ETag; bump when a conditional endpoint's response shape changes so clients refetch.
+REPRESENTATION_VERSION = 1
+
+
+def bump_data_version(db: Session, farm_id: str) -> None:
+    """Advance the farm's data version; does not commit.
+
+    Call it in the transaction that makes the write, so no reader can see the new data
+    under the old version (and answer a stale ETag with 304).
+    """
+    db.execute(
+        update(Farm)
+        .where(Farm.id == farm_id)
+        .values(data_version=Farm.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def get_data_version(db: Session, farm_id: str) -> int | None:
+    return db.scalar(_version_query(farm_id))
+
+
+async def get_data_version_async(db: AsyncSession, farm_id: str) -> int | None:
+    return await db.scalar(_version_query(farm_id))
+
+
+def data_etag(farm_id: str, version: int, *parts: object) -> str:
+    """Strong ETag for a representation of the farm's data at `version`; `parts` name the representation."""
+    key = repr((REPRESENTATION_VERSION, farm_id, version, parts)).encode('utf-8')
+    return f'"{version}-{hashlib.blake2b(key, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header names `etag` (weak comparison, as RFC 9110 specifies for it)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return '*' in candidates or etag in (candidate.removeprefix('W/') for candidate in candidates)
+
+
+def _version_query(farm_id: str):
+    return select(Farm.data_version).where(Farm.id == farm_id)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+
+class DiskLRUCache:
+    """Size-capped byte cache on local disk; file mtime doubles as the LRU clock.
+
+    Several processes may share a cache directory. Each keeps its own running size
+    estimate and rescans the directory before evicting, so the estimate never drifts far.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial file.
+        tmp = path.with_name(f'.{path.name}.{uuid.uuid4().hex}.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def delete_prefix(self, prefix: str) -> None:
+        target = self._path(prefix)
+        if target.is_dir():
+            shutil.rmtree(target, ignore_errors=True)
+        else:
+            target.unlink(missing_ok=True)
+        with self._lock:
+            self._size = None
+
+    def children(self, prefix: str) -> list[str]:
+        """Names directly under `prefix`, so callers can walk a key hierarchy without probing every key."""
+        try:
+            return [name for name in os.listdir(self._path(prefix)) if not name.startswith('.')]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+        with self._lock:
+            self._size = None
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f'Cache key escapes cache root: {key}')
+        return path
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
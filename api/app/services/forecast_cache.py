@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections.abc import Awaitable, Callable
+
+from app.core.config import get_settings
+
+Cell = tuple[int, int]
+
+
+class ForecastCache:
+    """Process-local TTL cache of day-bucketed forecasts keyed by a lat/lon grid cell.
+
+    Farms closer together than `cell_degrees` share one upstream fetch, made at the cell
+    centre so every farm in the cell sees the same forecast whichever one asked first.
+    Concurrent misses for a cell on the same event loop await a single in-flight request.
+    """
+
+    def __init__(self, cell_degrees: float, ttl_seconds: float, max_entries: int = 10_000) -> None:
+        self.cell_degrees = cell_degrees
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[Cell, tuple[float, list[dict]]] = {}
+        self._inflight: dict[tuple[int, Cell], asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def cell(self, lat: float, lon: float) -> Cell:
+        return (math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees))
+
+    def cell_center(self, cell: Cell) -> tuple[float, float]:
+        return (
+            round((cell[0] + 0.5) * self.cell_degrees, 6),
+            round((cell[1] + 0.5) * self.cell_degrees, 6),
+        )
+
+    async def get_or_fetch(
+        self,
+        lat: float,
+        lon: float,
+        fetch: Callable[[float, float], Awaitable[list[dict]]],
+    ) -> list[dict]:
+        cell = self.cell(lat, lon)
+        cached = self._get(cell)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        loop = asyncio.get_running_loop()
+        key = (id(loop), cell)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future: asyncio.Future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            forecast = await fetch(*self.cell_center(cell))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; mark it retrieved so a lone miss does not log a warning.
+            future.exception()
+            raise
+        else:
+            self._put(cell, forecast)
+            future.set_result(forecast)
+            return forecast
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'cells': len(self._entries)}
+
+    def _get(self, cell: Cell) -> list[dict] | None:
+        entry = self._entries.get(cell)
+        if entry is None:
+            return None
+        expires_at, forecast = entry
+        if expires_at <= time.monotonic():
+            with self._lock:
+                self._entries.pop(cell, None)
+            return None
+        return forecast
+
+    def _put(self, cell: Cell, forecast: list[dict]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[cell] = (now + self.ttl_seconds, forecast)
+
+
+forecast_cache = ForecastCache(get_settings().weather_cell_degrees, get_settings().weather_cache_ttl_seconds)
@@ -1,37 +1,272 @@
 from __future__ import annotations
 
-import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import chain
 
+import numpy as np
 
-def polygon_area_hectares(geom_geojson: dict) -> float:
-    """Approximate polygon area in hectares using Web Mercator projection."""
-    coords = geom_geojson.get('coordinates', [[]])[0]
-    if len(coords) < 4:
-        return 0.0
+from app.services.projection import WGS84_A, WGS84_E2
+
+BBox = tuple[float, float, float, float]
+
+_E = float(np.sqrt(WGS84_E2))
+
+
+def _authalic_q(sin_lat: np.ndarray) -> np.ndarray:
+    # Snyder (1987) eq. 3-12: q(phi), proportional to the ellipsoid area between the equator and phi.
+    e_sin = _E * sin_lat
+    return (1.0 - WGS84_E2) * (sin_lat / (1.0 - e_sin * e_sin) - np.log((1.0 - e_sin) / (1.0 + e_sin)) / (2.0 * _E))
+
+
+_Q_POLE = float(_authalic_q(np.array(1.0)))
+# Radius of the sphere with the WGS84 ellipsoid's surface area (~6,371,007.2 m).
+AUTHALIC_RADIUS_M = WGS84_A * float(np.sqrt(_Q_POLE / 2.0))
+
+# Snyder (1987) eq. 3-18: authalic latitude back to geodetic latitude.
+_E4, _E6 = WGS84_E2**2, WGS84_E2**3
+_INVERSE_AUTHALIC = (
+    WGS84_E2 / 3.0 + 31.0 * _E4 / 180.0 + 517.0 * _E6 / 5040.0,
+    23.0 * _E4 / 360.0 + 251.0 * _E6 / 3780.0,
+    761.0 * _E6 / 45360.0,
+)
+
+
+@dataclass(frozen=True)
+class RingBatch:
+    """Rings of many Polygon/MultiPolygon geometries packed into flat vertex arrays.
+
+    Ring `r` spans `lon[ring_offsets[r]:ring_offsets[r + 1]]`, belongs to geometry `ring_geometry[r]`
+    and is an exterior ring unless `ring_is_hole[r]`.
+    """
+
+    lon: np.ndarray
+    lat: np.ndarray
+    ring_offsets: np.ndarray
+    ring_geometry: np.ndarray
+    ring_is_hole: np.ndarray
+    geometry_count: int
+
+
+def pack_rings(geometries: Sequence[dict]) -> RingBatch:
+    """Pack GeoJSON Polygon/MultiPolygon dicts for the batch functions; rings under 3 vertices are dropped."""
+    rings: list[list] = []
+    ring_geometry: list[int] = []
+    ring_is_hole: list[bool] = []
+    for index, geom_geojson in enumerate(geometries):
+        for polygon in _polygons(geom_geojson):
+            for ring_index, ring in enumerate(polygon):
+                if len(ring) < 3:
+                    continue
+                rings.append(ring)
+                ring_geometry.append(index)
+                ring_is_hole.append(ring_index > 0)
+
+    offsets = np.zeros(len(rings) + 1, dtype=np.int64)
+    np.cumsum([len(ring) for ring in rings], out=offsets[1:])
+    vertex_count = int(offsets[-1])
+    # One flat pass over the coordinate floats; positions carrying a third value take the slow path.
+    flat = np.fromiter(chain.from_iterable(chain.from_iterable(rings)), dtype=np.float64)
+    if len(flat) == 2 * vertex_count:
+        vertices = flat.reshape(vertex_count, 2)
+    else:
+        vertices = np.array([point[:2] for ring in rings for point in ring], dtype=np.float64).reshape(-1, 2)
+    return RingBatch(
+        lon=vertices[:, 0],
+        lat=vertices[:, 1],
+        ring_offsets=offsets,
+        ring_geometry=np.asarray(ring_geometry, dtype=np.int64),
+        ring_is_hole=np.asarray(ring_is_hole, dtype=bool),
+        geometry_count=len(geometries),
+    )
 
-    projected = [_lon_lat_to_mercator(lon, lat) for lon, lat in coords]
-    area_m2 = 0.0
-    for i in range(len(projected) - 1):
-        x1, y1 = projected[i]
-        x2, y2 = projected[i + 1]
-        area_m2 += x1 * y2 - x2 * y1
-    area_m2 = abs(area_m2) * 0.5
-    return area_m2 / 10_000.0
+
+def batch_area_hectares(geometries: RingBatch | Sequence[dict]) -> np.ndarray:
+    """Ellipsoidal (WGS84) area in hectares of each geometry, holes subtracted.
+
+    Vertices go through the authalic latitude onto Lambert's cylindrical equal-area projection,
+    where a shoelace sum is exact area; edges are straight in that projection, which for
+    paddock-sized polygons differs from geodesic edges by far less than survey error.
+    """
+    area, _, _ = _equal_area_moments(_as_batch(geometries))
+    return np.maximum(area, 0.0) * AUTHALIC_RADIUS_M * AUTHALIC_RADIUS_M / 10_000.0
+
+
+def batch_centroids(geometries: RingBatch | Sequence[dict]) -> np.ndarray:
+    """Area-weighted centroid (lon, lat) of each geometry, shape (n, 2).
+
+    The centroid is taken in the equal-area projection, so every square metre weighs the same;
+    holes pull it away and MultiPolygon parts contribute by area. Degenerate (zero-area)
+    geometries fall back to their vertex mean, and empty ones to (0, 0).
+    """
+    batch = _as_batch(geometries)
+    area, x, y = _equal_area_moments(batch)
+    centroids = np.zeros((batch.geometry_count, 2), dtype=np.float64)
+    has_area = area != 0.0
+    lon = np.degrees(x[has_area])
+    centroids[has_area, 0] = (lon + 180.0) % 360.0 - 180.0
+    centroids[has_area, 1] = _geodetic_latitude(np.arcsin(np.clip(y[has_area], -1.0, 1.0)))
+
+    degenerate = ~has_area
+    if degenerate.any():
+        vertex_geometry = _vertex_geometry(batch)
+        counts = np.bincount(vertex_geometry, minlength=batch.geometry_count)
+        with np.errstate(invalid='ignore'):
+            mean_lon = np.bincount(vertex_geometry, batch.lon, minlength=batch.geometry_count) / counts
+            mean_lat = np.bincount(vertex_geometry, batch.lat, minlength=batch.geometry_count) / counts
+        centroids[degenerate, 0] = np.nan_to_num(mean_lon[degenerate])
+        centroids[degenerate, 1] = np.nan_to_num(mean_lat[degenerate])
+    return centroids
+
+
+def polygon_area_hectares(geom_geojson: dict) -> float:
+    """Ellipsoidal area in hectares of a Polygon/MultiPolygon; see `batch_area_hectares`."""
+    return float(batch_area_hectares([geom_geojson])[0])
 
 
 def polygon_centroid(geom_geojson: dict) -> tuple[float, float]:
-    coords = geom_geojson.get('coordinates', [[]])[0]
-    if not coords:
-        return (0.0, 0.0)
-    lon_sum = sum(point[0] for point in coords[:-1])
-    lat_sum = sum(point[1] for point in coords[:-1])
-    count = max(1, len(coords) - 1)
-    return (lon_sum / count, lat_sum / count)
-
-
-def _lon_lat_to_mercator(lon: float, lat: float) -> tuple[float, float]:
-    radius = 6_378_137.0
-    x = math.radians(lon) * radius
-    lat = max(min(lat, 89.5), -89.5)
-    y = radius * math.log(math.tan(math.pi / 4.0 + math.radians(lat) / 2.0))
-    return (x, y)
+    """Area-weighted (lon, lat) centroid of a Polygon/MultiPolygon; see `batch_centroids`."""
+    lon, lat = batch_centroids([geom_geojson])[0]
+    return (float(lon), float(lat))
+
+
+def geometry_bbox(geom_geojson: dict) -> BBox:
+    points = [point for polygon in _polygons(geom_geojson) for ring in polygon for point in ring]
+    if not points:
+        return (0.0, 0.0, 0.0, 0.0)
+    lons = [point[0] for point in points]
+    lats = [point[1] for point in points]
+    return (min(lons), min(lats), max(lons), max(lats))
+
+
+def bbox_polygon(bbox: BBox) -> dict:
+    min_lon, min_lat, max_lon, max_lat = bbox
+    ring = [[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]]
+    return {'type': 'Polygon', 'coordinates': [ring]}
+
+
+def geometries_intersect(first: dict, second: dict) -> bool:
+    """Planar lon/lat intersection test for Polygon/MultiPolygon GeoJSON (touching counts)."""
+    if not _bboxes_overlap(geometry_bbox(first), geometry_bbox(second)):
+        return False
+    for polygon_a in _polygons(first):
+        for polygon_b in _polygons(second):
+            if _polygons_intersect(polygon_a, polygon_b):
+                return True
+    return False
+
+
+def _as_batch(geometries: RingBatch | Sequence[dict]) -> RingBatch:
+    return geometries if isinstance(geometries, RingBatch) else pack_rings(geometries)
+
+
+def _vertex_geometry(batch: RingBatch) -> np.ndarray:
+    return np.repeat(batch.ring_geometry, np.diff(batch.ring_offsets))
+
+
+def _equal_area_moments(batch: RingBatch) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per geometry: area on the unit authalic sphere and its centroid as (longitude radians, sin(authalic lat))."""
+    count = batch.geometry_count
+    ring_count = len(batch.ring_geometry)
+    if ring_count == 0:
+        return np.zeros(count), np.zeros(count), np.zeros(count)
+
+    starts = batch.ring_offsets[:-1]
+    vertex_ring = np.repeat(np.arange(ring_count), np.diff(batch.ring_offsets))
+    vertex_geometry = batch.ring_geometry[vertex_ring]
+
+    x = np.radians(batch.lon)
+    y = _authalic_q(np.sin(np.radians(batch.lat))) / _Q_POLE
+    # Work relative to each geometry's first vertex: keeps the shoelace well conditioned and,
+    # with longitudes wrapped into [-pi, pi), lets polygons cross the antimeridian.
+    with_rings, first_ring = np.unique(batch.ring_geometry, return_index=True)
+    origin_x = np.zeros(count)
+    origin_y = np.zeros(count)
+    origin_x[with_rings] = x[starts[first_ring]]
+    origin_y[with_rings] = y[starts[first_ring]]
+    x = (x - origin_x[vertex_geometry] + np.pi) % (2.0 * np.pi) - np.pi
+    y = y - origin_y[vertex_geometry]
+
+    # Each ring closes on itself whether or not GeoJSON repeated the first vertex.
+    following = np.arange(1, len(x) + 1)
+    following[batch.ring_offsets[1:] - 1] = starts
+    x_next, y_next = x[following], y[following]
+    cross = x * y_next - x_next * y
+
+    ring_area = np.bincount(vertex_ring, cross, minlength=ring_count) / 2.0
+    ring_mx = np.bincount(vertex_ring, (x + x_next) * cross, minlength=ring_count) / 6.0
+    ring_my = np.bincount(vertex_ring, (y + y_next) * cross, minlength=ring_count) / 6.0
+    # Orient exteriors positive and holes negative regardless of winding order.
+    sign = np.sign(ring_area) * np.where(batch.ring_is_hole, -1.0, 1.0)
+
+    area = np.bincount(batch.ring_geometry, sign * ring_area, minlength=count)
+    mx = np.bincount(batch.ring_geometry, sign * ring_mx, minlength=count)
+    my = np.bincount(batch.ring_geometry, sign * ring_my, minlength=count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centroid_x = np.where(area != 0.0, mx / area, 0.0) + origin_x
+        centroid_y = np.where(area != 0.0, my / area, 0.0) + origin_y
+    return area, centroid_x, centroid_y
+
+
+def _geodetic_latitude(authalic: np.ndarray) -> np.ndarray:
+    first, second, third = _INVERSE_AUTHALIC
+    return np.degrees(
+        authalic + first * np.sin(2.0 * authalic) + second * np.sin(4.0 * authalic) + third * np.sin(6.0 * authalic)
+    )
+
+
+def _polygons(geom_geojson: dict) -> list[list]:
+    coordinates = geom_geojson.get('coordinates') or []
+    if geom_geojson.get('type') == 'MultiPolygon':
+        return [polygon for polygon in coordinates if polygon]
+    return [coordinates] if coordinates else []
+
+
+def _bboxes_overlap(first: BBox, second: BBox) -> bool:
+    return first[0] <= second[2] and second[0] <= first[2] and first[1] <= second[3] and second[1] <= first[3]
+
+
+def _polygons_intersect(polygon_a: list, polygon_b: list) -> bool:
+    # Boundaries crossing, or one polygon lying inside the other (outside its holes).
+    edges_b = [edge for ring in polygon_b for edge in zip(ring, ring[1:])]
+    for ring in polygon_a:
+        for start, end in zip(ring, ring[1:]):
+            if any(_segments_intersect(start, end, other_start, other_end) for other_start, other_end in edges_b):
+                return True
+    return _point_in_polygon(polygon_a[0][0], polygon_b) or _point_in_polygon(polygon_b[0][0], polygon_a)
+
+
+def _point_in_polygon(point: list, polygon: list) -> bool:
+    return _point_in_ring(point, polygon[0]) and not any(_point_in_ring(point, hole) for hole in polygon[1:])
+
+
+def _point_in_ring(point: list, ring: list) -> bool:
+    x, y = point[0], point[1]
+    inside = False
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+        if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+            inside = not inside
+    return inside
+
+
+def _segments_intersect(p1: list, p2: list, q1: list, q2: list) -> bool:
+    d1 = _orientation(q1, q2, p1)
+    d2 = _orientation(q1, q2, p2)
+    d3 = _orientation(p1, p2, q1)
+    d4 = _orientation(p1, p2, q2)
+    if ((d1 > 0) != (d2 > 0)) and d1 != 0 and d2 != 0 and ((d3 > 0) != (d4 > 0)) and d3 != 0 and d4 != 0:
+        return True
+    return (
+        (d1 == 0 and _on_segment(q1, q2, p1))
+        or (d2 == 0 and _on_segment(q1, q2, p2))
+        or (d3 == 0 and _on_segment(p1, p2, q1))
+        or (d4 == 0 and _on_segment(p1, p2, q2))
+    )
+
+
+def _orientation(a: list, b: list, c: list) -> float:
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _on_segment(a: list, b: list, point: list) -> bool:
+    return min(a[0], b[0]) <= point[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= point[1] <= max(a[1], b[1])
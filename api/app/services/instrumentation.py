@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import contextvars
+import resource
+import sys
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_active: contextvars.ContextVar[JobInstrumentation | None] = contextvars.ContextVar('job_instrumentation', default=None)
+
+
+class JobInstrumentation:
+    """Wall/CPU time and SQL statement counts per stage of one job, plus rows written and peak RSS.
+
+    CPU time is process-wide, so it includes other threads' work when jobs share a worker.
+    Statements are counted by a single engine-wide cursor listener that attributes them to
+    the instrumentation active in the current context, so concurrent jobs in other threads
+    or tasks do not leak into each other's counts. Context variables follow the job into
+    `asyncio.to_thread` and `AsyncSession.run_sync`.
+    """
+
+    def __init__(self) -> None:
+        self.timings: dict[str, dict] = {}
+        self.values: dict = {}
+        self.sql_statements = 0
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+        self._start_peak_rss_mb = peak_rss_mb()
+        self._token: contextvars.Token | None = None
+
+    def __enter__(self) -> JobInstrumentation:
+        self._token = _active.set(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._token is not None:
+            _active.reset(self._token)
+            self._token = None
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        statements = self.sql_statements
+        try:
+            yield
+        finally:
+            entry = self.timings.setdefault(name, {'wall_s': 0.0, 'cpu_s': 0.0, 'sql_statements': 0})
+            entry['wall_s'] = round(entry['wall_s'] + time.perf_counter() - wall, 4)
+            entry['cpu_s'] = round(entry['cpu_s'] + time.process_time() - cpu, 4)
+            entry['sql_statements'] += self.sql_statements - statements
+
+    def count(self, key: str, value: int = 1) -> None:
+        self.values[key] = self.values.get(key, 0) + value
+
+    def record(self, **values) -> None:
+        self.values.update(values)
+
+    def stats(self) -> dict:
+        peak = peak_rss_mb()
+        return {
+            'wall_s': round(time.perf_counter() - self._started, 4),
+            'cpu_s': round(time.process_time() - self._started_cpu, 4),
+            'sql_statements': self.sql_statements,
+            'timings': self.timings,
+            **self.values,
+            'peak_rss_mb': peak,
+            'rss_growth_mb': round(peak - self._start_peak_rss_mb, 1),
+        }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024.0 * 1024.0 if sys.platform == 'darwin' else 1024.0
+    return round(peak / divisor, 1)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    instrumentation = _active.get()
+    if instrumentation is not None:
+        instrumentation.sql_statements += 1
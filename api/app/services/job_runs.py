@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.enums import JobStatus, JobType
+from app.models.job_run import JobRun
+from app.services.instrumentation import JobInstrumentation
+
+PIPELINE_STAGES = ('ingest_satellite', 'fetch_weather', 'generate_recommendations')
+
+
+def start_pipeline_run(db: Session, farm_id: str) -> JobRun:
+    """Parent `JobRun` for one ingest -> weather -> recommendations chain, every stage pending."""
+    run = JobRun(
+        job_type=JobType.ingest_pipeline,
+        farm_id=farm_id,
+        status=JobStatus.running,
+        stats_json={'stages': {stage: {'status': 'pending'} for stage in PIPELINE_STAGES}},
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def mark_pipeline_stage(db: Session, run_id: str, stage: str, status: str, **details) -> JobRun | None:
+    """Record a stage transition; a failed stage fails the run and the last success completes it."""
+    run = db.get(JobRun, run_id, with_for_update=True, populate_existing=True)
+    if run is None:
+        return None
+
+    stats = dict(run.stats_json or {})
+    stages = dict(stats.get('stages') or {})
+    now = datetime.utcnow().isoformat()
+    entry = {**stages.get(stage, {}), 'status': status, **details}
+    entry.setdefault('started_at', now)
+    if status != 'running':
+        entry['finished_at'] = now
+    stages[stage] = entry
+    # JSON columns are not mutation-tracked, so assign a fresh dict.
+    run.stats_json = {**stats, 'stages': stages}
+
+    if status == 'failed':
+        run.status = JobStatus.failed
+        run.error = details.get('error')
+        run.finished_at = datetime.utcnow()
+    elif all(stages.get(name, {}).get('status') == 'success' for name in PIPELINE_STAGES):
+        run.status = JobStatus.success
+        run.finished_at = datetime.utcnow()
+    db.commit()
+    return run
+
+
+def pipeline_progress(run: JobRun) -> float:
+    stages = (run.stats_json or {}).get('stages') or {}
+    if not stages:
+        return 1.0 if run.status != JobStatus.running else 0.0
+    done = sum(1 for entry in stages.values() if entry.get('status') == 'success')
+    return round(done / len(stages), 3)
+
+
+def job_progress(run: JobRun) -> float:
+    """Share of work done: item counts (`processed` of `total`) when the run records them, else pipeline stages."""
+    stats = run.stats_json or {}
+    if 'total' in stats:
+        if not stats['total']:
+            return 1.0 if run.status != JobStatus.running else 0.0
+        return round(min(stats.get('processed', 0) / stats['total'], 1.0), 3)
+    return pipeline_progress(run)
+
+
+def serialize_job_run(run: JobRun) -> dict:
+    return {
+        'id': run.id,
+        'job_type': run.job_type.value,
+        'farm_id': run.farm_id,
+        'status': run.status.value,
+        'started_at': run.started_at,
+        'finished_at': run.finished_at,
+        'stats_json': run.stats_json,
+        'error': run.error,
+    }
+
+
+def duration_percentiles(db: Session, since: datetime, farm_id: str | None = None) -> list[dict]:
+    """p50/p95/max wall duration of finished runs per job type, for runs started since `since`."""
+    stmt = select(JobRun.job_type, JobRun.status, JobRun.started_at, JobRun.finished_at).where(
+        JobRun.finished_at.is_not(None),
+        JobRun.started_at >= since,
+    )
+    if farm_id:
+        stmt = stmt.where(JobRun.farm_id == farm_id)
+
+    durations: dict[JobType, list[float]] = {}
+    failed: dict[JobType, int] = {}
+    for job_type, status, started_at, finished_at in db.execute(stmt):
+        durations.setdefault(job_type, []).append((finished_at - started_at).total_seconds())
+        failed[job_type] = failed.get(job_type, 0) + (status == JobStatus.failed)
+
+    summary = []
+    for job_type in sorted(durations, key=lambda item: item.value):
+        values = np.asarray(durations[job_type])
+        p50, p95 = np.percentile(values, [50, 95])
+        summary.append(
+            {
+                'job_type': job_type.value,
+                'count': int(values.size),
+                'failed': failed[job_type],
+                'p50_s': round(float(p50), 3),
+                'p95_s': round(float(p95), 3),
+                'max_s': round(float(values.max()), 3),
+            }
+        )
+    return summary
+
+
+def start_job_run(db: Session, job_type: JobType, farm_id: str | None = None) -> JobRun:
+    run = JobRun(job_type=job_type, farm_id=farm_id, status=JobStatus.running, stats_json={})
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def finish_job_run(
+    db: Session,
+    run: JobRun,
+    status: JobStatus,
+    stats_json: dict,
+    error: str | None = None,
+) -> None:
+    run.status = status
+    run.finished_at = datetime.utcnow()
+    run.stats_json = stats_json
+    run.error = error
+    db.add(run)
+    db.commit()
+
+
+@contextmanager
+def tracked_job(
+    db: Session, job_type: JobType, farm_id: str | None = None
+) -> Generator[JobInstrumentation, None, None]:
+    """Run the body as one instrumented `JobRun`; an exception rolls back, records the failure and re-raises."""
+    run = start_job_run(db, job_type, farm_id)
+    with JobInstrumentation() as metrics:
+        try:
+            yield metrics
+        except Exception as exc:
+            db.rollback()
+            finish_job_run(db, run, JobStatus.failed, metrics.stats(), str(exc))
+            raise
+        finish_job_run(db, run, JobStatus.success, metrics.stats())
+
+
+@asynccontextmanager
+async def tracked_job_async(
+    db: AsyncSession, job_type: JobType, farm_id: str | None = None
+) -> AsyncGenerator[JobInstrumentation, None]:
+    run = await db.run_sync(start_job_run, job_type, farm_id)
+    with JobInstrumentation() as metrics:
+        try:
+            yield metrics
+        except Exception as exc:
+            await db.rollback()
+            await db.run_sync(finish_job_run, run, JobStatus.failed, metrics.stats(), str(exc))
+            raise
+        await db.run_sync(finish_job_run, run, JobStatus.success, metrics.stats())
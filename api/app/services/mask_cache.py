@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from functools import lru_cache
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.models.paddock import Paddock
+from app.services.disk_cache import DiskLRUCache
+from app.services.raster import PixelWindow, RasterGrid
+from app.services.zonal_stats import polygon_pixel_indices
+
+
+@lru_cache(maxsize=1)
+def get_mask_cache() -> DiskLRUCache:
+    settings = get_settings()
+    return DiskLRUCache(settings.mask_cache_dir, settings.mask_cache_max_mb * 1024 * 1024)
+
+
+def grid_key(grid: RasterGrid) -> str:
+    payload = json.dumps(grid.to_json(), sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def geometry_hash(geom_geojson: dict) -> str:
+    payload = json.dumps(geom_geojson, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def paddock_masks(grid: RasterGrid, paddocks: list[Paddock]) -> tuple[list[np.ndarray], int]:
+    """Flat pixel indices on the full scene grid for each paddock, plus the number of cache hits.
+
+    Entries are keyed by (grid, paddock id, geometry hash); a Sentinel-2 tile grid is
+    stable across scenes, so repeat aggregations skip polygon rasterization entirely.
+    """
+    cache = get_mask_cache()
+    grid_part = grid_key(grid)
+    masks: list[np.ndarray] = []
+    hits = 0
+    for paddock in paddocks:
+        key = f'{paddock.id}/{grid_part}-{geometry_hash(paddock.geom_geojson)}.npy'
+        cached = cache.get(key)
+        if cached is not None:
+            masks.append(np.load(io.BytesIO(cached)))
+            hits += 1
+            continue
+        indices = polygon_pixel_indices(grid, paddock.geom_geojson)
+        buffer = io.BytesIO()
+        np.save(buffer, indices)
+        cache.put(key, buffer.getvalue())
+        masks.append(indices)
+    return masks, hits
+
+
+def to_window_indices(indices: np.ndarray, grid: RasterGrid, window: PixelWindow) -> np.ndarray:
+    rows, cols = np.divmod(indices, grid.width)
+    inside = (
+        (rows >= window.row_off)
+        & (rows < window.row_off + window.height)
+        & (cols >= window.col_off)
+        & (cols < window.col_off + window.width)
+    )
+    return (rows[inside] - window.row_off) * window.width + (cols[inside] - window.col_off)
+
+
+def invalidate_paddock_masks(paddock_id: str) -> None:
+    get_mask_cache().delete_prefix(paddock_id)
@@ -0,0 +1,132 @@
+"""Minimal Mapbox Vector Tile (spec 2.1) encoder for polygon layers.
+
+Only what the paddock tiles need: polygon features with string, float, integer and boolean
+properties. Geometry arrives in integer tile coordinates with y pointing down; exterior rings
+must have positive surveyor's-formula area in those coordinates and holes negative.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+MVT_VERSION = 2
+DEFAULT_EXTENT = 4096
+
+_POLYGON = 3
+_MOVE_TO = 1
+_LINE_TO = 2
+_CLOSE_PATH = 7
+
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_BYTES = 2
+
+
+@dataclass
+class PolygonFeature:
+    rings: list[np.ndarray]
+    properties: dict = field(default_factory=dict)
+
+
+def encode_tile(layers: dict[str, list[PolygonFeature]], extent: int = DEFAULT_EXTENT) -> bytes:
+    """Serialize `{layer name: features}` as a tile; layers without features are left out."""
+    return b''.join(
+        _field(3, _WIRE_BYTES, _encode_layer(name, features, extent)) for name, features in layers.items() if features
+    )
+
+
+def ring_area(ring: np.ndarray) -> float:
+    """Surveyor's-formula area of an unclosed ring, in the sign convention the spec uses for tile coordinates."""
+    x = ring[:, 0].astype(np.float64)
+    y = ring[:, 1].astype(np.float64)
+    return float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2.0
+
+
+def _encode_layer(name: str, features: list[PolygonFeature], extent: int) -> bytes:
+    keys: dict[str, int] = {}
+    values: dict[tuple, int] = {}
+    encoded = []
+    for feature in features:
+        geometry = _encode_geometry(feature.rings)
+        if not geometry:
+            continue
+        tags = []
+        for key, value in feature.properties.items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault(_value_key(value), len(values)))
+        body = _field(2, _WIRE_BYTES, _packed(tags)) if tags else b''
+        body += _field(3, _WIRE_VARINT, _varint(_POLYGON)) + _field(4, _WIRE_BYTES, _packed(geometry))
+        encoded.append(_field(2, _WIRE_BYTES, body))
+
+    parts = [_field(15, _WIRE_VARINT, _varint(MVT_VERSION)), _field(1, _WIRE_BYTES, name.encode('utf-8'))]
+    parts.extend(encoded)
+    parts.extend(_field(3, _WIRE_BYTES, key.encode('utf-8')) for key in keys)
+    parts.extend(_field(4, _WIRE_BYTES, _encode_value(value)) for value in values)
+    parts.append(_field(5, _WIRE_VARINT, _varint(extent)))
+    return b''.join(parts)
+
+
+def _encode_geometry(rings: list[np.ndarray]) -> list[int]:
+    commands: list[int] = []
+    cursor = np.zeros(2, dtype=np.int64)
+    for ring in rings:
+        if len(ring) < 3:
+            continue
+        points = np.asarray(ring, dtype=np.int64)
+        deltas = np.diff(np.vstack([cursor, points]), axis=0)
+        cursor = points[-1]
+        # Zigzag: small negative deltas become small unsigned integers.
+        zigzag = ((deltas << 1) ^ (deltas >> 63)).ravel().tolist()
+        commands.append(_command(_MOVE_TO, 1))
+        commands.extend(zigzag[:2])
+        commands.append(_command(_LINE_TO, len(points) - 1))
+        commands.extend(zigzag[2:])
+        commands.append(_command(_CLOSE_PATH, 1))
+    return commands
+
+
+def _command(command_id: int, count: int) -> int:
+    return (count << 3) | command_id
+
+
+def _value_key(value: object) -> tuple:
+    # Keyed by type too, so True, 1 and 1.0 stay distinct entries in the values table.
+    return (type(value).__name__, value)
+
+
+def _encode_value(value_key: tuple) -> bytes:
+    _, value = value_key
+    if isinstance(value, bool):
+        return _field(7, _WIRE_VARINT, _varint(int(value)))
+    if isinstance(value, int):
+        if value < 0:
+            return _field(6, _WIRE_VARINT, _varint((value << 1) ^ (value >> 63)))
+        return _field(5, _WIRE_VARINT, _varint(value))
+    if isinstance(value, float):
+        return _field(3, _WIRE_FIXED64, np.float64(value).astype('<f8').tobytes())
+    return _field(1, _WIRE_BYTES, str(value).encode('utf-8'))
+
+
+def _field(number: int, wire_type: int, payload: bytes) -> bytes:
+    key = _varint((number << 3) | wire_type)
+    if wire_type == _WIRE_BYTES:
+        return key + _varint(len(payload)) + payload
+    return key + payload
+
+
+def _packed(values: list[int]) -> bytes:
+    return b''.join(_varint(value) for value in values)
+
+
+def _varint(value: int) -> bytes:
+    if value < 0x80:
+        return bytes((value,))
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
@@ -1,13 +1,15 @@
 from datetime import date
 
 
+# Upper bound (exclusive) of each bucket but the last; SQL rollups bucket with the same bounds.
+NDVI_BUCKET_BOUNDS = (('Very Low', 0.2), ('Low', 0.35), ('Medium', 0.5))
+NDVI_BUCKETS = (*(name for name, _ in NDVI_BUCKET_BOUNDS), 'High')
+
+
 def ndvi_bucket(value: float) -> str:
-    if value < 0.2:
-        return 'Very Low'
-    if value < 0.35:
-        return 'Low'
-    if value < 0.5:
-        return 'Medium'
+    for name, upper in NDVI_BUCKET_BOUNDS:
+        if value < upper:
+            return name
     return 'High'
 
 
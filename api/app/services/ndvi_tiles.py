@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterable
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.paddock import Paddock
+from app.models.satellite_scene import SatelliteScene
+from app.services.disk_cache import DiskLRUCache
+from app.services.geometry import geometry_bbox
+from app.services.image_encoding import encode_image
+from app.services.paddock_spatial import bbox_clause
+from app.services.projection import WGS84_A, project_lon_lat
+from app.services.raster import PixelWindow, RasterGrid, band_exists, read_band_header, read_band_window
+from app.services.tile_cache import TileCache, tile_bounds
+from app.services.zonal_stats import compute_ndvi, polygon_pixel_indices
+
+NDVI_LAYER = 'ndvi'
+NDVI_TILE_MIN_ZOOM = 10
+NDVI_TILE_MAX_ZOOM = 18
+TILE_SIZE = 256
+# Colour stops match the map's NDVI bucket colours, continuing to a darker green for dense cover.
+NDVI_COLOR_STOPS = (
+    (0.0, (139, 0, 0)),
+    (0.2, (221, 107, 32)),
+    (0.35, (199, 163, 35)),
+    (0.5, (47, 133, 90)),
+    (0.8, (20, 68, 43)),
+)
+NDVI_LUT_RANGE = (-1.0, 1.0)
+_WEB_MERCATOR_HALF_WORLD = math.pi * WGS84_A
+
+
+def _build_lut() -> np.ndarray:
+    values = np.linspace(*NDVI_LUT_RANGE, 256)
+    positions = [value for value, _ in NDVI_COLOR_STOPS]
+    lut = np.full((256, 4), 255, dtype=np.uint8)
+    for channel in range(3):
+        stops = [color[channel] for _, color in NDVI_COLOR_STOPS]
+        lut[:, channel] = np.rint(np.interp(values, positions, stops)).astype(np.uint8)
+    return lut
+
+
+NDVI_LUT = _build_lut()
+
+
+@lru_cache(maxsize=1)
+def get_ndvi_tile_cache() -> TileCache:
+    settings = get_settings()
+    disk = DiskLRUCache(settings.ndvi_tile_cache_dir, settings.ndvi_tile_cache_max_mb * 1024 * 1024)
+    return TileCache(disk, settings.tile_memory_cache_entries, settings.tile_memory_ttl_seconds)
+
+
+def scene_has_bands(scene: SatelliteScene) -> bool:
+    return band_exists(scene.red_uri) and band_exists(scene.nir_uri)
+
+
+def ndvi_tile(db: Session, scene: SatelliteScene, z: int, x: int, y: int, image_format: str) -> tuple[bytes, str]:
+    """The scene's NDVI tile at (z, x, y) in `image_format`, and its cache source."""
+    cache = get_ndvi_tile_cache()
+    key = (NDVI_LAYER, z, x, y, f'{scene.id}.{image_format}')
+    data, source = cache.get(key)
+    if data is not None:
+        return data, source
+    started = time.time()
+    data = render_ndvi_tile(db, scene, z, x, y, image_format)
+    cache.put(key, data, rendered_since=started)
+    return data, source
+
+
+def render_ndvi_tile(db: Session, scene: SatelliteScene, z: int, x: int, y: int, image_format: str) -> bytes:
+    """Colour-mapped NDVI for the tile's pixels inside the farm's paddocks; empty bytes when there are none.
+
+    Only pixels inside a paddock are sampled. The bands are read once, over the window those
+    pixels cover, every `step`th source pixel where a tile pixel spans several.
+    """
+    geometries = db.scalars(
+        select(Paddock.geom_geojson).where(Paddock.farm_id == scene.farm_id, bbox_clause(db, tile_bounds(z, x, y)))
+    ).all()
+    tile_grid = _tile_grid(z, x, y)
+    masks = [polygon_pixel_indices(tile_grid, geometry) for geometry in geometries]
+    inside = np.unique(np.concatenate(masks)) if masks else np.empty(0, dtype=np.int64)
+    if inside.size == 0 or not scene_has_bands(scene):
+        return b''
+
+    ndvi = _sample_ndvi(scene, tile_grid, inside)
+    pixels = np.zeros((TILE_SIZE * TILE_SIZE, 4), dtype=np.uint8)
+    pixels[inside] = colorize_ndvi(ndvi)
+    if not pixels[:, 3].any():
+        return b''
+    return encode_image(pixels.reshape(TILE_SIZE, TILE_SIZE, 4), image_format)
+
+
+def colorize_ndvi(ndvi: np.ndarray) -> np.ndarray:
+    """RGBA for each NDVI value through the 256-entry lookup table; NaN is transparent."""
+    low, high = NDVI_LUT_RANGE
+    missing = np.isnan(ndvi)
+    scaled = (np.nan_to_num(ndvi, nan=low) - low) * (255.0 / (high - low))
+    rgba = NDVI_LUT[np.clip(np.rint(scaled), 0, 255).astype(np.intp)]
+    rgba[missing] = 0
+    return rgba
+
+
+def invalidate_ndvi_tiles(geometries: Iterable[dict]) -> int:
+    """Drop cached NDVI tiles touching any of `geometries`, whose clipping or scene bands may have changed.
+
+    Ingest and imports call this in the workers; the API only sees it through the shared NDVI_TILE_CACHE_DIR.
+    """
+    bounds = [geometry_bbox(geometry) for geometry in geometries if geometry]
+    if not bounds:
+        return 0
+    return get_ndvi_tile_cache().invalidate(NDVI_LAYER, bounds, range(NDVI_TILE_MIN_ZOOM, NDVI_TILE_MAX_ZOOM + 1))
+
+
+def _tile_grid(z: int, x: int, y: int) -> RasterGrid:
+    resolution = 2.0 * _WEB_MERCATOR_HALF_WORLD / (TILE_SIZE * 2**z)
+    min_x = -_WEB_MERCATOR_HALF_WORLD + x * TILE_SIZE * resolution
+    max_y = _WEB_MERCATOR_HALF_WORLD - y * TILE_SIZE * resolution
+    return RasterGrid('EPSG:3857', (resolution, 0.0, min_x, 0.0, -resolution, max_y), TILE_SIZE, TILE_SIZE)
+
+
+def _sample_ndvi(scene: SatelliteScene, tile_grid: RasterGrid, inside: np.ndarray) -> np.ndarray:
+    band_grid, block_shape = read_band_header(scene.red_uri)
+    rows, cols = np.divmod(inside, TILE_SIZE)
+    lon, lat = _tile_pixel_lon_lat(tile_grid, rows, cols)
+    band_col, band_row = band_grid.to_pixel(*project_lon_lat(lon, lat, band_grid.crs))
+    ndvi = np.full(inside.size, np.nan, dtype=np.float32)
+
+    col_start = max(0, int(np.floor(band_col.min())))
+    row_start = max(0, int(np.floor(band_row.min())))
+    col_stop = min(band_grid.width, int(np.floor(band_col.max())) + 1)
+    row_stop = min(band_grid.height, int(np.floor(band_row.max())) + 1)
+    if col_start >= col_stop or row_start >= row_stop:
+        return ndvi
+    window = PixelWindow(col_start, row_start, col_stop - col_start, row_stop - row_start).align(
+        block_shape, band_grid
+    )
+
+    step = _overview_step(tile_grid, band_grid)
+    uris = [scene.red_uri, scene.nir_uri] + ([scene.mask_uri] if band_exists(scene.mask_uri) else [])
+    bands = [read_band_window(uri, window, step).data for uri in uris]
+
+    sample_rows = np.floor((band_row - window.row_off) / step).astype(np.int64)
+    sample_cols = np.floor((band_col - window.col_off) / step).astype(np.int64)
+    valid = (
+        (sample_rows >= 0)
+        & (sample_rows < bands[0].shape[0])
+        & (sample_cols >= 0)
+        & (sample_cols < bands[0].shape[1])
+    )
+    samples = [band[sample_rows[valid], sample_cols[valid]] for band in bands]
+    ndvi[valid] = compute_ndvi(samples[0], samples[1], samples[2] if len(samples) > 2 else None)
+    return ndvi
+
+
+def _tile_pixel_lon_lat(tile_grid: RasterGrid, rows: np.ndarray, cols: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    resolution, _, min_x, _, _, max_y = tile_grid.transform
+    mercator_x = min_x + (cols + 0.5) * resolution
+    mercator_y = max_y - (rows + 0.5) * resolution
+    lon = np.degrees(mercator_x / WGS84_A)
+    lat = np.degrees(2.0 * np.arctan(np.exp(mercator_y / WGS84_A)) - np.pi / 2.0)
+    return lon, lat
+
+
+def _overview_step(tile_grid: RasterGrid, band_grid: RasterGrid) -> int:
+    # Source pixels spanned by one tile pixel at the tile's centre; reading finer than that is wasted I/O.
+    centre = TILE_SIZE / 2
+    rows = np.array([centre, centre, centre + 1.0])
+    cols = np.array([centre, centre + 1.0, centre])
+    lon, lat = _tile_pixel_lon_lat(tile_grid, rows, cols)
+    band_col, band_row = band_grid.to_pixel(*project_lon_lat(lon, lat, band_grid.crs))
+    span = min(
+        math.hypot(band_col[1] - band_col[0], band_row[1] - band_row[0]),
+        math.hypot(band_col[2] - band_col[0], band_row[2] - band_row[0]),
+    )
+    return max(1, int(span))
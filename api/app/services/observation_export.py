@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterator, Sequence
+from datetime import date
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.services.ndvi import ndvi_bucket
+
+EXPORT_BATCH_SIZE = 2000
+EXPORT_FIELDS = (
+    'paddock_id',
+    'paddock_name',
+    'obs_date',
+    'ndvi_mean',
+    'ndvi_p10',
+    'ndvi_p50',
+    'ndvi_p90',
+    'bucket',
+    'cloud_pct',
+    'quality_flag',
+)
+EXPORT_MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def export_query(farm_id: str, start: date | None = None, end: date | None = None) -> Select:
+    stmt = (
+        select(
+            PaddockObservation.paddock_id,
+            Paddock.name.label('paddock_name'),
+            PaddockObservation.obs_date,
+            PaddockObservation.ndvi_mean,
+            PaddockObservation.ndvi_p10,
+            PaddockObservation.ndvi_p50,
+            PaddockObservation.ndvi_p90,
+            PaddockObservation.cloud_pct,
+            PaddockObservation.quality_flag,
+        )
+        .join(Paddock, Paddock.id == PaddockObservation.paddock_id)
+        .where(PaddockObservation.farm_id == farm_id)
+        .order_by(PaddockObservation.obs_date.asc(), PaddockObservation.paddock_id.asc())
+    )
+    if start is not None:
+        stmt = stmt.where(PaddockObservation.obs_date >= start)
+    if end is not None:
+        stmt = stmt.where(PaddockObservation.obs_date <= end)
+    return stmt
+
+
+def export_batches(db: Session, stmt: Select, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[list[dict]]:
+    """Rows of `stmt` as export records, `batch_size` at a time.
+
+    `yield_per` streams from a server-side cursor on PostgreSQL, and plain column rows keep
+    nothing in the identity map, so memory stays flat however many rows the range holds.
+    """
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield [_export_record(row) for row in partition]
+
+
+def ndjson_chunks(batches: Iterator[list[dict]]) -> Iterator[str]:
+    for batch in batches:
+        yield ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in batch)
+
+
+def csv_chunks(batches: Iterator[list[dict]], fields: Sequence[str] = EXPORT_FIELDS) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, lineterminator='\n')
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _export_record(row) -> dict:
+    return {
+        'paddock_id': row.paddock_id,
+        'paddock_name': row.paddock_name,
+        'obs_date': row.obs_date.isoformat(),
+        'ndvi_mean': row.ndvi_mean,
+        'ndvi_p10': row.ndvi_p10,
+        'ndvi_p50': row.ndvi_p50,
+        'ndvi_p90': row.ndvi_p90,
+        'bucket': ndvi_bucket(row.ndvi_mean),
+        'cloud_pct': row.cloud_pct,
+        'quality_flag': row.quality_flag.value,
+    }
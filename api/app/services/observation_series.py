@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import date
+from itertools import groupby
+
+import numpy as np
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.services.ndvi import trend_direction, trend_slope
+
+TREND_WINDOW = 3
+
+
+def farm_series(db: Session, farm_id: str, since: date | None = None, max_points: int | None = None) -> list[dict]:
+    """Every paddock's NDVI series for a farm from one ordered query, grouped in a single pass.
+
+    Paddocks without observations (in the window) still appear with no points. Slope and
+    direction use the last observations before downsampling, matching the per-paddock series.
+    """
+    join_on = PaddockObservation.paddock_id == Paddock.id
+    if since is not None:
+        join_on = and_(join_on, PaddockObservation.obs_date >= since)
+    stmt = (
+        select(
+            Paddock.id,
+            Paddock.name,
+            PaddockObservation.obs_date,
+            PaddockObservation.ndvi_mean,
+            PaddockObservation.ndvi_p10,
+            PaddockObservation.ndvi_p50,
+            PaddockObservation.ndvi_p90,
+            PaddockObservation.cloud_pct,
+            PaddockObservation.quality_flag,
+        )
+        .outerjoin(PaddockObservation, join_on)
+        .where(Paddock.farm_id == farm_id)
+        .order_by(Paddock.name.asc(), Paddock.id.asc(), PaddockObservation.obs_date.asc())
+    )
+
+    series = []
+    for (paddock_id, paddock_name), rows in groupby(db.execute(stmt), key=lambda row: (row[0], row[1])):
+        points = [
+            {
+                'obs_date': row.obs_date,
+                'ndvi_mean': row.ndvi_mean,
+                'ndvi_p10': row.ndvi_p10,
+                'ndvi_p50': row.ndvi_p50,
+                'ndvi_p90': row.ndvi_p90,
+                'cloud_pct': row.cloud_pct,
+                'quality_flag': row.quality_flag.value,
+            }
+            for row in rows
+            if row.obs_date is not None
+        ]
+        slope = trend_slope([(point['obs_date'], point['ndvi_mean']) for point in points[-TREND_WINDOW:]])
+        series.append(
+            {
+                'paddock_id': paddock_id,
+                'paddock_name': paddock_name,
+                'points': downsample(points, max_points),
+                'slope': slope,
+                'direction': trend_direction(slope),
+            }
+        )
+    return series
+
+
+def downsample(points: list[dict], max_points: int | None) -> list[dict]:
+    """At most `max_points` evenly spaced points, always keeping the first and the latest."""
+    if max_points is None or len(points) <= max_points:
+        return points
+    if max_points == 1:
+        return points[-1:]
+    indices = np.unique(np.linspace(0, len(points) - 1, max_points).round().astype(int))
+    return [points[index] for index in indices]
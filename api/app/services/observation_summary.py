@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable
+from datetime import date, datetime
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert_rows
+from app.models.enums import QualityFlag
+from app.models.farm_observation_summary import FarmObservationSummary
+from app.models.paddock_observation import PaddockObservation
+from app.services.ndvi import NDVI_BUCKET_BOUNDS
+
+BUCKET_COLUMNS = {
+    'Very Low': 'bucket_very_low',
+    'Low': 'bucket_low',
+    'Medium': 'bucket_medium',
+    'High': 'bucket_high',
+}
+QUALITY_COLUMNS = {
+    QualityFlag.OK: 'quality_ok',
+    QualityFlag.CLOUDY: 'quality_cloudy',
+    QualityFlag.NO_DATA: 'quality_no_data',
+}
+SUMMARY_UPDATE_COLUMNS = (
+    'paddock_count',
+    'ndvi_mean',
+    *BUCKET_COLUMNS.values(),
+    *QUALITY_COLUMNS.values(),
+    'updated_at',
+)
+# What `serialize_summary` reads, for listings that select columns rather than ORM rows.
+SUMMARY_READ_COLUMNS = tuple(
+    getattr(FarmObservationSummary, column) for column in ('obs_date', *SUMMARY_UPDATE_COLUMNS[:-1])
+)
+
+
+def refresh_observation_summaries(db: Session, farm_id: str, obs_dates: Iterable[date]) -> int:
+    """Recompute the farm's summary rows for `obs_dates` from its observations; does not commit.
+
+    Call after writing observations for those dates so the rollup lands in the same
+    transaction. Each date is re-aggregated from its own rows (one grouped SELECT over the
+    touched dates), so repeated upserts of the same observations never double count. Dates
+    left without observations lose their summary row.
+    """
+    dates = sorted(set(obs_dates))
+    if not dates:
+        return 0
+
+    bucket = case(
+        *((PaddockObservation.ndvi_mean < upper, name) for name, upper in NDVI_BUCKET_BOUNDS),
+        else_='High',
+    )
+    stmt = (
+        select(
+            PaddockObservation.obs_date,
+            func.count().label('paddock_count'),
+            # NO_DATA rows carry a 0.0 placeholder mean, so they do not count towards the farm mean.
+            func.avg(
+                case((PaddockObservation.quality_flag != QualityFlag.NO_DATA, PaddockObservation.ndvi_mean))
+            ).label('ndvi_mean'),
+            *(func.sum(case((bucket == name, 1), else_=0)).label(column) for name, column in BUCKET_COLUMNS.items()),
+            *(
+                func.sum(case((PaddockObservation.quality_flag == flag, 1), else_=0)).label(column)
+                for flag, column in QUALITY_COLUMNS.items()
+            ),
+        )
+        .where(PaddockObservation.farm_id == farm_id, PaddockObservation.obs_date.in_(dates))
+        .group_by(PaddockObservation.obs_date)
+    )
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            'id': str(uuid.uuid4()),
+            'farm_id': farm_id,
+            **row,
+            'ndvi_mean': round(row['ndvi_mean'], 4) if row['ndvi_mean'] is not None else None,
+            'updated_at': now,
+        }
+        for row in db.execute(stmt).mappings()
+    ]
+    upsert_rows(
+        db,
+        FarmObservationSummary,
+        rows,
+        conflict_columns=('farm_id', 'obs_date'),
+        update_columns=SUMMARY_UPDATE_COLUMNS,
+    )
+
+    emptied = set(dates) - {row['obs_date'] for row in rows}
+    if emptied:
+        db.execute(
+            delete(FarmObservationSummary).where(
+                FarmObservationSummary.farm_id == farm_id,
+                FarmObservationSummary.obs_date.in_(sorted(emptied)),
+            )
+        )
+    return len(rows)
+
+
+def rebuild_observation_summaries(db: Session, farm_id: str) -> int:
+    """Recompute every summary row of a farm, e.g. after backfilling observations; does not commit."""
+    existing = db.scalars(
+        select(FarmObservationSummary.obs_date).where(FarmObservationSummary.farm_id == farm_id)
+    ).all()
+    observed = db.scalars(
+        select(PaddockObservation.obs_date).where(PaddockObservation.farm_id == farm_id).distinct()
+    ).all()
+    return refresh_observation_summaries(db, farm_id, [*existing, *observed])
+
+
+def serialize_summary(summary: dict) -> dict:
+    return {
+        'obs_date': summary['obs_date'],
+        'paddock_count': summary['paddock_count'],
+        'ndvi_mean': summary['ndvi_mean'],
+        'buckets': {name: summary[column] for name, column in BUCKET_COLUMNS.items()},
+        'quality': {flag.value: summary[column] for flag, column in QUALITY_COLUMNS.items()},
+    }
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import weakref
+
+import httpx
+
+from app.core.config import get_settings
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class OpenWeatherClient:
+    """Long-lived pooled client: keep-alive connections, bounded concurrency, jittered retries."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        max_connections: int = 20,
+        max_concurrency: int = 10,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        timeout_seconds: float = 20.0,
+        max_backoff_seconds: float = 30.0,
+    ) -> None:
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip('/'),
+            timeout=timeout_seconds,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def forecast(self, lat: float, lon: float) -> dict:
+        params = {'lat': lat, 'lon': lon, 'appid': self.api_key, 'units': 'metric'}
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            # Only the request holds a concurrency slot; backing off must not starve other farms.
+            async with self._semaphore:
+                try:
+                    response = await self._client.get('/forecast', params=params)
+                except httpx.TransportError:
+                    if last_attempt:
+                        raise
+                    response = None
+
+            if response is None:
+                await asyncio.sleep(self._backoff(attempt))
+            elif response.status_code in RETRYABLE_STATUS and not last_attempt:
+                await asyncio.sleep(self._backoff(attempt, response.headers.get('Retry-After')))
+            else:
+                response.raise_for_status()
+                return response.json()
+        raise RuntimeError('unreachable')  # pragma: no cover
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def _backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        # A server's Retry-After is honoured only up to max_backoff_seconds; retries are cheap, stalls are not.
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff_seconds)
+        # Full jitter keeps a burst of farms from retrying in lockstep.
+        return random.uniform(0.0, min(self.backoff_seconds * (2**attempt), self.max_backoff_seconds))
+
+
+# httpx pools are bound to the event loop they were first used on, so keep one client per loop.
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, OpenWeatherClient] = weakref.WeakKeyDictionary()
+
+
+def get_openweather_client() -> OpenWeatherClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        settings = get_settings()
+        client = OpenWeatherClient(
+            base_url=settings.openweather_base_url,
+            api_key=settings.openweather_api_key or '',
+            max_connections=settings.openweather_max_connections,
+            max_concurrency=settings.openweather_max_concurrency,
+            max_retries=settings.openweather_max_retries,
+            backoff_seconds=settings.openweather_backoff_seconds,
+            timeout_seconds=settings.openweather_timeout_seconds,
+            max_backoff_seconds=settings.openweather_max_backoff_seconds,
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_openweather_client() -> None:
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import shutil
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO
+
+import ijson
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.enums import JobStatus
+from app.models.job_run import JobRun
+from app.models.paddock import Paddock
+from app.services.data_version import bump_data_version
+from app.services.geometry import batch_area_hectares
+from app.services.job_runs import finish_job_run
+from app.services.ndvi_tiles import invalidate_ndvi_tiles
+from app.services.raster import resolve_uri
+from app.services.vector_tiles import invalidate_paddock_tiles
+
+# Features may sit at the top level (a bare FeatureCollection) or under the request's `feature_collection` key.
+FEATURE_PREFIXES = ('features.item', 'feature_collection.features.item')
+TYPE_PREFIXES = ('type', 'feature_collection.type')
+# Failures kept on a background run's stats; the `failed` count is always complete.
+STORED_FAILURE_LIMIT = 1000
+NAME_MAX_LENGTH = 255
+
+
+class ImportFormatError(ValueError):
+    """The upload is not a readable GeoJSON FeatureCollection."""
+
+
+@dataclass
+class ImportResult:
+    processed: int = 0
+    created: int = 0
+    chunks: int = 0
+    rows: list[dict] = field(default_factory=list)
+    failures: list[dict] = field(default_factory=list)
+
+
+def scan_feature_collection(upload: BinaryIO) -> int:
+    """Count the upload's features in one streaming pass, checking it is a FeatureCollection."""
+    count = 0
+    collection_type = None
+    try:
+        for prefix, event, value in ijson.parse(upload, use_float=True):
+            if event == 'start_map' and prefix in FEATURE_PREFIXES:
+                count += 1
+            elif event == 'string' and prefix in TYPE_PREFIXES:
+                collection_type = value
+    except ijson.JSONError as exc:
+        raise ImportFormatError(f'Upload is not valid JSON: {exc}') from exc
+    if collection_type != 'FeatureCollection':
+        raise ImportFormatError('feature_collection must be a GeoJSON FeatureCollection')
+    return count
+
+
+def iter_features(upload: BinaryIO) -> Iterator[dict]:
+    """Yield features one at a time from a seekable upload; only the current feature is held in memory."""
+    try:
+        yield from ijson.items(upload, _features_prefix(upload), use_float=True)
+    except ijson.JSONError as exc:
+        raise ImportFormatError(f'Upload is not valid JSON: {exc}') from exc
+
+
+def validate_features(start_index: int, features: list) -> tuple[list[dict], list[dict]]:
+    """Validate one chunk of features and compute their areas.
+
+    Runs in worker processes, so it takes and returns plain data: rows carry the feature
+    `index`, `name`, `geom_geojson` and `area_ha`; failures carry `index` and `error`.
+    """
+    rows: list[dict] = []
+    failures: list[dict] = []
+    for index, feature in enumerate(features, start=start_index):
+        try:
+            rows.append({'index': index, **_feature_fields(index, feature)})
+        except ValueError as exc:
+            failures.append({'index': index, 'error': str(exc)})
+
+    valid = []
+    for row, area in zip(rows, batch_area_hectares([row['geom_geojson'] for row in rows])):
+        if area <= 0.0:
+            failures.append({'index': row['index'], 'error': 'Polygon has no area'})
+            continue
+        valid.append({**row, 'area_ha': float(area)})
+    failures.sort(key=lambda failure: failure['index'])
+    return valid, failures
+
+
+def import_paddock_features(
+    db: Session,
+    farm_id: str,
+    features: Iterable[dict],
+    chunk_size: int,
+    workers: int = 0,
+    keep_rows: bool = True,
+    on_chunk: Callable[[ImportResult], None] | None = None,
+) -> ImportResult:
+    """Validate `features` (in `workers` processes when > 1) and insert them in chunks, one commit per chunk.
+
+    `on_chunk` sees the running result after each chunk's insert and before its commit, so
+    anything it writes to the session lands atomically with the rows. With `keep_rows` the
+    created paddocks are returned in the list-endpoint shape.
+    """
+    result = ImportResult()
+    for rows, failures in _validated_chunks(features, chunk_size, workers):
+        created_at = datetime.utcnow()
+        records = [
+            {
+                'id': str(uuid.uuid4()),
+                'farm_id': farm_id,
+                'name': row['name'],
+                'geom_geojson': row['geom_geojson'],
+                'geom': json.dumps(row['geom_geojson'], separators=(',', ':')),
+                'area_ha': row['area_ha'],
+                'created_at': created_at,
+            }
+            for row in rows
+        ]
+        # Core-style bulk insert: no per-row flush, so the area computed by the worker is kept.
+        if records:
+            db.execute(insert(Paddock), records)
+        result.processed += len(rows) + len(failures)
+        result.created += len(records)
+        result.chunks += 1
+        result.failures.extend(failures)
+        if keep_rows:
+            result.rows.extend({key: value for key, value in record.items() if key != 'geom'} for record in records)
+        if on_chunk is not None:
+            on_chunk(result)
+        if records:
+            bump_data_version(db, farm_id)
+        db.commit()
+        geometries = [record['geom_geojson'] for record in records]
+        invalidate_paddock_tiles(geometries)
+        invalidate_ndvi_tiles(geometries)
+    return result
+
+
+def store_import_upload(upload: BinaryIO, farm_id: str, run_id: str) -> str:
+    """Copy a spooled upload into the object store for a background import; returns its URI."""
+    uri = f's3://imports/{farm_id}/{run_id}.geojson'
+    path = resolve_uri(uri)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    upload.seek(0)
+    with path.open('wb') as target:
+        shutil.copyfileobj(upload, target)
+    return uri
+
+
+def run_paddock_import(db: Session, run_id: str, farm_id: str, upload_uri: str) -> dict:
+    """Import a stored upload for a background `JobRun`, recording progress on the run after every chunk."""
+    settings = get_settings()
+    run = db.get(JobRun, run_id)
+    if run is None:
+        raise ValueError(f'Job run {run_id} not found')
+    total = (run.stats_json or {}).get('total', 0)
+
+    def record(result: ImportResult) -> None:
+        run.stats_json = import_stats(total, result)
+
+    path = resolve_uri(upload_uri)
+    if not path.exists():
+        # The API spooled the upload under its own OBJECT_STORE_ROOT; this worker has to see the same storage.
+        error = f'Upload {upload_uri} not found under OBJECT_STORE_ROOT {settings.object_store_root}'
+        finish_job_run(db, run, JobStatus.failed, dict(run.stats_json or {}), error)
+        raise FileNotFoundError(error)
+    try:
+        with path.open('rb') as upload:
+            result = import_paddock_features(
+                db,
+                farm_id,
+                iter_features(upload),
+                chunk_size=settings.paddock_import_chunk_size,
+                workers=settings.paddock_import_workers,
+                keep_rows=False,
+                on_chunk=record,
+            )
+    except Exception as exc:
+        db.rollback()
+        finish_job_run(db, run, JobStatus.failed, dict(run.stats_json or {}), str(exc) or type(exc).__name__)
+        raise
+
+    stats = import_stats(total, result)
+    finish_job_run(db, run, JobStatus.success, stats)
+    path.unlink(missing_ok=True)
+    return stats
+
+
+def import_stats(total: int, result: ImportResult) -> dict:
+    return {
+        'total': total,
+        'processed': result.processed,
+        'created': result.created,
+        'failed': len(result.failures),
+        'chunks': result.chunks,
+        'failures': result.failures[:STORED_FAILURE_LIMIT],
+    }
+
+
+def _features_prefix(upload: BinaryIO) -> str:
+    # Read just far enough to see where the features array starts, then rewind for the real pass.
+    start = upload.tell()
+    try:
+        for prefix, event, _ in ijson.parse(upload):
+            if event == 'start_array' and f'{prefix}.item' in FEATURE_PREFIXES:
+                return f'{prefix}.item'
+    finally:
+        upload.seek(start)
+    return FEATURE_PREFIXES[0]
+
+
+def _validated_chunks(features: Iterable[dict], chunk_size: int, workers: int) -> Iterator[tuple[list, list]]:
+    chunks = _chunked(features, max(1, chunk_size))
+    # Daemonic processes (Celery prefork children) cannot start a pool; validate inline there.
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        for start_index, chunk in chunks:
+            yield validate_features(start_index, chunk)
+        return
+
+    # Keep a bounded window of chunks in flight so memory stays flat however large the upload is.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for start_index, chunk in chunks:
+            pending.append(pool.submit(validate_features, start_index, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _chunked(features: Iterable[dict], size: int) -> Iterator[tuple[int, list]]:
+    iterator = iter(features)
+    start_index = 0
+    while chunk := list(islice(iterator, size)):
+        yield start_index, chunk
+        start_index += len(chunk)
+
+
+def _feature_fields(index: int, feature: object) -> dict:
+    if not isinstance(feature, dict):
+        raise ValueError('Feature must be a GeoJSON object')
+    geometry = feature.get('geometry') or {}
+    if not isinstance(geometry, dict) or geometry.get('type') != 'Polygon':
+        raise ValueError('Feature geometry must be Polygon')
+    _check_polygon_coordinates(geometry.get('coordinates'))
+
+    properties = feature.get('properties') or {}
+    name = properties.get('name') if isinstance(properties, dict) else None
+    name = str(name) if name else f'Imported Paddock {index + 1}'
+    if len(name) > NAME_MAX_LENGTH:
+        raise ValueError(f'Feature name is longer than {NAME_MAX_LENGTH} characters')
+    return {'name': name, 'geom_geojson': {'type': 'Polygon', 'coordinates': geometry['coordinates']}}
+
+
+def _check_polygon_coordinates(coordinates: object) -> None:
+    if not isinstance(coordinates, list) or not coordinates:
+        raise ValueError('Polygon requires coordinates')
+    for ring in coordinates:
+        if not isinstance(ring, list) or len(ring) < 4:
+            raise ValueError('Polygon rings need at least 4 positions')
+        for position in ring:
+            if (
+                not isinstance(position, list)
+                or len(position) < 2
+                or not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in position[:2])
+            ):
+                raise ValueError('Polygon positions must be [lon, lat] numbers')
+            if not (-180.0 <= position[0] <= 180.0 and -90.0 <= position[1] <= 90.0):
+                raise ValueError('Polygon positions must be within -180..180, -90..90')
+        if ring[0][:2] != ring[-1][:2]:
+            raise ValueError('Polygon rings must be closed')
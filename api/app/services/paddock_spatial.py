@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from sqlalchemy import ColumnElement, func, select, true
+from sqlalchemy.orm import Session
+
+from app.db.spatial import geometry_literal, postgis_enabled
+from app.models.paddock import Paddock
+from app.services.geometry import BBox, geometries_intersect
+
+
+def parse_bbox(value: str) -> BBox:
+    """Parse a `minLon,minLat,maxLon,maxLat` query value."""
+    parts = value.split(',')
+    if len(parts) != 4:
+        raise ValueError('bbox must be minLon,minLat,maxLon,maxLat')
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in parts)
+    except ValueError as exc:
+        raise ValueError('bbox values must be numbers') from exc
+    if not (-180.0 <= min_lon <= max_lon <= 180.0 and -90.0 <= min_lat <= max_lat <= 90.0):
+        raise ValueError('bbox must be within -180..180, -90..90 with min <= max')
+    return (min_lon, min_lat, max_lon, max_lat)
+
+
+def intersects_clause(db: Session, farm_id: str, geometry: dict) -> ColumnElement[bool]:
+    """WHERE clause for the farm's paddocks intersecting a GeoJSON Polygon/MultiPolygon.
+
+    With PostGIS this is ST_Intersects on the GiST-indexed `geom` column. Without it the farm's
+    paddocks are tested in Python and the clause is an id list.
+    """
+    if postgis_enabled(db.get_bind().dialect):
+        return func.ST_Intersects(Paddock.geom, geometry_literal(geometry))
+    rows = db.execute(select(Paddock.id, Paddock.geom_geojson).where(Paddock.farm_id == farm_id)).all()
+    return Paddock.id.in_([row.id for row in rows if geometries_intersect(row.geom_geojson, geometry)])
+
+
+def bbox_clause(db: Session, bbox: BBox) -> ColumnElement[bool]:
+    """WHERE clause for paddocks whose bounding box overlaps `bbox`, for callers that clip geometry themselves.
+
+    With PostGIS this is the index-only `&&` operator on `geom`. Without it the clause is always
+    true: testing bounding boxes would parse every geometry just for the caller to parse it again.
+    """
+    if postgis_enabled(db.get_bind().dialect):
+        return Paddock.geom.op('&&')(func.ST_MakeEnvelope(*bbox, 4326))
+    return true()
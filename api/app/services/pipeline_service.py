@@ -1,111 +1,242 @@
 from __future__ import annotations
 
 import hashlib
+import uuid
 from datetime import date, datetime, timedelta
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.db.upsert import upsert_rows
 from app.models.enums import JobStatus, JobType, QualityFlag
-from app.models.job_run import JobRun
 from app.models.paddock import Paddock
 from app.models.paddock_observation import PaddockObservation
 from app.models.satellite_scene import SatelliteScene
+from app.services.data_version import bump_data_version
+from app.services.instrumentation import JobInstrumentation
+from app.services.job_runs import finish_job_run, start_job_run, tracked_job
+from app.services.mask_cache import paddock_masks, to_window_indices
+from app.services.ndvi_tiles import invalidate_ndvi_tiles
+from app.services.observation_summary import refresh_observation_summaries
+from app.services.raster import band_exists, geometry_window, read_band_header, read_band_window
 from app.services.thresholds import get_threshold_value
+from app.services.vector_tiles import invalidate_paddock_tiles
+from app.services.zonal_stats import compute_ndvi, zonal_ndvi_stats
 
+SCENE_OFFSETS_DAYS = (3, 10, 17)
+OBSERVATION_UPDATE_COLUMNS = ('ndvi_mean', 'ndvi_p10', 'ndvi_p50', 'ndvi_p90', 'cloud_pct', 'quality_flag')
 
-def ingest_satellite_scenes(db: Session, farm_id: str) -> list[SatelliteScene]:
-    run = _start_job(db, JobType.ingest_satellite, farm_id)
-    created: list[SatelliteScene] = []
-    try:
-        today = date.today()
-        for offset in [3, 10, 17]:
-            scene_date = today - timedelta(days=offset)
-            existing = db.scalar(
-                select(SatelliteScene).where(
-                    SatelliteScene.farm_id == farm_id,
-                    SatelliteScene.scene_date == scene_date,
-                    SatelliteScene.source == 'stac_sentinel2',
-                )
-            )
-            if existing:
-                created.append(existing)
-                continue
-
-            cloud_pct = float((offset * 7) % 65)
-            scene = SatelliteScene(
-                farm_id=farm_id,
-                source='stac_sentinel2',
-                scene_date=scene_date,
-                cloud_pct=cloud_pct,
-                red_uri=f's3://synthetic/red/{farm_id}/{scene_date}.tif',
-                nir_uri=f's3://synthetic/nir/{farm_id}/{scene_date}.tif',
-                mask_uri=f's3://synthetic/mask/{farm_id}/{scene_date}.tif',
-            )
-            db.add(scene)
-            created.append(scene)
 
-        db.commit()
-        for scene in created:
-            db.refresh(scene)
-            aggregate_paddock_ndvi(db, scene.id)
-
-        _finish_job(db, run, JobStatus.success, {'scenes': len(created)})
-        return created
-    except Exception as exc:
-        _finish_job(db, run, JobStatus.failed, {'scenes': 0}, str(exc))
-        raise
+def ingest_satellite_scenes(db: Session, farm_id: str) -> list[SatelliteScene]:
+    """Register the farm's candidate scenes and aggregate every scene x paddock pair.
+
+    Scenes are resolved with one query, missing ones are inserted in bulk, paddocks are
+    loaded once and all observations land in a single upsert, so a farm ingest costs
+    a constant number of commits regardless of how many scenes it covers.
+    """
+    with tracked_job(db, JobType.ingest_satellite, farm_id) as metrics:
+        with metrics.stage('register_scenes'):
+            scenes, created = _register_scenes(db, farm_id)
+        with metrics.stage('load_paddocks'):
+            paddocks = db.scalars(select(Paddock).where(Paddock.farm_id == farm_id)).all()
+            geometries = [paddock.geom_geojson for paddock in paddocks]
+            cloud_high = get_threshold_value(db, 'cloud_pct_high_threshold', 40.0)
+        with metrics.stage('measure'):
+            rows, read_totals = _scene_observation_rows(scenes, paddocks, cloud_high)
+        with metrics.stage('upsert'):
+            _upsert_observations(db, farm_id, rows)
+        _record_ingest(metrics, scenes, created, paddocks, rows, read_totals)
+    # Cached map tiles embed the latest NDVI; drop them once the job's commit has made it visible.
+    invalidate_paddock_tiles(geometries)
+    # Scene bands may have been replaced since a tile was rendered from them.
+    invalidate_ndvi_tiles(geometries)
+    return scenes
 
 
 def aggregate_paddock_ndvi(db: Session, scene_id: str) -> None:
-    run = _start_job(db, JobType.aggregate_ndvi)
-    try:
-        scene = db.get(SatelliteScene, scene_id)
-        if not scene:
-            _finish_job(db, run, JobStatus.failed, {}, 'Scene not found')
-            return
-
-        paddocks = db.scalars(select(Paddock).where(Paddock.farm_id == scene.farm_id)).all()
-        cloud_high = get_threshold_value(db, 'cloud_pct_high_threshold', 40.0)
-
-        for paddock in paddocks:
-            ndvi = _synthetic_ndvi(scene.scene_date, paddock.id)
-            quality = QualityFlag.OK
-            if (scene.cloud_pct or 0.0) >= cloud_high:
-                quality = QualityFlag.CLOUDY
-
-            existing = db.scalar(
-                select(PaddockObservation).where(
-                    PaddockObservation.paddock_id == paddock.id,
-                    PaddockObservation.obs_date == scene.scene_date,
-                )
+    scene = db.get(SatelliteScene, scene_id)
+    if not scene:
+        run = start_job_run(db, JobType.aggregate_ndvi)
+        finish_job_run(db, run, JobStatus.failed, {}, 'Scene not found')
+        return
+
+    with tracked_job(db, JobType.aggregate_ndvi, scene.farm_id) as metrics:
+        with metrics.stage('load_paddocks'):
+            paddocks = db.scalars(select(Paddock).where(Paddock.farm_id == scene.farm_id)).all()
+            geometries = [paddock.geom_geojson for paddock in paddocks]
+            cloud_high = get_threshold_value(db, 'cloud_pct_high_threshold', 40.0)
+        with metrics.stage('measure'):
+            rows, read_stats = _observation_rows(scene, paddocks, cloud_high)
+        with metrics.stage('upsert'):
+            _upsert_observations(db, scene.farm_id, rows)
+        metrics.record(paddocks=len(paddocks), **read_stats)
+        metrics.count('rows_upserted', len(rows))
+    invalidate_paddock_tiles(geometries)
+    invalidate_ndvi_tiles(geometries)
+
+
+def _register_scenes(db: Session, farm_id: str) -> tuple[list[SatelliteScene], int]:
+    """The farm's candidate scenes, newest first, inserting any that are not registered yet."""
+    today = date.today()
+    offsets = {today - timedelta(days=offset): offset for offset in SCENE_OFFSETS_DAYS}
+    existing = {
+        scene.scene_date: scene
+        for scene in db.scalars(
+            select(SatelliteScene).where(
+                SatelliteScene.farm_id == farm_id,
+                SatelliteScene.source == 'stac_sentinel2',
+                SatelliteScene.scene_date.in_(list(offsets)),
             )
-            if existing:
-                existing.ndvi_mean = ndvi
-                existing.ndvi_p10 = max(0.0, ndvi - 0.12)
-                existing.ndvi_p50 = ndvi
-                existing.ndvi_p90 = min(1.0, ndvi + 0.12)
-                existing.cloud_pct = scene.cloud_pct
-                existing.quality_flag = quality
-            else:
-                db.add(
-                    PaddockObservation(
-                        paddock_id=paddock.id,
-                        obs_date=scene.scene_date,
-                        ndvi_mean=ndvi,
-                        ndvi_p10=max(0.0, ndvi - 0.12),
-                        ndvi_p50=ndvi,
-                        ndvi_p90=min(1.0, ndvi + 0.12),
-                        cloud_pct=scene.cloud_pct,
-                        quality_flag=quality,
-                    )
-                )
-
-        db.commit()
-        _finish_job(db, run, JobStatus.success, {'paddocks': len(paddocks)})
-    except Exception as exc:
-        _finish_job(db, run, JobStatus.failed, {}, str(exc))
-        raise
+        )
+    }
+
+    missing = [
+        SatelliteScene(
+            farm_id=farm_id,
+            source='stac_sentinel2',
+            scene_date=scene_date,
+            cloud_pct=float((offset * 7) % 65),
+            red_uri=f's3://synthetic/red/{farm_id}/{scene_date}.tif',
+            nir_uri=f's3://synthetic/nir/{farm_id}/{scene_date}.tif',
+            mask_uri=f's3://synthetic/mask/{farm_id}/{scene_date}.tif',
+        )
+        for scene_date, offset in offsets.items()
+        if scene_date not in existing
+    ]
+    db.add_all(missing)
+    db.flush()
+    scenes = sorted([*existing.values(), *missing], key=lambda scene: scene.scene_date, reverse=True)
+    return scenes, len(missing)
+
+
+def _scene_observation_rows(
+    scenes: list[SatelliteScene], paddocks: list[Paddock], cloud_high: float
+) -> tuple[list[dict], dict]:
+    """Observation rows for every scene, with read totals and a per-scene breakdown of the window reads."""
+    rows: list[dict] = []
+    read_totals = {'bytes_read': 0, 'full_scene_bytes': 0, 'mask_cache_hits': 0}
+    sources = set()
+    per_scene = []
+    for scene in scenes:
+        scene_rows, read_stats = _observation_rows(scene, paddocks, cloud_high)
+        rows.extend(scene_rows)
+        sources.add(read_stats['source'])
+        for key in read_totals:
+            read_totals[key] += read_stats.get(key, 0)
+        per_scene.append(
+            {
+                'scene_id': scene.id,
+                'source': read_stats['source'],
+                'window': read_stats.get('window'),
+                'bytes_read': read_stats.get('bytes_read', 0),
+                'full_scene_bytes': read_stats.get('full_scene_bytes', 0),
+            }
+        )
+    return rows, {'sources': sorted(sources), **read_totals, 'per_scene': per_scene}
+
+
+def _record_ingest(
+    metrics: JobInstrumentation,
+    scenes: list[SatelliteScene],
+    created: int,
+    paddocks: list[Paddock],
+    rows: list[dict],
+    read_totals: dict,
+) -> None:
+    metrics.record(scenes=len(scenes), scenes_created=created, paddocks=len(paddocks), **read_totals)
+    metrics.count('rows_upserted', len(rows))
+
+
+def _observation_rows(scene: SatelliteScene, paddocks: list[Paddock], cloud_high: float) -> tuple[list[dict], dict]:
+    measurements, read_stats = _measure_paddocks(scene, paddocks)
+    now = datetime.utcnow()
+    rows = []
+    for paddock, measurement in zip(paddocks, measurements):
+        quality = QualityFlag.OK
+        if measurement['ndvi_mean'] is None:
+            quality = QualityFlag.NO_DATA
+        elif (measurement['cloud_pct'] or 0.0) >= cloud_high:
+            quality = QualityFlag.CLOUDY
+        rows.append(
+            {
+                'id': str(uuid.uuid4()),
+                'created_at': now,
+                'paddock_id': paddock.id,
+                'farm_id': paddock.farm_id,
+                'obs_date': scene.scene_date,
+                'ndvi_mean': measurement['ndvi_mean'] if measurement['ndvi_mean'] is not None else 0.0,
+                'ndvi_p10': measurement['ndvi_p10'],
+                'ndvi_p50': measurement['ndvi_p50'],
+                'ndvi_p90': measurement['ndvi_p90'],
+                'cloud_pct': measurement['cloud_pct'],
+                'quality_flag': quality,
+            }
+        )
+    return rows, read_stats
+
+
+def _upsert_observations(db: Session, farm_id: str, rows: list[dict]) -> None:
+    upsert_rows(
+        db,
+        PaddockObservation,
+        rows,
+        conflict_columns=('paddock_id', 'obs_date'),
+        update_columns=OBSERVATION_UPDATE_COLUMNS,
+    )
+    refresh_observation_summaries(db, farm_id, {row['obs_date'] for row in rows})
+    bump_data_version(db, farm_id)
+
+
+def _measure_paddocks(scene: SatelliteScene, paddocks: list[Paddock]) -> tuple[list[dict], dict]:
+    if not (band_exists(scene.red_uri) and band_exists(scene.nir_uri)):
+        return [_synthetic_measurement(scene, paddock.id) for paddock in paddocks], {'source': 'synthetic'}
+
+    grid, block_shape = read_band_header(scene.red_uri)
+    window = geometry_window(grid, [paddock.geom_geojson for paddock in paddocks]).align(block_shape, grid)
+    if window.is_empty:
+        empty = {'ndvi_mean': None, 'ndvi_p10': None, 'ndvi_p50': None, 'ndvi_p90': None, 'cloud_pct': 100.0}
+        return [dict(empty) for _ in paddocks], {'source': 'raster', 'bytes_read': 0}
+
+    uris = [scene.red_uri, scene.nir_uri] + ([scene.mask_uri] if band_exists(scene.mask_uri) else [])
+    bands = [read_band_window(uri, window) for uri in uris]
+    ndvi = compute_ndvi(bands[0].data, bands[1].data, bands[2].data if len(bands) > 2 else None)
+
+    masks, mask_hits = paddock_masks(grid, paddocks)
+    zones = [to_window_indices(mask, grid, window) for mask in masks]
+    measurements = [
+        {
+            'ndvi_mean': _round(stats.mean),
+            'ndvi_p10': _round(stats.p10),
+            'ndvi_p50': _round(stats.p50),
+            'ndvi_p90': _round(stats.p90),
+            'cloud_pct': round(stats.invalid_pct, 2),
+        }
+        for stats in zonal_ndvi_stats(ndvi, zones)
+    ]
+    read_stats = {
+        'source': 'raster',
+        'window': [window.col_off, window.row_off, window.width, window.height],
+        'bytes_read': sum(band.bytes_read for band in bands),
+        'full_scene_bytes': sum(band.full_bytes for band in bands),
+        'mask_cache_hits': mask_hits,
+    }
+    return measurements, read_stats
+
+
+def _synthetic_measurement(scene: SatelliteScene, paddock_id: str) -> dict:
+    # Dev-facing fallback while scene URIs point at rasters that are not in the object store.
+    ndvi = _synthetic_ndvi(scene.scene_date, paddock_id)
+    return {
+        'ndvi_mean': ndvi,
+        'ndvi_p10': max(0.0, ndvi - 0.12),
+        'ndvi_p50': ndvi,
+        'ndvi_p90': min(1.0, ndvi + 0.12),
+        'cloud_pct': scene.cloud_pct,
+    }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 4) if value is not None else None
 
 
 def _synthetic_ndvi(scene_date: date, paddock_id: str) -> float:
@@ -113,26 +244,3 @@ def _synthetic_ndvi(scene_date: date, paddock_id: str) -> float:
     hashed = hashlib.sha256(seed).hexdigest()
     value = int(hashed[:8], 16)
     return round(0.12 + (value % 6800) / 10000.0, 4)
-
-
-def _start_job(db: Session, job_type: JobType, farm_id: str | None = None) -> JobRun:
-    run = JobRun(job_type=job_type, farm_id=farm_id, status=JobStatus.running, stats_json={})
-    db.add(run)
-    db.commit()
-    db.refresh(run)
-    return run
-
-
-def _finish_job(
-    db: Session,
-    run: JobRun,
-    status: JobStatus,
-    stats_json: dict,
-    error: str | None = None,
-) -> None:
-    run.status = status
-    run.finished_at = datetime.utcnow()
-    run.stats_json = stats_json
-    run.error = error
-    db.add(run)
-    db.commit()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import numpy as np
+
+WGS84_A = 6_378_137.0
+WGS84_F = 1.0 / 298.257223563
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+
+_TM_K0 = 0.9996
+
+
+def project_lon_lat(lon: np.ndarray, lat: np.ndarray, crs: str) -> tuple[np.ndarray, np.ndarray]:
+    """Project WGS84 lon/lat arrays into `crs` (EPSG:4326, EPSG:3857, UTM zones or NZTM2000)."""
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    code = _epsg_code(crs)
+
+    if code == 4326:
+        return lon, lat
+    if code == 3857:
+        x = np.radians(lon) * WGS84_A
+        clamped = np.clip(lat, -89.5, 89.5)
+        y = WGS84_A * np.log(np.tan(np.pi / 4.0 + np.radians(clamped) / 2.0))
+        return x, y
+    if 32601 <= code <= 32660 or 32701 <= code <= 32760:
+        zone = code % 100
+        false_northing = 10_000_000.0 if code >= 32701 else 0.0
+        return _transverse_mercator(lon, lat, (zone - 1) * 6.0 - 177.0, 500_000.0, false_northing)
+    if code == 2193:
+        return _transverse_mercator(lon, lat, 173.0, 1_600_000.0, 10_000_000.0)
+    raise ValueError(f'Unsupported CRS: {crs}')
+
+
+def _epsg_code(crs: str) -> int:
+    authority, _, code = crs.strip().upper().partition(':')
+    if authority != 'EPSG' or not code.isdigit():
+        raise ValueError(f'Unsupported CRS: {crs}')
+    return int(code)
+
+
+def _transverse_mercator(
+    lon: np.ndarray,
+    lat: np.ndarray,
+    central_meridian: float,
+    false_easting: float,
+    false_northing: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Snyder (1987) series; millimetre accuracy within a 6-degree zone.
+    e2 = WGS84_E2
+    e4 = e2 * e2
+    e6 = e4 * e2
+    ep2 = e2 / (1.0 - e2)
+
+    phi = np.radians(lat)
+    sin_phi = np.sin(phi)
+    cos_phi = np.cos(phi)
+    tan_phi = np.tan(phi)
+
+    n = WGS84_A / np.sqrt(1.0 - e2 * sin_phi**2)
+    t = tan_phi**2
+    c = ep2 * cos_phi**2
+    a = np.radians(lon - central_meridian) * cos_phi
+
+    m = WGS84_A * (
+        (1.0 - e2 / 4.0 - 3.0 * e4 / 64.0 - 5.0 * e6 / 256.0) * phi
+        - (3.0 * e2 / 8.0 + 3.0 * e4 / 32.0 + 45.0 * e6 / 1024.0) * np.sin(2.0 * phi)
+        + (15.0 * e4 / 256.0 + 45.0 * e6 / 1024.0) * np.sin(4.0 * phi)
+        - (35.0 * e6 / 3072.0) * np.sin(6.0 * phi)
+    )
+
+    x = _TM_K0 * n * (
+        a
+        + (1.0 - t + c) * a**3 / 6.0
+        + (5.0 - 18.0 * t + t**2 + 72.0 * c - 58.0 * ep2) * a**5 / 120.0
+    )
+    y = _TM_K0 * (
+        m
+        + n
+        * tan_phi
+        * (
+            a**2 / 2.0
+            + (5.0 - t + 9.0 * c + 4.0 * c**2) * a**4 / 24.0
+            + (61.0 - 58.0 * t + t**2 + 600.0 * c - 330.0 * ep2) * a**6 / 720.0
+        )
+    )
+    return x + false_easting, y + false_northing
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.projection import project_lon_lat
+
+
+@dataclass(frozen=True)
+class RasterGrid:
+    """Georeferencing for a band: affine transform in GDAL order (a, b, c, d, e, f).
+
+    x = c + col * a + row * b
+    y = f + col * d + row * e
+    """
+
+    crs: str
+    transform: tuple[float, float, float, float, float, float]
+    width: int
+    height: int
+
+    def to_pixel(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        a, b, c, d, e, f = self.transform
+        det = a * e - b * d
+        dx = np.asarray(x, dtype=np.float64) - c
+        dy = np.asarray(y, dtype=np.float64) - f
+        col = (e * dx - b * dy) / det
+        row = (a * dy - d * dx) / det
+        return col, row
+
+    def window_grid(self, window: PixelWindow) -> RasterGrid:
+        a, b, c, d, e, f = self.transform
+        origin_x = c + window.col_off * a + window.row_off * b
+        origin_y = f + window.col_off * d + window.row_off * e
+        return RasterGrid(self.crs, (a, b, origin_x, d, e, origin_y), window.width, window.height)
+
+    def decimated(self, step: int) -> RasterGrid:
+        """The grid of every `step`th row and column, anchored at the same origin."""
+        a, b, c, d, e, f = self.transform
+        return RasterGrid(
+            self.crs, (a * step, b * step, c, d * step, e * step, f), -(-self.width // step), -(-self.height // step)
+        )
+
+    def to_json(self) -> dict:
+        return {'crs': self.crs, 'transform': list(self.transform), 'width': self.width, 'height': self.height}
+
+    @classmethod
+    def from_json(cls, value: dict) -> RasterGrid:
+        return cls(
+            crs=value['crs'],
+            transform=tuple(float(v) for v in value['transform']),
+            width=int(value['width']),
+            height=int(value['height']),
+        )
+
+
+@dataclass(frozen=True)
+class PixelWindow:
+    col_off: int
+    row_off: int
+    width: int
+    height: int
+
+    @property
+    def is_empty(self) -> bool:
+        return self.width <= 0 or self.height <= 0
+
+    def align(self, block_shape: tuple[int, int], grid: RasterGrid) -> PixelWindow:
+        """Expand to whole storage blocks so tiled readers never decode a block twice."""
+        block_rows, block_cols = block_shape
+        row_start = (self.row_off // block_rows) * block_rows
+        col_start = (self.col_off // block_cols) * block_cols
+        row_stop = min(grid.height, -(-(self.row_off + self.height) // block_rows) * block_rows)
+        col_stop = min(grid.width, -(-(self.col_off + self.width) // block_cols) * block_cols)
+        return PixelWindow(col_start, row_start, col_stop - col_start, row_stop - row_start)
+
+
+@dataclass
+class BandWindow:
+    data: np.ndarray
+    grid: RasterGrid
+    bytes_read: int
+    full_bytes: int
+
+
+def geometry_window(grid: RasterGrid, geometries: list[dict], pad: int = 1) -> PixelWindow:
+    """Pixel window covering the union of the geometries' bounding boxes, clipped to the grid."""
+    coords = [
+        point
+        for geom in geometries
+        for ring in geometry_rings(geom)
+        for point in ring
+    ]
+    if not coords:
+        return PixelWindow(0, 0, 0, 0)
+    points = np.asarray(coords, dtype=np.float64)[:, :2]
+    x, y = project_lon_lat(points[:, 0], points[:, 1], grid.crs)
+    col, row = grid.to_pixel(x, y)
+    # Snap float noise so edges that sit on pixel boundaries don't pull in an extra column/row.
+    col, row = np.round(col, 6), np.round(row, 6)
+
+    col_start = max(0, int(np.floor(col.min())) - pad)
+    row_start = max(0, int(np.floor(row.min())) - pad)
+    col_stop = min(grid.width, int(np.ceil(col.max())) + pad)
+    row_stop = min(grid.height, int(np.ceil(row.max())) + pad)
+    return PixelWindow(col_start, row_start, max(0, col_stop - col_start), max(0, row_stop - row_start))
+
+
+def geometry_rings(geom_geojson: dict) -> list[list]:
+    geom_type = geom_geojson.get('type')
+    coordinates = geom_geojson.get('coordinates') or []
+    if geom_type == 'Polygon':
+        return list(coordinates)
+    if geom_type == 'MultiPolygon':
+        return [ring for polygon in coordinates for ring in polygon]
+    return []
+
+
+def resolve_uri(uri: str) -> Path:
+    """Map `s3://bucket/key` onto the local object-store root; plain paths pass through."""
+    parsed = urlparse(uri)
+    if parsed.scheme == 's3':
+        return Path(get_settings().object_store_root) / parsed.netloc / parsed.path.lstrip('/')
+    if parsed.scheme == 'file':
+        return Path(parsed.path)
+    return Path(uri)
+
+
+def band_exists(uri: str | None) -> bool:
+    return bool(uri) and resolve_uri(uri).exists()
+
+
+def read_band(uri: str) -> tuple[np.ndarray, RasterGrid]:
+    path = resolve_uri(uri)
+    if path.suffix.lower() in {'.tif', '.tiff'}:
+        return _read_geotiff(path)
+    grid = RasterGrid.from_json(json.loads(_grid_path(path).read_text()))
+    return np.load(path), grid
+
+
+def read_band_header(uri: str) -> tuple[RasterGrid, tuple[int, int]]:
+    """Grid and storage block shape, without touching pixel data."""
+    path = resolve_uri(uri)
+    if path.suffix.lower() in {'.tif', '.tiff'}:
+        rasterio = _rasterio()
+        with rasterio.open(path) as dataset:
+            return _dataset_grid(dataset), tuple(dataset.block_shapes[0])
+    grid = RasterGrid.from_json(json.loads(_grid_path(path).read_text()))
+    # Memory-mapped .npy has no internal tiling; the OS only pages in the rows/columns we slice.
+    return grid, (1, 1)
+
+
+def read_band_window(uri: str, window: PixelWindow, step: int = 1) -> BandWindow:
+    """Read only `window` of a band: memory-mapped for .npy, block-windowed for GeoTIFF.
+
+    With `step` > 1 only every `step`th row and column comes back: GDAL serves the read from the
+    nearest GeoTIFF overview, and a strided slice of the .npy memory map pages in only those rows.
+    """
+    path = resolve_uri(uri)
+    out_shape = (-(-window.height // step), -(-window.width // step))
+    if path.suffix.lower() in {'.tif', '.tiff'}:
+        rasterio = _rasterio()
+        from rasterio.enums import Resampling
+        from rasterio.windows import Window
+
+        with rasterio.open(path) as dataset:
+            grid = _dataset_grid(dataset)
+            data = dataset.read(
+                1,
+                window=Window(window.col_off, window.row_off, window.width, window.height),
+                out_shape=out_shape,
+                resampling=Resampling.nearest,
+            )
+            itemsize = np.dtype(dataset.dtypes[0]).itemsize
+    else:
+        grid = RasterGrid.from_json(json.loads(_grid_path(path).read_text()))
+        mapped = np.load(path, mmap_mode='r')
+        rows = slice(window.row_off, window.row_off + window.height, step)
+        cols = slice(window.col_off, window.col_off + window.width, step)
+        data = np.array(mapped[rows, cols])
+        itemsize = mapped.dtype.itemsize
+        del mapped
+
+    return BandWindow(
+        data=data,
+        grid=grid.window_grid(window).decimated(step),
+        bytes_read=data.size * itemsize,
+        full_bytes=grid.width * grid.height * itemsize,
+    )
+
+
+def write_band(uri: str, array: np.ndarray, grid: RasterGrid) -> Path:
+    path = resolve_uri(uri)
+    if array.shape != (grid.height, grid.width):
+        raise ValueError('Band shape does not match grid dimensions.')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('wb') as handle:
+        np.save(handle, array)
+    _grid_path(path).write_text(json.dumps(grid.to_json()))
+    return path
+
+
+def _grid_path(path: Path) -> Path:
+    return path.with_name(f'{path.name}.json')
+
+
+def _read_geotiff(path: Path) -> tuple[np.ndarray, RasterGrid]:
+    rasterio = _rasterio()
+    with rasterio.open(path) as dataset:
+        return dataset.read(1), _dataset_grid(dataset)
+
+
+def _dataset_grid(dataset) -> RasterGrid:
+    t = dataset.transform
+    return RasterGrid(
+        crs=dataset.crs.to_string() if dataset.crs else 'EPSG:4326',
+        transform=(t.a, t.b, t.c, t.d, t.e, t.f),
+        width=dataset.width,
+        height=dataset.height,
+    )
+
+
+def _rasterio():
+    try:
+        import rasterio
+    except ImportError as exc:  # pragma: no cover - depends on image build
+        raise RuntimeError('Reading GeoTIFF bands requires rasterio.') from exc
+    return rasterio
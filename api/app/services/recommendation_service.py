@@ -3,18 +3,37 @@ from __future__ import annotations
 from collections import Counter
 from datetime import date, datetime, timedelta
 
-from sqlalchemy import delete, desc, select
+import numpy as np
+from sqlalchemy import delete, desc, func, select
 from sqlalchemy.orm import Session
 
-from app.models.enums import RecommendationType, Severity
+from app.models.enums import JobType, RecommendationType, Severity
 from app.models.farm import Farm
 from app.models.paddock import Paddock
 from app.models.paddock_observation import PaddockObservation
 from app.models.paddock_recommendation import PaddockRecommendation
 from app.models.recommendation import Recommendation
 from app.models.weather_daily import WeatherDaily
-from app.services.ndvi import trend_slope
-from app.services.thresholds import get_threshold_value
+from app.services.data_version import bump_data_version
+from app.services.job_runs import tracked_job
+from app.services.thresholds import get_threshold_values
+from app.services.vector_tiles import invalidate_paddock_tiles
+
+RECENT_OBSERVATIONS = 3
+RECOMMENDATION_THRESHOLDS = {
+    'ndvi_good_threshold': 0.50,
+    'rain_light_threshold': 10.0,
+    'rain_heavy_threshold': 40.0,
+    'ndvi_drop_threshold': -0.003,
+    'max_obs_age_days': 14,
+    'cloud_pct_high_threshold': 40.0,
+}
+_RULE_ORDER = (
+    RecommendationType.LOW_DATA,
+    RecommendationType.AVOID_WATERLOG,
+    RecommendationType.MONITOR_STRESS,
+    RecommendationType.GRAZE_NOW,
+)
 
 
 def generate_weekly_recommendations(db: Session, farm_id: str, week_start: date | None = None) -> Recommendation:
@@ -26,86 +45,62 @@ def generate_weekly_recommendations(db: Session, farm_id: str, week_start: date
         today = date.today()
         week_start = today - timedelta(days=today.weekday())
 
-    existing = db.scalar(
-        select(Recommendation).where(
-            Recommendation.farm_id == farm_id,
-            Recommendation.created_for_week_start == week_start,
-        )
-    )
-
-    if existing:
-        db.execute(
-            delete(PaddockRecommendation).where(PaddockRecommendation.recommendation_id == existing.id)
-        )
-        db.delete(existing)
-        db.commit()
-
-    rec = Recommendation(
-        farm_id=farm_id,
-        created_for_week_start=week_start,
-        summary_md='Generating recommendations...',
-        created_at=datetime.utcnow(),
-    )
-    db.add(rec)
-    db.flush()
-
-    paddocks = db.scalars(select(Paddock).where(Paddock.farm_id == farm_id)).all()
-    forecast = db.scalars(
-        select(WeatherDaily)
-        .where(WeatherDaily.farm_id == farm_id)
-        .order_by(WeatherDaily.date.asc())
-        .limit(3)
-    ).all()
-    rain_3day = sum(item.rain_mm for item in forecast)
-
-    results: list[PaddockRecommendation] = []
-    counts = Counter()
-
-    for paddock in paddocks:
-        obs = db.scalars(
-            select(PaddockObservation)
-            .where(PaddockObservation.paddock_id == paddock.id)
-            .order_by(desc(PaddockObservation.obs_date))
-            .limit(3)
-        ).all()
-        if not obs:
-            row = _build_rec(rec.id, paddock.id, RecommendationType.LOW_DATA)
-            results.append(row)
-            counts[RecommendationType.LOW_DATA.value] += 1
-            continue
-
-        latest = obs[0]
-        points = list(reversed([(o.obs_date, o.ndvi_mean) for o in obs]))
-        slope = trend_slope(points)
-
-        ndvi_good = get_threshold_value(db, 'ndvi_good_threshold', 0.50)
-        rain_light = get_threshold_value(db, 'rain_light_threshold', 10.0)
-        rain_heavy = get_threshold_value(db, 'rain_heavy_threshold', 40.0)
-        ndvi_drop = get_threshold_value(db, 'ndvi_drop_threshold', -0.003)
-        max_obs_age_days = get_threshold_value(db, 'max_obs_age_days', 14)
-        cloud_high = get_threshold_value(db, 'cloud_pct_high_threshold', 40.0)
-
-        age_days = (date.today() - latest.obs_date).days
-        if age_days > max_obs_age_days or (latest.cloud_pct or 0.0) >= cloud_high:
-            rec_type = RecommendationType.LOW_DATA
-        elif rain_3day >= rain_heavy:
-            rec_type = RecommendationType.AVOID_WATERLOG
-        elif slope is not None and slope <= ndvi_drop:
-            rec_type = RecommendationType.MONITOR_STRESS
-        elif latest.ndvi_mean >= ndvi_good and rain_3day <= rain_light:
-            rec_type = RecommendationType.GRAZE_NOW
-        else:
-            rec_type = RecommendationType.MONITOR_STRESS
-
-        row = _build_rec(rec.id, paddock.id, rec_type)
-        results.append(row)
-        counts[rec_type.value] += 1
-
-    for result in results:
-        db.add(result)
-
-    rec.summary_md = _summary_from_counts(counts)
-    db.commit()
+    with tracked_job(db, JobType.generate_recommendations, farm_id) as metrics:
+        with metrics.stage('replace_existing'):
+            existing = db.scalar(
+                select(Recommendation).where(
+                    Recommendation.farm_id == farm_id,
+                    Recommendation.created_for_week_start == week_start,
+                )
+            )
+
+            if existing:
+                db.execute(
+                    delete(PaddockRecommendation).where(PaddockRecommendation.recommendation_id == existing.id)
+                )
+                db.delete(existing)
+                bump_data_version(db, farm_id)
+                db.commit()
+
+            rec = Recommendation(
+                farm_id=farm_id,
+                created_for_week_start=week_start,
+                summary_md='Generating recommendations...',
+                created_at=datetime.utcnow(),
+            )
+            db.add(rec)
+            db.flush()
+
+        with metrics.stage('load'):
+            paddocks = db.scalars(select(Paddock).where(Paddock.farm_id == farm_id)).all()
+            geometries = [paddock.geom_geojson for paddock in paddocks]
+            forecast = db.scalars(
+                select(WeatherDaily)
+                .where(WeatherDaily.farm_id == farm_id)
+                .order_by(WeatherDaily.date.asc())
+                .limit(3)
+            ).all()
+            rain_3day = sum(item.rain_mm for item in forecast)
+
+            thresholds = get_threshold_values(db, RECOMMENDATION_THRESHOLDS)
+            history = _recent_observations(db, farm_id, RECENT_OBSERVATIONS)
+
+        with metrics.stage('classify'):
+            rec_types = _classify_paddocks([paddock.id for paddock in paddocks], history, rain_3day, thresholds)
+            results = [_build_rec(rec.id, paddock.id, rec_type) for paddock, rec_type in zip(paddocks, rec_types)]
+            counts = Counter(rec_type.value for rec_type in rec_types)
+
+        with metrics.stage('write'):
+            for result in results:
+                db.add(result)
+            rec.summary_md = _summary_from_counts(counts)
+            bump_data_version(db, farm_id)
+            db.flush()
+        metrics.record(paddocks=len(paddocks), replaced=existing is not None)
+        metrics.count('rows_written', len(results) + 1)
+
+    # The job record's commit also commits the recommendation.
+    invalidate_paddock_tiles(geometries)
     db.refresh(rec)
     return rec
 
@@ -127,6 +122,80 @@ def get_recommendation_for_week(db: Session, farm_id: str, week_start: date) ->
     )
 
 
+def _recent_observations(db: Session, farm_id: str, limit: int) -> dict[str, list[tuple[date, float, float | None]]]:
+    """Latest `limit` observations for every paddock on the farm, newest first, in one window query."""
+    ranked = (
+        select(
+            PaddockObservation.paddock_id,
+            PaddockObservation.obs_date,
+            PaddockObservation.ndvi_mean,
+            PaddockObservation.cloud_pct,
+            func.row_number()
+            .over(partition_by=PaddockObservation.paddock_id, order_by=desc(PaddockObservation.obs_date))
+            .label('rank'),
+        )
+        .where(PaddockObservation.farm_id == farm_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(ranked.c.paddock_id, ranked.c.obs_date, ranked.c.ndvi_mean, ranked.c.cloud_pct)
+        .where(ranked.c.rank <= limit)
+        .order_by(ranked.c.paddock_id, ranked.c.rank)
+    ).all()
+
+    history: dict[str, list[tuple[date, float, float | None]]] = {}
+    for paddock_id, obs_date, ndvi_mean, cloud_pct in rows:
+        history.setdefault(paddock_id, []).append((obs_date, ndvi_mean, cloud_pct))
+    return history
+
+
+def _classify_paddocks(
+    paddock_ids: list[str],
+    history: dict[str, list[tuple[date, float, float | None]]],
+    rain_3day: float,
+    thresholds: dict[str, float],
+    today: date | None = None,
+) -> list[RecommendationType]:
+    """Apply the weekly rules to all paddocks at once; precedence matches the documented rule order."""
+    if not paddock_ids:
+        return []
+    today = today or date.today()
+
+    size = len(paddock_ids)
+    has_obs = np.zeros(size, dtype=bool)
+    latest_ndvi = np.full(size, np.nan)
+    latest_cloud = np.zeros(size)
+    age_days = np.zeros(size)
+    slope = np.full(size, np.nan)
+    for i, paddock_id in enumerate(paddock_ids):
+        obs = history.get(paddock_id)
+        if not obs:
+            continue
+        has_obs[i] = True
+        latest_date, latest_ndvi[i], cloud = obs[0]
+        latest_cloud[i] = cloud or 0.0
+        age_days[i] = (today - latest_date).days
+        oldest_date, oldest_ndvi, _ = obs[-1]
+        span_days = (latest_date - oldest_date).days
+        if len(obs) >= 2 and span_days > 0:
+            slope[i] = (latest_ndvi[i] - oldest_ndvi) / span_days
+
+    with np.errstate(invalid='ignore'):
+        low_data = ~has_obs | (age_days > thresholds['max_obs_age_days']) | (
+            latest_cloud >= thresholds['cloud_pct_high_threshold']
+        )
+        waterlog = np.full(size, rain_3day >= thresholds['rain_heavy_threshold'])
+        stress = slope <= thresholds['ndvi_drop_threshold']
+        graze = (latest_ndvi >= thresholds['ndvi_good_threshold']) & (rain_3day <= thresholds['rain_light_threshold'])
+
+    codes = np.select(
+        [low_data, waterlog, stress, graze],
+        list(range(len(_RULE_ORDER))),
+        default=_RULE_ORDER.index(RecommendationType.MONITOR_STRESS),
+    )
+    return [_RULE_ORDER[code] for code in codes]
+
+
 def _build_rec(
     recommendation_id: str, paddock_id: str, rec_type: RecommendationType
 ) -> PaddockRecommendation:
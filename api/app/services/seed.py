@@ -3,7 +3,6 @@ from sqlalchemy.orm import Session
 
 from app.models.farm import Farm
 from app.models.paddock import Paddock
-from app.services.geometry import polygon_area_hectares
 from app.services.thresholds import seed_thresholds
 
 
@@ -63,12 +62,7 @@ def seed_demo_data(db: Session) -> None:
 
     for polygon in polygons:
         db.add(
-            Paddock(
-                farm_id=farm.id,
-                name=polygon['name'],
-                geom_geojson=polygon['geom_geojson'],
-                area_ha=polygon_area_hectares(polygon['geom_geojson']),
-            )
+            Paddock(farm_id=farm.id, name=polygon['name'], geom_geojson=polygon['geom_geojson'])
         )
 
     db.commit()
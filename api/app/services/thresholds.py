@@ -1,7 +1,11 @@
+import threading
+import time
 from datetime import datetime
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models.config_threshold import ConfigThreshold
 
 DEFAULT_THRESHOLDS = {
@@ -14,19 +18,79 @@ DEFAULT_THRESHOLDS = {
 }
 
 
+class ThresholdCache:
+    """Process-local copy of `config_thresholds`, reloaded when its version stamp moves.
+
+    The stamp is (max(updated_at), row count) and is re-read at most once per
+    `check_interval` seconds, so edits that bump `updated_at` (or add/remove rows)
+    reach every API and worker process within that interval.
+    """
+
+    def __init__(self, check_interval: float) -> None:
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self._values: dict[str, dict] = {}
+        self._version: tuple | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def values(self, db: Session) -> dict[str, dict]:
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            self.hits += 1
+            return self._values
+
+        # Query outside the lock: under AsyncSession.run_sync these reads suspend the calling
+        # greenlet, and another coroutine on the same thread must not block on the lock meanwhile.
+        version = tuple(db.execute(select(func.max(ConfigThreshold.updated_at), func.count())).one())
+        if version == self._version:
+            self.hits += 1
+            self._checked_at = now
+            return self._values
+
+        values = {row.key: row.value for row in db.scalars(select(ConfigThreshold))}
+        with self._lock:
+            self.misses += 1
+            self.reloads += 1
+            self._values = values
+            self._version = version
+            self._checked_at = now
+            return self._values
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+            self._values = {}
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'reloads': self.reloads, 'keys': len(self._values)}
+
+
+threshold_cache = ThresholdCache(get_settings().threshold_cache_check_seconds)
+
+
 def seed_thresholds(db: Session) -> None:
     for key, value in DEFAULT_THRESHOLDS.items():
         existing = db.get(ConfigThreshold, key)
         if not existing:
             db.add(ConfigThreshold(key=key, value=value, updated_at=datetime.utcnow()))
     db.commit()
+    threshold_cache.invalidate()
 
 
 def get_threshold_value(db: Session, key: str, fallback: float) -> float:
-    threshold = db.get(ConfigThreshold, key)
-    if not threshold:
-        return fallback
-    value = threshold.value.get('value')
+    return _numeric_value(threshold_cache.values(db).get(key), fallback)
+
+
+def get_threshold_values(db: Session, fallbacks: dict[str, float]) -> dict[str, float]:
+    stored = threshold_cache.values(db)
+    return {key: _numeric_value(stored.get(key), fallback) for key, fallback in fallbacks.items()}
+
+
+def _numeric_value(payload: dict | None, fallback: float) -> float:
+    value = (payload or {}).get('value')
     if isinstance(value, (int, float)):
         return float(value)
     return fallback
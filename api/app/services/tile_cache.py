@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+
+from app.services.disk_cache import DiskLRUCache
+from app.services.geometry import BBox
+
+TileKey = tuple[str, int, int, int, str]
+
+_INVALIDATED_MARKER = '.invalidated'
+
+
+class TileCache:
+    """Rendered map tiles: a per-process LRU in front of a DiskLRUCache.
+
+    Invalidation only reaches processes that use the same disk directory, so the API and every
+    worker that invalidates a layer must share it (compose mounts one volume per tile cache).
+    Disk entries live at `{layer}/{z}/{x}/{y}/{variant}`, so invalidating an area walks only the
+    cached tiles of each zoom. Other processes cannot reach this process's memory entries, so they
+    expire after `memory_ttl_seconds`. A render that started before the most recent invalidation
+    of its layer is not stored: it may have read rows the invalidation was about.
+    """
+
+    def __init__(self, disk: DiskLRUCache, memory_entries: int, memory_ttl_seconds: float) -> None:
+        self.disk = disk
+        self.memory_entries = memory_entries
+        self.memory_ttl_seconds = memory_ttl_seconds
+        self._memory: OrderedDict[TileKey, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: TileKey) -> tuple[bytes | None, str]:
+        """The cached tile and where it came from: `memory`, `disk` or `miss`."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[0] < self.memory_ttl_seconds:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1], 'memory'
+            self._memory.pop(key, None)
+
+        data = self.disk.get(_disk_key(key))
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None, 'miss'
+            self.hits += 1
+            self._remember(key, data, now)
+        return data, 'disk'
+
+    def put(self, key: TileKey, data: bytes, rendered_since: float) -> bool:
+        """Store a tile rendered from data read after `rendered_since` (a `time.time()` value)."""
+        if self._invalidated_at(key[0]) >= rendered_since:
+            return False
+        self.disk.put(_disk_key(key), data)
+        with self._lock:
+            self._remember(key, data, time.monotonic())
+        return True
+
+    def invalidate(self, layer: str, bounds: Iterable[BBox], zooms: Iterable[int], buffer: float = 0.0) -> int:
+        """Drop every cached tile of `layer` touching any of `bounds`; returns how many disk tiles went.
+
+        `buffer` widens each tile by that fraction of its size, matching the buffer tiles are rendered with.
+        """
+        bounds = list(bounds)
+        self._mark_invalidated(layer)
+        removed = 0
+        for z in zooms:
+            tiles = tiles_covering(bounds, z, buffer)
+            if not tiles:
+                continue
+            with self._lock:
+                for key in [key for key in self._memory if key[0] == layer and key[1] == z]:
+                    if (key[2], key[3]) in tiles:
+                        del self._memory[key]
+            columns = {x for x, _ in tiles}
+            for x_name in self.disk.children(f'{layer}/{z}'):
+                if not x_name.isdigit() or int(x_name) not in columns:
+                    continue
+                for y_name in self.disk.children(f'{layer}/{z}/{x_name}'):
+                    if y_name.isdigit() and (int(x_name), int(y_name)) in tiles:
+                        self.disk.delete_prefix(f'{layer}/{z}/{x_name}/{y_name}')
+                        removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'memory_tiles': len(self._memory)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self.hits = 0
+            self.misses = 0
+        self.disk.clear()
+
+    def _remember(self, key: TileKey, data: bytes, now: float) -> None:
+        self._memory[key] = (now, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _marker(self, layer: str) -> Path:
+        return self.disk.root / layer / _INVALIDATED_MARKER
+
+    def _mark_invalidated(self, layer: str) -> None:
+        marker = self._marker(layer)
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+
+    def _invalidated_at(self, layer: str) -> float:
+        try:
+            return self._marker(layer).stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+
+def tile_bounds(z: int, x: float, y: float, buffer: float = 0.0) -> BBox:
+    """Lon/lat bounds of XYZ tile (z, x, y), widened by `buffer` times the tile size on every side."""
+    n = 2.0**z
+    min_lon = (x - buffer) / n * 360.0 - 180.0
+    max_lon = (x + 1 + buffer) / n * 360.0 - 180.0
+    return (max(min_lon, -180.0), _tile_latitude(y + 1 + buffer, n), min(max_lon, 180.0), _tile_latitude(y - buffer, n))
+
+
+def tiles_covering(bounds: Iterable[BBox], z: int, buffer: float = 0.0) -> set[tuple[int, int]]:
+    n = 2**z
+    tiles: set[tuple[int, int]] = set()
+    for min_lon, min_lat, max_lon, max_lat in bounds:
+        x0, y1 = _tile_xy(min_lon, min_lat, n)
+        x1, y0 = _tile_xy(max_lon, max_lat, n)
+        # A tile rendered with a buffer also draws features just outside it.
+        x0, y0 = max(math.floor(x0 - buffer), 0), max(math.floor(y0 - buffer), 0)
+        x1, y1 = min(math.floor(x1 + buffer), n - 1), min(math.floor(y1 + buffer), n - 1)
+        tiles.update((x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+    return tiles
+
+
+def _tile_xy(lon: float, lat: float, n: int) -> tuple[float, float]:
+    lat = max(min(lat, 85.0511), -85.0511)
+    sin_lat = math.sin(math.radians(lat))
+    x = (lon + 180.0) / 360.0 * n
+    y = (0.5 - math.log((1.0 + sin_lat) / (1.0 - sin_lat)) / (4.0 * math.pi)) * n
+    return x, y
+
+
+def _tile_latitude(y: float, n: float) -> float:
+    y = min(max(y, 0.0), n)
+    return math.degrees(math.atan(math.sinh(math.pi * (1.0 - 2.0 * y / n))))
+
+
+def _disk_key(key: TileKey) -> str:
+    layer, z, x, y, variant = key
+    return f'{layer}/{z}/{x}/{y}/{variant}'
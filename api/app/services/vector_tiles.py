@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterable
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy import desc, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.enums import QualityFlag
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.models.paddock_recommendation import PaddockRecommendation
+from app.models.recommendation import Recommendation
+from app.services.disk_cache import DiskLRUCache
+from app.services.geometry import geometry_bbox
+from app.services.mvt import DEFAULT_EXTENT, PolygonFeature, encode_tile, ring_area
+from app.services.ndvi import ndvi_bucket
+from app.services.paddock_spatial import bbox_clause
+from app.services.tile_cache import TileCache, tile_bounds
+
+PADDOCK_LAYER = 'paddocks'
+PADDOCK_TILE_MIN_ZOOM = 8
+PADDOCK_TILE_MAX_ZOOM = 16
+TILE_EXTENT = DEFAULT_EXTENT
+# Geometry is kept this far (in tile units) past each edge so strokes do not stop at tile seams.
+TILE_BUFFER = 64
+# Douglas-Peucker tolerance in tile units; the same value is ~0.04 m at z16 and ~10 m at z8.
+SIMPLIFY_TOLERANCE = 1.0
+# Rings smaller than this (square tile units) are dropped rather than drawn as specks.
+MIN_RING_AREA = 2.0
+# Below this many vertices a plain Python Douglas-Peucker beats NumPy's per-call overhead several-fold.
+SMALL_RING_VERTICES = 256
+
+
+@lru_cache(maxsize=1)
+def get_tile_cache() -> TileCache:
+    settings = get_settings()
+    disk = DiskLRUCache(settings.tile_cache_dir, settings.tile_cache_max_mb * 1024 * 1024)
+    return TileCache(disk, settings.tile_memory_cache_entries, settings.tile_memory_ttl_seconds)
+
+
+def paddock_tile(db: Session, z: int, x: int, y: int, farm_id: str | None = None) -> tuple[bytes, str]:
+    """The paddock layer tile at (z, x, y), optionally for one farm, and its cache source."""
+    cache = get_tile_cache()
+    key = (PADDOCK_LAYER, z, x, y, f'{farm_id or "all"}.mvt')
+    data, source = cache.get(key)
+    if data is not None:
+        return data, source
+    started = time.time()
+    data = render_paddock_tile(db, z, x, y, farm_id)
+    cache.put(key, data, rendered_since=started)
+    return data, source
+
+
+def render_paddock_tile(db: Session, z: int, x: int, y: int, farm_id: str | None = None) -> bytes:
+    """Encode the paddocks touching a tile, clipped and simplified for its zoom, with their latest NDVI."""
+    buffer = TILE_BUFFER / TILE_EXTENT
+    stmt = select(Paddock.id, Paddock.farm_id, Paddock.name, Paddock.geom_geojson).where(
+        bbox_clause(db, tile_bounds(z, x, y, buffer))
+    )
+    if farm_id is not None:
+        stmt = stmt.where(Paddock.farm_id == farm_id)
+    features = []
+    for row in db.execute(stmt.order_by(Paddock.id)):
+        rings = tile_rings(row.geom_geojson, z, x, y)
+        if rings:
+            features.append((row, rings))
+    if not features:
+        return b''
+
+    paddock_ids = [row.id for row, _ in features]
+    observations = _latest_observations(db, paddock_ids)
+    rec_types = _latest_rec_types(db, paddock_ids)
+    encoded = []
+    for row, rings in features:
+        properties = {'id': row.id, 'farm_id': row.farm_id, 'name': row.name}
+        if row.id in observations:
+            obs_date, ndvi_mean = observations[row.id]
+            properties.update(
+                ndvi_mean=round(ndvi_mean, 4), bucket=ndvi_bucket(ndvi_mean), obs_date=obs_date.isoformat()
+            )
+        if row.id in rec_types:
+            properties['rec_type'] = rec_types[row.id]
+        encoded.append(PolygonFeature(rings, properties))
+    return encode_tile({PADDOCK_LAYER: encoded}, TILE_EXTENT)
+
+
+def tile_rings(geom_geojson: dict, z: int, x: int, y: int) -> list[np.ndarray]:
+    """A Polygon/MultiPolygon as integer tile-coordinate rings, clipped to the buffered tile and simplified.
+
+    Each polygon keeps its exterior first (positive area) followed by its holes (negative area);
+    a polygon whose exterior vanishes at this zoom is dropped with its holes.
+    """
+    polygons = [geom_geojson['coordinates']] if geom_geojson['type'] == 'Polygon' else geom_geojson['coordinates']
+    low, high = -TILE_BUFFER, TILE_EXTENT + TILE_BUFFER
+    rings: list[np.ndarray] = []
+    for polygon in polygons:
+        for index, ring in enumerate(polygon):
+            points = _to_tile_coordinates(np.asarray(ring, dtype=np.float64)[:-1, :2], z, x, y)
+            if points[:, 0].min() >= high or points[:, 0].max() <= low:
+                points = points[:0]
+            elif points[:, 1].min() >= high or points[:, 1].max() <= low:
+                points = points[:0]
+            elif points.min() < low or points.max() > high:
+                points = _clip_ring(points, low, high)
+            points = _simplify_ring(points)
+            area = ring_area(points) if len(points) >= 3 else 0.0
+            if abs(area) < MIN_RING_AREA:
+                if index == 0:
+                    break
+                continue
+            is_exterior = index == 0
+            rings.append(points if (area > 0) == is_exterior else points[::-1])
+    return rings
+
+
+def invalidate_paddock_tiles(geometries: Iterable[dict]) -> int:
+    """Drop cached paddock tiles touching any of `geometries`; call after the change is committed.
+
+    Workers call this after ingest and recommendations; the API only sees it through the shared TILE_CACHE_DIR.
+    """
+    bounds = [geometry_bbox(geometry) for geometry in geometries if geometry]
+    if not bounds:
+        return 0
+    zooms = range(PADDOCK_TILE_MIN_ZOOM, PADDOCK_TILE_MAX_ZOOM + 1)
+    return get_tile_cache().invalidate(PADDOCK_LAYER, bounds, zooms, buffer=TILE_BUFFER / TILE_EXTENT)
+
+
+def _to_tile_coordinates(lon_lat: np.ndarray, z: int, x: int, y: int) -> np.ndarray:
+    n = 2.0**z
+    lat = np.radians(np.clip(lon_lat[:, 1], -85.0511, 85.0511))
+    world_x = (lon_lat[:, 0] + 180.0) / 360.0 * n
+    world_y = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) / 2.0 * n
+    return np.column_stack([(world_x - x) * TILE_EXTENT, (world_y - y) * TILE_EXTENT])
+
+
+def _clip_ring(points: np.ndarray, low: float, high: float) -> np.ndarray:
+    # Sutherland-Hodgman against the four edges of the buffered tile square.
+    for axis, bound, sign in ((0, low, 1.0), (0, high, -1.0), (1, low, 1.0), (1, high, -1.0)):
+        if len(points) == 0:
+            break
+        points = _clip_half_plane(points, axis, bound, sign)
+    return points
+
+
+def _clip_half_plane(points: np.ndarray, axis: int, bound: float, sign: float) -> np.ndarray:
+    distance = (points[:, axis] - bound) * sign
+    inside = distance >= 0.0
+    if inside.all():
+        return points
+    if not inside.any():
+        return points[:0]
+    crossing = inside != np.roll(inside, 1)
+    # Only crossing edges have ends on opposite sides of the bound, so their denominators are never zero.
+    previous = np.roll(points, 1, axis=0)[crossing]
+    previous_distance = np.roll(distance, 1)[crossing]
+    t = previous_distance / (previous_distance - distance[crossing])
+    intersections = previous + (points[crossing] - previous) * t[:, None]
+
+    # Edge previous -> current emits the crossing point (if any) and then the current point (if inside).
+    counts = crossing.astype(np.int64) + inside
+    starts = np.cumsum(counts) - counts
+    out = np.empty((int(counts.sum()), 2))
+    out[starts[crossing]] = intersections
+    out[starts[inside] + crossing[inside]] = points[inside]
+    return out
+
+
+def _simplify_ring(points: np.ndarray) -> np.ndarray:
+    if len(points) < 3:
+        return points[:0].astype(np.int64)
+    closed = np.vstack([points, points[:1]])
+    keep = _douglas_peucker(closed, SIMPLIFY_TOLERANCE)[:-1]
+    snapped = np.rint(points[keep]).astype(np.int64)
+    # Snapping to the integer grid can leave repeated vertices; drop them, including across the seam.
+    repeated = np.all(snapped == np.roll(snapped, 1, axis=0), axis=1)
+    return snapped[~repeated] if len(snapped) > 1 else snapped
+
+
+def _douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    if len(points) <= SMALL_RING_VERTICES:
+        return np.array(_douglas_peucker_small(points.tolist(), tolerance), dtype=bool)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        segment = points[last] - points[first]
+        offsets = points[first + 1 : last] - points[first]
+        length = float(np.hypot(*segment))
+        if length == 0.0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return keep
+
+
+def _douglas_peucker_small(points: list[list[float]], tolerance: float) -> list[bool]:
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        ax, ay = points[first]
+        dx, dy = points[last][0] - ax, points[last][1] - ay
+        length = math.hypot(dx, dy)
+        farthest, split = -1.0, first
+        for index in range(first + 1, last):
+            px, py = points[index][0] - ax, points[index][1] - ay
+            distance = abs(dx * py - dy * px) / length if length else math.hypot(px, py)
+            if distance > farthest:
+                farthest, split = distance, index
+        if farthest > tolerance:
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return keep
+
+
+def _latest_observations(db: Session, paddock_ids: list[str]) -> dict[str, tuple]:
+    # NO_DATA rows carry a 0.0 placeholder mean, so the latest usable observation is reported instead.
+    ranked = (
+        select(
+            PaddockObservation.paddock_id,
+            PaddockObservation.obs_date,
+            PaddockObservation.ndvi_mean,
+            func.row_number()
+            .over(partition_by=PaddockObservation.paddock_id, order_by=desc(PaddockObservation.obs_date))
+            .label('rank'),
+        )
+        .where(
+            PaddockObservation.paddock_id.in_(paddock_ids),
+            PaddockObservation.quality_flag != QualityFlag.NO_DATA,
+        )
+        .subquery()
+    )
+    rows = db.execute(select(ranked.c.paddock_id, ranked.c.obs_date, ranked.c.ndvi_mean).where(ranked.c.rank == 1))
+    return {row.paddock_id: (row.obs_date, row.ndvi_mean) for row in rows}
+
+
+def _latest_rec_types(db: Session, paddock_ids: list[str]) -> dict[str, str]:
+    ranked = (
+        select(
+            PaddockRecommendation.paddock_id,
+            PaddockRecommendation.rec_type,
+            func.row_number()
+            .over(
+                partition_by=PaddockRecommendation.paddock_id,
+                order_by=desc(Recommendation.created_for_week_start),
+            )
+            .label('rank'),
+        )
+        .join(Recommendation, Recommendation.id == PaddockRecommendation.recommendation_id)
+        .where(PaddockRecommendation.paddock_id.in_(paddock_ids))
+        .subquery()
+    )
+    rows = db.execute(select(ranked.c.paddock_id, ranked.c.rec_type).where(ranked.c.rank == 1))
+    return {row.paddock_id: row.rec_type.value for row in rows}
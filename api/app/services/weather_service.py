@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import uuid
 from datetime import date, datetime, timedelta
 
-import httpx
 from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.db.upsert import upsert_rows
+from app.models.enums import JobType
 from app.models.farm import Farm
 from app.models.weather_daily import WeatherDaily
+from app.services.data_version import bump_data_version
+from app.services.forecast_cache import forecast_cache
+from app.services.job_runs import tracked_job, tracked_job_async
+from app.services.openweather_client import get_openweather_client
+
+WEATHER_UPDATE_COLUMNS = ('rain_mm', 'temp_min_c', 'temp_max_c', 'wind_kph', 'source', 'fetched_at')
 
 
 async def fetch_weather_forecast(db: Session, farm_id: str) -> list[WeatherDaily]:
@@ -16,50 +26,110 @@ async def fetch_weather_forecast(db: Session, farm_id: str) -> list[WeatherDaily
     if not farm:
         return []
 
+    with tracked_job(db, JobType.fetch_weather, farm_id) as metrics:
+        with metrics.stage('fetch'):
+            forecast = await _forecast_for(farm)
+        with metrics.stage('store'):
+            metrics.count('rows_upserted', _store_forecast(db, farm_id, forecast))
+    return get_weather_forecast(db, farm_id)
+
+
+async def fetch_weather_forecast_async(db: AsyncSession, farm_id: str) -> list[WeatherDaily]:
+    farm = await db.get(Farm, farm_id)
+    if not farm:
+        return []
+
+    async with tracked_job_async(db, JobType.fetch_weather, farm_id) as metrics:
+        with metrics.stage('fetch'):
+            forecast = await _forecast_for(farm)
+        with metrics.stage('store'):
+            metrics.count('rows_upserted', await db.run_sync(_store_forecast, farm_id, forecast))
+    return await get_weather_forecast_async(db, farm_id)
+
+
+async def fetch_weather_forecasts(db: Session, farm_ids: list[str]) -> dict:
+    """Refresh many farms: one upstream call per forecast cell, run concurrently.
+
+    Writes share one commit with the batch's job record.
+    """
+    refreshed: dict[str, int] = {}
+    failures: dict[str, str] = {}
+    with tracked_job(db, JobType.fetch_weather) as metrics:
+        farms = db.scalars(select(Farm).where(Farm.id.in_(farm_ids))).all()
+        with metrics.stage('fetch'):
+            forecasts = await asyncio.gather(*(_forecast_for(farm) for farm in farms), return_exceptions=True)
+
+        with metrics.stage('store'):
+            for farm, forecast in zip(farms, forecasts):
+                if isinstance(forecast, Exception):
+                    failures[farm.id] = str(forecast) or type(forecast).__name__
+                    continue
+                refreshed[farm.id] = _store_forecast(db, farm.id, forecast)
+        metrics.record(farms=len(farm_ids), refreshed=len(refreshed), failed=len(failures))
+        metrics.count('rows_upserted', sum(refreshed.values()))
+
+    missing = set(farm_ids) - {farm.id for farm in farms}
+    failures.update({farm_id: 'Farm not found' for farm_id in missing})
+    return {'refreshed': refreshed, 'failures': failures}
+
+
+async def _forecast_for(farm: Farm) -> list[dict]:
     settings = get_settings()
     if settings.openweather_api_key:
-        forecast = await _fetch_from_openweather(farm.latitude, farm.longitude, settings.openweather_api_key)
-    else:
-        forecast = _synthetic_forecast()
-
-    db.execute(delete(WeatherDaily).where(WeatherDaily.farm_id == farm_id))
-    rows: list[WeatherDaily] = []
-    for item in forecast:
-        row = WeatherDaily(
-            farm_id=farm_id,
-            date=item['date'],
-            rain_mm=item['rain_mm'],
-            temp_min_c=item['temp_min_c'],
-            temp_max_c=item['temp_max_c'],
-            wind_kph=item['wind_kph'],
-            source=item['source'],
-            fetched_at=datetime.utcnow(),
+        return await forecast_cache.get_or_fetch(farm.latitude, farm.longitude, _fetch_from_openweather)
+    return _synthetic_forecast()
+
+
+def _store_forecast(db: Session, farm_id: str, forecast: list[dict]) -> int:
+    """Upsert the forecast days on (farm_id, date); does not commit.
+
+    Days that have dropped out of the forecast window are removed so readers only ever
+    see the current forecast, but unchanged days are updated in place rather than churned.
+    """
+    fetched_at = datetime.utcnow()
+    rows = [
+        {
+            'id': str(uuid.uuid4()),
+            'farm_id': farm_id,
+            'date': item['date'],
+            'rain_mm': item['rain_mm'],
+            'temp_min_c': item['temp_min_c'],
+            'temp_max_c': item['temp_max_c'],
+            'wind_kph': item['wind_kph'],
+            'source': item['source'],
+            'fetched_at': fetched_at,
+        }
+        for item in forecast
+    ]
+    upsert_rows(db, WeatherDaily, rows, ('farm_id', 'date'), WEATHER_UPDATE_COLUMNS)
+    db.execute(
+        delete(WeatherDaily).where(
+            WeatherDaily.farm_id == farm_id,
+            WeatherDaily.date.not_in([row['date'] for row in rows]),
         )
-        db.add(row)
-        rows.append(row)
-
-    db.commit()
-    return rows
+    )
+    bump_data_version(db, farm_id)
+    return len(rows)
 
 
 def get_weather_forecast(db: Session, farm_id: str) -> list[WeatherDaily]:
-    stmt = (
+    return db.scalars(_forecast_query(farm_id)).all()
+
+
+async def get_weather_forecast_async(db: AsyncSession, farm_id: str) -> list[WeatherDaily]:
+    return (await db.scalars(_forecast_query(farm_id))).all()
+
+
+def _forecast_query(farm_id: str):
+    return (
         select(WeatherDaily)
         .where(WeatherDaily.farm_id == farm_id)
         .order_by(WeatherDaily.date.asc(), WeatherDaily.fetched_at.desc())
     )
-    return db.scalars(stmt).all()
-
 
-async def _fetch_from_openweather(lat: float, lon: float, api_key: str) -> list[dict]:
-    settings = get_settings()
-    url = f"{settings.openweather_base_url}/forecast"
-    params = {'lat': lat, 'lon': lon, 'appid': api_key, 'units': 'metric'}
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        response = await client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+async def _fetch_from_openweather(lat: float, lon: float) -> list[dict]:
+    data = await get_openweather_client().forecast(lat, lon)
 
     # Collapse 3-hour data into day buckets.
     day_buckets: dict[date, dict] = {}
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.services.projection import project_lon_lat
+from app.services.raster import RasterGrid, geometry_rings
+
+PERCENTILES = (10.0, 50.0, 90.0)
+
+
+@dataclass(frozen=True)
+class ZonalStats:
+    mean: float | None
+    p10: float | None
+    p50: float | None
+    p90: float | None
+    valid_pixels: int
+    total_pixels: int
+
+    @property
+    def invalid_pct(self) -> float:
+        if self.total_pixels == 0:
+            return 100.0
+        return 100.0 * (self.total_pixels - self.valid_pixels) / self.total_pixels
+
+
+def compute_ndvi(red: np.ndarray, nir: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
+    """NDVI as float32; NaN where the band sum is zero or the mask flags the pixel (non-zero)."""
+    red = red.astype(np.float32, copy=False)
+    nir = nir.astype(np.float32, copy=False)
+    denom = nir + red
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ndvi = (nir - red) / denom
+    invalid = denom == 0
+    if mask is not None:
+        invalid |= mask != 0
+    ndvi[invalid] = np.nan
+    return ndvi
+
+
+def polygon_pixel_indices(grid: RasterGrid, geom_geojson: dict) -> np.ndarray:
+    """Flat (row * width + col) indices of pixels whose centres fall inside the geometry.
+
+    Scanline fill with the even-odd rule, so holes and MultiPolygon parts are honoured.
+    """
+    edges = _pixel_space_edges(grid, geom_geojson)
+    if edges is None:
+        return np.empty(0, dtype=np.int64)
+    x1, y1, x2, y2 = edges
+
+    row_start = max(0, int(np.floor(min(y1.min(), y2.min()) - 0.5)))
+    row_stop = min(grid.height, int(np.ceil(max(y1.max(), y2.max()) + 0.5)))
+    if row_start >= row_stop:
+        return np.empty(0, dtype=np.int64)
+
+    rows = np.arange(row_start, row_stop, dtype=np.int64)
+    centres = rows[:, None] + 0.5
+    crosses = (y1 <= centres) != (y2 <= centres)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        xs = x1 + (centres - y1) * (x2 - x1) / (y2 - y1)
+    xs = np.where(crosses, xs, np.inf)
+    xs.sort(axis=1)
+
+    max_crossings = int(crosses.sum(axis=1).max())
+    if max_crossings == 0:
+        return np.empty(0, dtype=np.int64)
+    xs = xs[:, :max_crossings]
+    enter = xs[:, 0::2]
+    leave = xs[:, 1::2]
+    valid = np.isfinite(leave)
+
+    span_rows = np.broadcast_to(rows[:, None], enter.shape)[valid]
+    col_start = np.clip(np.ceil(enter[valid] - 0.5), 0, grid.width).astype(np.int64)
+    col_stop = np.clip(np.ceil(leave[valid] - 0.5), 0, grid.width).astype(np.int64)
+    return _expand_spans(span_rows, col_start, col_stop, grid.width)
+
+
+def zonal_ndvi_stats(
+    ndvi: np.ndarray,
+    zones: Sequence[np.ndarray],
+    percentiles: Sequence[float] = PERCENTILES,
+) -> list[ZonalStats]:
+    """Mean and percentiles of NaN-masked `ndvi` per zone of flat pixel indices, in one grouped pass."""
+    zone_count = len(zones)
+    if zone_count == 0:
+        return []
+
+    totals = np.fromiter((len(zone) for zone in zones), dtype=np.int64, count=zone_count)
+    labels = np.repeat(np.arange(zone_count), totals)
+    indices = np.concatenate(zones).astype(np.int64, copy=False) if totals.sum() else np.empty(0, np.int64)
+
+    values = ndvi.ravel()[indices]
+    keep = ~np.isnan(values)
+    values = values[keep].astype(np.float64)
+    labels = labels[keep]
+
+    counts = np.bincount(labels, minlength=zone_count)
+    sums = np.bincount(labels, weights=values, minlength=zone_count)
+    ordered = _sort_within_groups(values, labels)
+    starts = np.cumsum(counts) - counts
+
+    has_data = counts > 0
+    means = np.divide(sums, counts, out=np.full(zone_count, np.nan), where=has_data)
+    quantiles = [_grouped_percentile(ordered, starts, counts, q) for q in percentiles]
+
+    results = []
+    for i in range(zone_count):
+        if not has_data[i]:
+            results.append(ZonalStats(None, None, None, None, 0, int(totals[i])))
+            continue
+        p10, p50, p90 = (float(q[i]) for q in quantiles)
+        results.append(ZonalStats(float(means[i]), p10, p50, p90, int(counts[i]), int(totals[i])))
+    return results
+
+
+def _sort_within_groups(values: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    # One float sort on label-offset keys is several times faster than lexsort on (values, labels).
+    if len(values) == 0:
+        return values
+    low = values.min()
+    stride = values.max() - low + 1.0
+    keys = labels * stride + (values - low)
+    keys.sort()
+    return keys - np.floor(keys / stride) * stride + low
+
+
+def _grouped_percentile(ordered: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    # Linear interpolation between closest ranks, matching np.percentile's default.
+    result = np.full(len(counts), np.nan)
+    has_data = counts > 0
+    if not has_data.any():
+        return result
+    position = (counts[has_data] - 1) * (q / 100.0)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    fraction = position - lower
+    base = starts[has_data]
+    low_values = ordered[base + lower]
+    high_values = ordered[base + upper]
+    result[has_data] = low_values + (high_values - low_values) * fraction
+    return result
+
+
+def _pixel_space_edges(
+    grid: RasterGrid, geom_geojson: dict
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None:
+    rings = geometry_rings(geom_geojson)
+    if not rings:
+        return None
+
+    starts_x, starts_y, ends_x, ends_y = [], [], [], []
+    for ring in rings:
+        coords = np.asarray(ring, dtype=np.float64)
+        if coords.ndim != 2 or len(coords) < 3:
+            continue
+        x, y = project_lon_lat(coords[:, 0], coords[:, 1], grid.crs)
+        col, row = grid.to_pixel(x, y)
+        starts_x.append(col)
+        starts_y.append(row)
+        ends_x.append(np.roll(col, -1))
+        ends_y.append(np.roll(row, -1))
+
+    if not starts_x:
+        return None
+    return np.concatenate(starts_x), np.concatenate(starts_y), np.concatenate(ends_x), np.concatenate(ends_y)
+
+
+def _expand_spans(rows: np.ndarray, col_start: np.ndarray, col_stop: np.ndarray, width: int) -> np.ndarray:
+    lengths = np.maximum(col_stop - col_start, 0)
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(rows * width + col_start, lengths) + offsets
@@ -4,13 +4,23 @@ from app.core.config import get_settings
 
 settings = get_settings()
 
-celery_app = Celery('farm_intelligence', broker=settings.redis_url, backend=settings.redis_url)
+celery_app = Celery(
+    'farm_intelligence',
+    broker=settings.redis_url,
+    backend=settings.redis_url,
+    include=['app.workers.tasks', 'app.workers.metrics'],
+)
 celery_app.conf.update(
     task_serializer='json',
     accept_content=['json'],
     result_serializer='json',
     timezone='UTC',
     enable_utc=True,
+    # Fan-out jobs dispatch many chunk tasks; hand them out one at a time so workers share them evenly.
+    worker_prefetch_multiplier=1,
+    # Imports fan validation out to their own process pool, which prefork (daemonic) children cannot start;
+    # the `imports` queue is served by a worker with the threads pool.
+    task_routes={'app.workers.tasks.import_paddocks_task': {'queue': 'imports'}},
 )
 
 celery_app.conf.beat_schedule = {
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from billiard.process import current_process
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_init
+
+from app.core.config import get_settings
+from app.core.metrics import celery_task_duration, registry
+
+_started: dict[str, float] = {}
+
+
+@task_prerun.connect
+def _task_started(task_id: str, **_) -> None:
+    _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_finished(task_id: str, task, state: str | None = None, **_) -> None:
+    started = _started.pop(task_id, None)
+    if started is not None:
+        celery_task_duration.observe((task.name, state or 'UNKNOWN'), time.perf_counter() - started)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        body = registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - scrapes are not worth a log line
+        pass
+
+
+def start_metrics_server(port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('0.0.0.0', port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-exporter', daemon=True).start()
+    return server
+
+
+# Tasks run in pool processes, each with its own registry: the main worker process serves
+# WORKER_METRICS_PORT (covers solo/threads pools) and prefork child N serves port + 1 + N.
+@worker_init.connect
+def _serve_worker_metrics(**_) -> None:
+    port = get_settings().worker_metrics_port
+    if port:
+        start_metrics_server(port)
+
+
+@worker_process_init.connect
+def _serve_child_metrics(**_) -> None:
+    port = get_settings().worker_metrics_port
+    if port:
+        start_metrics_server(port + 1 + getattr(current_process(), 'index', 0))
+
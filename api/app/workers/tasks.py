@@ -1,42 +1,178 @@
 import asyncio
+import time
+from collections.abc import Coroutine, Generator
+from contextlib import contextmanager
 from datetime import date
+from typing import Any, TypeVar
 
+from celery import chain, chord, group
+from celery.result import AsyncResult
 from sqlalchemy import select
 
+from app.core.config import get_settings
 from app.db.session import SessionLocal
 from app.models.farm import Farm
+from app.services.job_runs import mark_pipeline_stage
+from app.services.openweather_client import close_openweather_client
+from app.services.paddock_import import run_paddock_import
 from app.services.pipeline_service import ingest_satellite_scenes
 from app.services.recommendation_service import generate_weekly_recommendations
-from app.services.weather_service import fetch_weather_forecast
+from app.services.weather_service import fetch_weather_forecast, fetch_weather_forecasts
 from app.workers.celery_app import celery_app
 
+T = TypeVar('T')
+
 
 @celery_app.task
-def ingest_satellite_scenes_task(farm_id: str) -> dict:
-    with SessionLocal() as db:
+def ingest_satellite_scenes_task(farm_id: str, pipeline_run_id: str | None = None) -> dict:
+    with _pipeline_stage(pipeline_run_id, 'ingest_satellite') as details, SessionLocal() as db:
         scenes = ingest_satellite_scenes(db, farm_id)
+        details['scenes'] = len(scenes)
         return {'farm_id': farm_id, 'scenes': len(scenes)}
 
 
 @celery_app.task
-def fetch_weather_forecast_task(farm_id: str) -> dict:
-    with SessionLocal() as db:
-        weather = asyncio.run(fetch_weather_forecast(db, farm_id))
+def fetch_weather_forecast_task(farm_id: str, pipeline_run_id: str | None = None) -> dict:
+    with _pipeline_stage(pipeline_run_id, 'fetch_weather') as details, SessionLocal() as db:
+        weather = _run_async(fetch_weather_forecast(db, farm_id))
+        details['days'] = len(weather)
         return {'farm_id': farm_id, 'days': len(weather)}
 
 
 @celery_app.task
-def generate_weekly_recommendations_task(farm_id: str, week_start: str | None = None) -> dict:
+def refresh_weather_for_farms_task(farm_ids: list[str]) -> dict:
+    with SessionLocal() as db:
+        result = _run_async(fetch_weather_forecasts(db, farm_ids))
+        return {'farm_count': len(farm_ids), 'refreshed': len(result['refreshed']), 'failures': result['failures']}
+
+
+@celery_app.task
+def refresh_weather_for_all_farms() -> dict:
     with SessionLocal() as db:
+        farm_ids = db.scalars(select(Farm.id).order_by(Farm.created_at.asc())).all()
+    size = max(1, get_settings().weather_refresh_batch_size)
+    batches = [farm_ids[i : i + size] for i in range(0, len(farm_ids), size)]
+    if batches:
+        group(refresh_weather_for_farms_task.s(batch) for batch in batches).apply_async()
+    return {'farm_count': len(farm_ids), 'batches': len(batches)}
+
+
+@celery_app.task
+def generate_weekly_recommendations_task(
+    farm_id: str, week_start: str | None = None, pipeline_run_id: str | None = None
+) -> dict:
+    with _pipeline_stage(pipeline_run_id, 'generate_recommendations') as details, SessionLocal() as db:
         date_value = date.fromisoformat(week_start) if week_start else None
         rec = generate_weekly_recommendations(db, farm_id, date_value)
+        details['recommendation_id'] = rec.id
         return {'farm_id': farm_id, 'recommendation_id': rec.id}
 
 
+def enqueue_ingest_pipeline(farm_id: str, pipeline_run_id: str) -> AsyncResult:
+    """Ingest, then weather, then recommendations; each stage reports into the parent JobRun."""
+    return chain(
+        ingest_satellite_scenes_task.si(farm_id, pipeline_run_id),
+        fetch_weather_forecast_task.si(farm_id, pipeline_run_id),
+        generate_weekly_recommendations_task.si(farm_id, None, pipeline_run_id),
+    ).apply_async()
+
+
+@celery_app.task
+def import_paddocks_task(farm_id: str, run_id: str, upload_uri: str) -> dict:
+    with SessionLocal() as db:
+        return run_paddock_import(db, run_id, farm_id, upload_uri)
+
+
+def enqueue_paddock_import(farm_id: str, run_id: str, upload_uri: str) -> AsyncResult:
+    return import_paddocks_task.delay(farm_id, run_id, upload_uri)
+
+
+@celery_app.task
+def generate_weekly_recommendations_chunk_task(farm_ids: list[str], week_start: str | None = None) -> list[dict]:
+    return [_timed_farm_recommendation(farm_id, week_start) for farm_id in farm_ids]
+
+
+@celery_app.task
+def summarize_weekly_recommendations(chunk_results: list[list[dict]], dispatched_at: float) -> dict:
+    results = [result for chunk in chunk_results for result in chunk]
+    failures = [result for result in results if result['status'] == 'failed']
+    return {
+        'farm_count': len(results),
+        'succeeded': len(results) - len(failures),
+        'failures': [{'farm_id': item['farm_id'], 'error': item['error']} for item in failures],
+        'farm_durations_s': {item['farm_id']: item['duration_s'] for item in results},
+        'total_wall_time_s': round(time.time() - dispatched_at, 3),
+    }
+
+
 @celery_app.task
-def run_weekly_recommendations_for_all_farms() -> dict:
+def run_weekly_recommendations_for_all_farms(week_start: str | None = None) -> dict:
+    """Fan out per-farm generation as a chord of chunked tasks, one session per farm."""
     with SessionLocal() as db:
-        farm_ids = db.scalars(select(Farm.id)).all()
-        for farm_id in farm_ids:
-            generate_weekly_recommendations(db, farm_id)
-        return {'farm_count': len(farm_ids)}
+        farm_ids = db.scalars(select(Farm.id).order_by(Farm.created_at.asc())).all()
+    if not farm_ids:
+        return {'farm_count': 0, 'chunks': 0}
+
+    chunk_count, result = _dispatch_weekly_fanout(farm_ids, week_start)
+    return {'farm_count': len(farm_ids), 'chunks': chunk_count, 'summary_task_id': result.id}
+
+
+def _dispatch_weekly_fanout(farm_ids: list[str], week_start: str | None) -> tuple[int, AsyncResult]:
+    size = max(1, get_settings().recommendation_fanout_chunk_size)
+    chunks = [farm_ids[i : i + size] for i in range(0, len(farm_ids), size)]
+    header = group(generate_weekly_recommendations_chunk_task.s(chunk, week_start) for chunk in chunks)
+    return len(chunks), chord(header)(summarize_weekly_recommendations.s(time.time()))
+
+
+def _timed_farm_recommendation(farm_id: str, week_start: str | None) -> dict:
+    started = time.perf_counter()
+    try:
+        with SessionLocal() as db:
+            date_value = date.fromisoformat(week_start) if week_start else None
+            rec = generate_weekly_recommendations(db, farm_id, date_value)
+            outcome = {'status': 'success', 'recommendation_id': rec.id, 'error': None}
+    except Exception as exc:  # noqa: BLE001 - one farm must not fail the whole run
+        outcome = {'status': 'failed', 'recommendation_id': None, 'error': str(exc)}
+    return {'farm_id': farm_id, 'duration_s': round(time.perf_counter() - started, 3), **outcome}
+
+
+@contextmanager
+def _pipeline_stage(pipeline_run_id: str | None, stage: str) -> Generator[dict, None, None]:
+    """Mark a chain stage running/success/failed on its parent run; a no-op for standalone tasks."""
+    details: dict = {}
+    if pipeline_run_id is None:
+        yield details
+        return
+
+    with SessionLocal() as db:
+        mark_pipeline_stage(db, pipeline_run_id, stage, 'running')
+    started = time.perf_counter()
+    try:
+        yield details
+    except Exception as exc:
+        with SessionLocal() as db:
+            mark_pipeline_stage(
+                db,
+                pipeline_run_id,
+                stage,
+                'failed',
+                error=str(exc) or type(exc).__name__,
+                duration_s=round(time.perf_counter() - started, 3),
+            )
+        raise
+    with SessionLocal() as db:
+        mark_pipeline_stage(
+            db, pipeline_run_id, stage, 'success', duration_s=round(time.perf_counter() - started, 3), **details
+        )
+
+
+def _run_async(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run `coroutine` on a fresh event loop, closing the loop's OpenWeather client before the loop goes away."""
+
+    async def run() -> T:
+        try:
+            return await coroutine
+        finally:
+            await close_openweather_client()
+
+    return asyncio.run(run())
@@ -0,0 +1,136 @@
+"""p50/p99 latency of unrelated requests while forecast requests run: blocking sync session vs the async route.
+
+Run from `api/`: python -m benchmarks.bench_async_weather [--farms 200] [--concurrency 8] [--database-url ...]
+The "blocking" route is the previous handler (async def calling the sync Session on the event loop); the
+"async" route is the shipped `GET /farms/{farm_id}/weather/forecast` on the AsyncSession. Every farm starts
+without a forecast, so each request fetches (synthetic, no API key) and stores one, which is DB work in both
+routes. Requests go through an in-process ASGI transport, so anything that blocks the loop shows up directly
+in the health-check latencies.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.v1.router import api_router
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.session import async_database_url, get_async_db, get_db
+from app.models.farm import Farm
+from app.services.weather_service import fetch_weather_forecast, get_weather_forecast
+
+
+def _build_app(url: str) -> FastAPI:
+    sync_factory = sessionmaker(bind=create_engine(url), autoflush=False)
+    async_factory = async_sessionmaker(
+        bind=create_async_engine(async_database_url(url)), autoflush=False, expire_on_commit=False
+    )
+
+    def bench_db():
+        with sync_factory() as db:
+            yield db
+
+    async def bench_async_db():
+        async with async_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(api_router, prefix='/api/v1')
+
+    @app.get('/legacy/farms/{farm_id}/weather/forecast')
+    async def legacy_forecast(farm_id: str, db: Session = Depends(get_db)) -> dict:
+        data = get_weather_forecast(db, farm_id)
+        if not data:
+            data = await fetch_weather_forecast(db, farm_id)
+        return {'meta': {'count': len(data)}}
+
+    app.dependency_overrides[get_db] = bench_db
+    app.dependency_overrides[get_async_db] = bench_async_db
+    return app
+
+
+def _seed(url: str, farms: int) -> list[str]:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        farm_rows = [Farm(name=f'Bench {i}', latitude=-36.85, longitude=174.75) for i in range(farms)]
+        db.add_all(farm_rows)
+        db.commit()
+        farm_ids = [farm.id for farm in farm_rows]
+    engine.dispose()
+    return farm_ids
+
+
+async def _measure(
+    app: FastAPI, forecast_path: str, farm_ids: list[str], concurrency: int
+) -> tuple[list[float], float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        latencies: list[float] = []
+        done = asyncio.Event()
+        queue = list(farm_ids)
+
+        async def ping() -> None:
+            while not done.is_set():
+                start = time.perf_counter()
+                response = await client.get('/api/v1/health')
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.002)
+
+        async def forecasts() -> None:
+            while queue:
+                response = await client.get(forecast_path.format(farm_id=queue.pop()))
+                response.raise_for_status()
+
+        async def load() -> None:
+            await asyncio.gather(*(forecasts() for _ in range(concurrency)))
+            done.set()
+
+        start = time.perf_counter()
+        await asyncio.gather(ping(), load())
+        return latencies, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--farms', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    get_settings().openweather_api_key = None
+    tmpdir = tempfile.TemporaryDirectory()
+    url = args.database_url or f'sqlite:///{tmpdir.name}/bench.db'
+    # Separate farms per route, so both start from farms without a stored forecast.
+    farm_ids = _seed(url, 2 * args.farms)
+    app = _build_app(url)
+
+    print(f'{"route":>9} {"pings":>6} {"p50 ms":>8} {"p99 ms":>8} {"max ms":>8} {"forecasts/s":>12}')
+    for index, (label, path) in enumerate(
+        (
+            ('blocking', '/legacy/farms/{farm_id}/weather/forecast'),
+            ('async', '/api/v1/farms/{farm_id}/weather/forecast'),
+        )
+    ):
+        farms = farm_ids[index * args.farms : (index + 1) * args.farms]
+        latencies, elapsed = asyncio.run(_measure(app, path, farms, args.concurrency))
+        ordered = sorted(latencies)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        print(
+            f'{label:>9} {len(ordered):6d} {statistics.median(ordered) * 1000:8.2f} {p99 * 1000:8.2f} '
+            f'{ordered[-1] * 1000:8.2f} {args.farms / elapsed:12.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Per-polygon Python loops versus the batch NumPy geometry engine.
+
+Run from `api/`: python -m benchmarks.bench_geometry [--paddocks 20000] [--vertices 40]
+Times area (and centroids) for synthetic paddocks with a hole in every fourth one. It compares
+the original per-vertex Web Mercator loop, the per-vertex spherical loop that replaced it, and the
+batch engine on ragged ring arrays. It also prints each loop's area error against the engine at a
+few latitudes.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from app.services.geometry import AUTHALIC_RADIUS_M, batch_area_hectares, batch_centroids, pack_rings
+
+
+def _mercator_loop_area_hectares(geom_geojson: dict) -> float:
+    # The original implementation: exterior ring only, shoelace in Web Mercator metres.
+    coords = geom_geojson['coordinates'][0]
+    projected = []
+    for lon, lat in coords:
+        lat = max(min(lat, 89.5), -89.5)
+        y = 6_378_137.0 * math.log(math.tan(math.pi / 4.0 + math.radians(lat) / 2.0))
+        projected.append((math.radians(lon) * 6_378_137.0, y))
+    area_m2 = sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(projected, projected[1:]))
+    return abs(area_m2) * 0.5 / 10_000.0
+
+
+def _spherical_loop_area_hectares(geom_geojson: dict) -> float:
+    # Chamberlain & Duquette on the authalic sphere with geodetic latitudes, holes subtracted.
+    def ring_area(ring: list) -> float:
+        total = 0.0
+        for (lon1, lat1), (lon2, lat2) in zip(ring, ring[1:]):
+            total += math.radians(lon2 - lon1) * (2.0 + math.sin(math.radians(lat1)) + math.sin(math.radians(lat2)))
+        return abs(total) * AUTHALIC_RADIUS_M * AUTHALIC_RADIUS_M / 2.0
+
+    rings = geom_geojson['coordinates']
+    return max(ring_area(rings[0]) - sum(ring_area(ring) for ring in rings[1:]), 0.0) / 10_000.0
+
+
+def _vertex_mean_centroid(geom_geojson: dict) -> tuple[float, float]:
+    coords = geom_geojson['coordinates'][0][:-1]
+    return (sum(point[0] for point in coords) / len(coords), sum(point[1] for point in coords) / len(coords))
+
+
+def _paddocks(count: int, vertices: int, latitude: float, rng: np.random.Generator) -> list[dict]:
+    angles = np.linspace(0.0, 2.0 * np.pi, vertices, endpoint=False)
+    geoms = []
+    for index in range(count):
+        lon, lat = rng.uniform(170.0, 178.0), latitude + rng.uniform(-1.0, 1.0)
+        radius = rng.uniform(0.001, 0.01) * (1.0 + 0.2 * rng.random(vertices))
+        ring = np.column_stack([lon + radius * np.cos(angles), lat + radius * np.sin(angles)]).tolist()
+        rings = [ring + ring[:1]]
+        if index % 4 == 0:
+            inner = 0.2 * radius
+            hole = np.column_stack([lon + inner * np.cos(-angles), lat + inner * np.sin(-angles)]).tolist()
+            rings.append(hole + hole[:1])
+        geoms.append({'type': 'Polygon', 'coordinates': rings})
+    return geoms
+
+
+def _time(label: str, count: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<28}{elapsed * 1000:9.1f} ms  {count / elapsed:10.0f} paddocks/s')
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paddocks', type=int, default=20_000)
+    parser.add_argument('--vertices', type=int, default=40)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    geoms = _paddocks(args.paddocks, args.vertices, -37.0, rng)
+    print(f'paddocks: {args.paddocks}, vertices per ring: {args.vertices}')
+
+    _time('mercator loop area', args.paddocks, lambda: [_mercator_loop_area_hectares(geom) for geom in geoms])
+    _time('spherical loop area', args.paddocks, lambda: [_spherical_loop_area_hectares(geom) for geom in geoms])
+    _time('vertex-mean centroids', args.paddocks, lambda: [_vertex_mean_centroid(geom) for geom in geoms])
+    pack_s = _time('batch pack', args.paddocks, lambda: pack_rings(geoms))
+    batch = pack_rings(geoms)
+    area_s = _time('batch area', args.paddocks, lambda: batch_area_hectares(batch))
+    centroid_s = _time('batch centroids', args.paddocks, lambda: batch_centroids(batch))
+    total = pack_s + area_s + centroid_s
+    print(f'{"batch pack+area+centroids":<28}{total * 1000:9.1f} ms  {args.paddocks / total:10.0f} paddocks/s')
+
+    print('\nmedian area error against the batch engine (WGS84):')
+    for latitude in (0.0, -37.0, 60.0, 75.0):
+        sample = _paddocks(500, args.vertices, latitude, rng)
+        reference = batch_area_hectares(sample)
+        mercator = np.array([_mercator_loop_area_hectares(geom) for geom in sample]) / reference - 1.0
+        spherical = np.array([_spherical_loop_area_hectares(geom) for geom in sample]) / reference - 1.0
+        print(
+            f'  lat {latitude:6.1f}: mercator {np.median(mercator) * 100:+9.3f}%  '
+            f'spherical {np.median(spherical) * 100:+7.3f}%'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Per-request cost of MetricsMiddleware, measured by calling ASGI apps directly (no sockets).
+
+Run from `api/`: python -m benchmarks.bench_metrics_overhead [--requests 200000]
+"bare" is a minimal endpoint app, "metrics" is the same app wrapped in the middleware; the
+difference is the overhead per request. The budget for staying on in production is 50 us.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from app.api.middleware import MetricsMiddleware
+from app.core.metrics import registry
+
+
+class _Route:
+    path_format = '/api/v1/farms/{farm_id}/paddocks'
+
+
+async def _endpoint(scope, receive, send) -> None:
+    scope['route'] = _Route
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': b'{"data": []}'})
+
+
+async def _receive() -> dict:
+    return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+
+async def _send(message: dict) -> None:
+    return None
+
+
+async def _run(app, requests: int) -> float:
+    scope = {'type': 'http', 'method': 'GET', 'path': '/api/v1/farms/x/paddocks', 'headers': []}
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), _receive, _send)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200_000)
+    args = parser.parse_args()
+
+    wrapped = MetricsMiddleware(_endpoint)
+    # Warm both paths so the first series allocation is not timed.
+    asyncio.run(_run(_endpoint, 1_000))
+    asyncio.run(_run(wrapped, 1_000))
+
+    bare = min(asyncio.run(_run(_endpoint, args.requests)) for _ in range(3))
+    metered = min(asyncio.run(_run(wrapped, args.requests)) for _ in range(3))
+    overhead_us = (metered - bare) / args.requests * 1e6
+    print(f'bare      {bare / args.requests * 1e6:8.2f} us/request')
+    print(f'metrics   {metered / args.requests * 1e6:8.2f} us/request')
+    print(f'overhead  {overhead_us:8.2f} us/request (budget 50 us)')
+    print(f'scrape    {len(registry.render())} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Query plans for farm-scoped observation reads before and after migration 0002.
+
+Run from `api/`: python -m benchmarks.bench_observation_indexes --database-url postgresql+psycopg://...
+Builds a synthetic `bench_obs_*` copy of the observation tables (10M rows by default on PostgreSQL; farms ->
+paddocks -> observations, with a farm's paddocks spread across the table as real imports leave them). For each
+read it prints the median of five runs and the EXPLAIN output. The first pass joins through paddocks with the
+old single-column indexes; the second filters on the denormalized farm_id with the (farm_id, obs_date) and
+(paddock_id, obs_date DESC) indexes. Without --database-url it runs on a temporary SQLite file with 200k rows
+and shows EXPLAIN QUERY PLAN only.
+
+What to look for: the join plans probe once per paddock of the farm (nested loop) or hash the farm's paddocks
+against a wide observation scan, while the farm_id plans are one index range scan per read.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import Connection, create_engine, text
+
+PADDOCKS_PER_FARM = 50
+DATES_PER_PADDOCK = 100
+
+POPULATE = {
+    'postgresql': (
+        "INSERT INTO bench_obs_farms SELECT 'f' || lpad(n::text, 6, '0') FROM generate_series(1, :farms) AS s(n)",
+        "INSERT INTO bench_obs_paddocks SELECT 'p' || lpad(n::text, 8, '0'), "
+        "'f' || lpad(((n - 1) % :farms + 1)::text, 6, '0') FROM generate_series(1, :paddocks) AS s(n)",
+        "INSERT INTO bench_obs_observations SELECT p.id || '-' || d, p.id, NULL, DATE '2024-01-01' + d * 5, "
+        "random(), 'OK' FROM bench_obs_paddocks p CROSS JOIN generate_series(0, :dates - 1) AS s(d)",
+    ),
+    'sqlite': (
+        'WITH RECURSIVE s(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM s WHERE n < :farms) '
+        "INSERT INTO bench_obs_farms SELECT printf('f%06d', n) FROM s",
+        'WITH RECURSIVE s(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM s WHERE n < :paddocks) '
+        "INSERT INTO bench_obs_paddocks SELECT printf('p%08d', n), printf('f%06d', (n - 1) % :farms + 1) FROM s",
+        'WITH RECURSIVE s(d) AS (SELECT 0 UNION ALL SELECT d + 1 FROM s WHERE d < :dates - 1) '
+        "INSERT INTO bench_obs_observations SELECT p.id || '-' || d, p.id, NULL, "
+        "date('2024-01-01', '+' || (d * 5) || ' days'), abs(random() % 1000) / 1000.0, 'OK' "
+        'FROM bench_obs_paddocks p CROSS JOIN s',
+    ),
+}
+
+BEFORE = {
+    'observations_by_date': (
+        'SELECT o.paddock_id, o.ndvi_mean FROM bench_obs_observations o '
+        'JOIN bench_obs_paddocks p ON p.id = o.paddock_id WHERE p.farm_id = :farm AND o.obs_date = :day'
+    ),
+    'export_range': (
+        'SELECT o.paddock_id, o.obs_date, o.ndvi_mean FROM bench_obs_observations o '
+        'JOIN bench_obs_paddocks p ON p.id = o.paddock_id '
+        'WHERE p.farm_id = :farm AND o.obs_date BETWEEN :start AND :day ORDER BY o.obs_date, o.paddock_id'
+    ),
+    'latest_per_paddock': (
+        'SELECT paddock_id, obs_date, ndvi_mean FROM (SELECT o.paddock_id, o.obs_date, o.ndvi_mean, '
+        'row_number() OVER (PARTITION BY o.paddock_id ORDER BY o.obs_date DESC) AS rank '
+        'FROM bench_obs_observations o JOIN bench_obs_paddocks p ON p.id = o.paddock_id WHERE p.farm_id = :farm) '
+        'AS ranked WHERE rank <= 3'
+    ),
+}
+AFTER = {
+    'observations_by_date': (
+        'SELECT o.paddock_id, o.ndvi_mean FROM bench_obs_observations o '
+        'WHERE o.farm_id = :farm AND o.obs_date = :day'
+    ),
+    'export_range': (
+        'SELECT o.paddock_id, o.obs_date, o.ndvi_mean FROM bench_obs_observations o '
+        'WHERE o.farm_id = :farm AND o.obs_date BETWEEN :start AND :day ORDER BY o.obs_date, o.paddock_id'
+    ),
+    'latest_per_paddock': (
+        'SELECT paddock_id, obs_date, ndvi_mean FROM (SELECT o.paddock_id, o.obs_date, o.ndvi_mean, '
+        'row_number() OVER (PARTITION BY o.paddock_id ORDER BY o.obs_date DESC) AS rank '
+        'FROM bench_obs_observations o WHERE o.farm_id = :farm) AS ranked WHERE rank <= 3'
+    ),
+}
+PARAMS = {'farm': 'f000001', 'start': date(2024, 10, 1), 'day': date(2025, 1, 1)}
+
+
+def _build(connection: Connection, dialect: str, rows: int) -> None:
+    for table in ('bench_obs_observations', 'bench_obs_paddocks', 'bench_obs_farms'):
+        connection.execute(text(f'DROP TABLE IF EXISTS {table}'))
+    connection.execute(text('CREATE TABLE bench_obs_farms (id VARCHAR(36) PRIMARY KEY)'))
+    connection.execute(
+        text('CREATE TABLE bench_obs_paddocks (id VARCHAR(36) PRIMARY KEY, farm_id VARCHAR(36) NOT NULL)')
+    )
+    connection.execute(text('CREATE INDEX bench_obs_paddocks_farm_id ON bench_obs_paddocks (farm_id)'))
+    connection.execute(
+        text(
+            'CREATE TABLE bench_obs_observations (id VARCHAR(48) PRIMARY KEY, paddock_id VARCHAR(36) NOT NULL, '
+            'farm_id VARCHAR(36), obs_date DATE NOT NULL, ndvi_mean FLOAT NOT NULL, '
+            'quality_flag VARCHAR(16) NOT NULL, UNIQUE (paddock_id, obs_date))'
+        )
+    )
+    paddocks = max(1, rows // DATES_PER_PADDOCK)
+    sizes = {'farms': max(1, paddocks // PADDOCKS_PER_FARM), 'paddocks': paddocks, 'dates': DATES_PER_PADDOCK}
+    for statement in POPULATE[dialect]:
+        connection.execute(text(statement), sizes)
+    connection.execute(text('CREATE INDEX bench_obs_paddock_id ON bench_obs_observations (paddock_id)'))
+    connection.execute(text('CREATE INDEX bench_obs_obs_date ON bench_obs_observations (obs_date)'))
+    _analyze(connection, dialect)
+
+
+def _migrate(connection: Connection, dialect: str) -> None:
+    connection.execute(
+        text(
+            'UPDATE bench_obs_observations SET farm_id = '
+            '(SELECT farm_id FROM bench_obs_paddocks WHERE bench_obs_paddocks.id = bench_obs_observations.paddock_id)'
+        )
+    )
+    connection.execute(text('CREATE INDEX bench_obs_farm_obs_date ON bench_obs_observations (farm_id, obs_date)'))
+    connection.execute(
+        text('CREATE INDEX bench_obs_paddock_obs_date_desc ON bench_obs_observations (paddock_id, obs_date DESC)')
+    )
+    connection.execute(text('DROP INDEX bench_obs_paddock_id'))
+    _analyze(connection, dialect)
+
+
+def _analyze(connection: Connection, dialect: str) -> None:
+    if dialect == 'postgresql':
+        connection.execute(text('VACUUM ANALYZE bench_obs_observations'))
+        connection.execute(text('ANALYZE bench_obs_paddocks'))
+    else:
+        connection.execute(text('ANALYZE'))
+
+
+def _report(connection: Connection, dialect: str, label: str, queries: dict[str, str]) -> None:
+    explain = 'EXPLAIN (ANALYZE, BUFFERS)' if dialect == 'postgresql' else 'EXPLAIN QUERY PLAN'
+    for name, sql in queries.items():
+        timings = []
+        for _ in range(5):
+            started = time.perf_counter()
+            connection.execute(text(sql), PARAMS).all()
+            timings.append(time.perf_counter() - started)
+        print(f'\n== {label}: {name} (median {statistics.median(timings) * 1000:.1f} ms)')
+        for row in connection.execute(text(f'{explain} {sql}'), PARAMS):
+            print('   ', row[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--rows', type=int, default=None)
+    parser.add_argument('--keep', action='store_true', help='Leave the bench_obs_* tables in place.')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    url = args.database_url or f'sqlite:///{tmpdir.name}/bench.db'
+    engine = create_engine(url, isolation_level='AUTOCOMMIT')
+    dialect = engine.dialect.name
+    rows = args.rows or (10_000_000 if dialect == 'postgresql' else 200_000)
+
+    with engine.connect() as connection:
+        started = time.perf_counter()
+        _build(connection, dialect, rows)
+        print(f'{dialect}: built {rows:,} observations in {time.perf_counter() - started:.1f} s')
+        _report(connection, dialect, 'join through paddocks', BEFORE)
+
+        started = time.perf_counter()
+        _migrate(connection, dialect)
+        print(f'\nbackfilled farm_id and rebuilt indexes in {time.perf_counter() - started:.1f} s')
+        _report(connection, dialect, 'denormalized farm_id', AFTER)
+
+        if not args.keep:
+            for table in ('bench_obs_observations', 'bench_obs_paddocks', 'bench_obs_farms'):
+                connection.execute(text(f'DROP TABLE {table}'))
+
+    engine.dispose()
+    tmpdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
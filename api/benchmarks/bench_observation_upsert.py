@@ -0,0 +1,117 @@
+"""Per-row SELECT + ORM write (the old aggregate path) versus one batched upsert.
+
+Run from `api/`: python -m benchmarks.bench_observation_upsert [--database-url postgresql+psycopg://...]
+Each size runs an insert pass and then an update pass over the same (paddock, date) keys.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.upsert import upsert_rows
+from app.models.enums import QualityFlag
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.services.pipeline_service import OBSERVATION_UPDATE_COLUMNS
+
+OBS_DATE = date(2026, 1, 5)
+GEOM = {'type': 'Polygon', 'coordinates': [[[174.75, -36.85], [174.752, -36.85], [174.752, -36.848], [174.75, -36.85]]]}
+
+
+def _values(ndvi: float) -> dict:
+    return {
+        'ndvi_mean': ndvi,
+        'ndvi_p10': ndvi - 0.1,
+        'ndvi_p50': ndvi,
+        'ndvi_p90': ndvi + 0.1,
+        'cloud_pct': 5.0,
+        'quality_flag': QualityFlag.OK,
+    }
+
+
+def _legacy(db: Session, farm_id: str, paddock_ids: list[str], ndvi: float) -> None:
+    for paddock_id in paddock_ids:
+        existing = db.scalar(
+            select(PaddockObservation).where(
+                PaddockObservation.paddock_id == paddock_id,
+                PaddockObservation.obs_date == OBS_DATE,
+            )
+        )
+        if existing:
+            for key, value in _values(ndvi).items():
+                setattr(existing, key, value)
+        else:
+            db.add(PaddockObservation(paddock_id=paddock_id, farm_id=farm_id, obs_date=OBS_DATE, **_values(ndvi)))
+    db.commit()
+
+
+def _batched(db: Session, farm_id: str, paddock_ids: list[str], ndvi: float) -> None:
+    now = datetime.utcnow()
+    rows = [
+        {
+            'id': str(uuid.uuid4()),
+            'created_at': now,
+            'paddock_id': paddock_id,
+            'farm_id': farm_id,
+            'obs_date': OBS_DATE,
+            **_values(ndvi),
+        }
+        for paddock_id in paddock_ids
+    ]
+    upsert_rows(db, PaddockObservation, rows, ('paddock_id', 'obs_date'), OBSERVATION_UPDATE_COLUMNS)
+    db.commit()
+
+
+def _time(fn, db: Session, farm_id: str, paddock_ids: list[str], ndvi: float) -> float:
+    start = time.perf_counter()
+    fn(db, farm_id, paddock_ids, ndvi)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--sizes', default='10,1000,10000')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    url = args.database_url or f'sqlite:///{tmpdir.name}/bench.db'
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+
+    print(f'{"paddocks":>9} {"path":>8} {"insert ms":>10} {"update ms":>10}')
+    for size in (int(value) for value in args.sizes.split(',')):
+        with Session(engine) as db:
+            farm = Farm(name='Bench', latitude=-36.85, longitude=174.75)
+            db.add(farm)
+            db.flush()
+            paddocks = [Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=GEOM, area_ha=1.0) for i in range(size)]
+            db.add_all(paddocks)
+            db.commit()
+            paddock_ids = [paddock.id for paddock in paddocks]
+
+            for label, fn in (('legacy', _legacy), ('upsert', _batched)):
+                db.execute(delete(PaddockObservation))
+                db.commit()
+                inserted = _time(fn, db, farm.id, paddock_ids, 0.4)
+                updated = _time(fn, db, farm.id, paddock_ids, 0.5)
+                print(f'{size:>9} {label:>8} {inserted * 1000:>10.1f} {updated * 1000:>10.1f}')
+
+            db.execute(delete(PaddockObservation))
+            db.delete(farm)
+            db.commit()
+
+    engine.dispose()
+    tmpdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Per-feature flush import (the old endpoint) versus the streaming chunked import.
+
+Run from `api/`: python -m benchmarks.bench_paddock_import [--features 50000] [--workers 4] [--database-url ...]
+Writes a synthetic FeatureCollection of 20-vertex parcels to a temporary file. The legacy path json.loads the
+whole file, then adds, flushes and serializes one paddock at a time with a single commit at the end. The
+streaming path parses with ijson, validates in worker processes and bulk-inserts one chunk per commit. With
+--memory it also reports peak traced Python memory (tracemalloc slows both paths several-fold).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.schemas.paddock import PaddockOut
+from app.services.paddock_import import import_paddock_features, iter_features
+
+
+def _write_collection(path: Path, count: int) -> None:
+    with path.open('w') as target:
+        target.write('{"type": "FeatureCollection", "features": [')
+        for index in range(count):
+            lon = 170.0 + (index % 400) * 0.01
+            lat = -45.0 + (index // 400) * 0.01
+            ring = [
+                [lon + 0.004 * math.cos(2 * math.pi * k / 20), lat + 0.004 * math.sin(2 * math.pi * k / 20)]
+                for k in range(20)
+            ]
+            feature = {
+                'type': 'Feature',
+                'properties': {'name': f'Parcel {index}'},
+                'geometry': {'type': 'Polygon', 'coordinates': [ring + ring[:1]]},
+            }
+            target.write((',' if index else '') + json.dumps(feature))
+        target.write(']}')
+
+
+def _legacy(db: Session, farm_id: str, path: Path) -> int:
+    collection = json.loads(path.read_text())
+    created = []
+    for feature in collection['features']:
+        paddock = Paddock(farm_id=farm_id, name=feature['properties']['name'], geom_geojson=feature['geometry'])
+        db.add(paddock)
+        db.flush()
+        created.append(PaddockOut.model_validate(paddock).model_dump())
+    db.commit()
+    return len(created)
+
+
+def _streaming(db: Session, farm_id: str, path: Path, chunk_size: int, workers: int) -> int:
+    with path.open('rb') as upload:
+        result = import_paddock_features(
+            db, farm_id, iter_features(upload), chunk_size=chunk_size, workers=workers, keep_rows=False
+        )
+    return result.created
+
+
+def _measure(label: str, fn, db: Session, farm_id: str, count: int, memory: bool) -> None:
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    created = fn()
+    elapsed = time.perf_counter() - start
+    peak = ''
+    if memory:
+        peak = f'  peak {tracemalloc.get_traced_memory()[1] / 1e6:7.1f} MB'
+        tracemalloc.stop()
+    db.execute(delete(Paddock).where(Paddock.farm_id == farm_id))
+    db.commit()
+    print(f'{label:<10}{elapsed:8.2f} s  {count / elapsed:9.0f} features/s  created {created}{peak}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--features', type=int, default=50_000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--memory', action='store_true')
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    path = Path(tmpdir.name) / 'parcels.geojson'
+    _write_collection(path, args.features)
+    url = args.database_url or f'sqlite:///{tmpdir.name}/bench.db'
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    print(f'{args.features} features, {path.stat().st_size / 1e6:.1f} MB upload, {engine.dialect.name}')
+
+    with Session(engine) as db:
+        farm = Farm(name='Import Bench', latitude=-45.0, longitude=170.0)
+        db.add(farm)
+        db.commit()
+        farm_id = farm.id
+        _measure('legacy', lambda: _legacy(db, farm_id, path), db, farm_id, args.features, args.memory)
+        _measure(
+            'streaming',
+            lambda: _streaming(db, farm_id, path, args.chunk_size, args.workers),
+            db,
+            farm_id,
+            args.features,
+            args.memory,
+        )
+        db.delete(farm)
+        db.commit()
+
+    engine.dispose()
+    tmpdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Full-GeoJSON paddock list versus vector tiles for one map view.
+
+Run from `api/`: python -m benchmarks.bench_vector_tiles [--paddocks 5000] [--vertices 60] [--zoom 13]
+Builds a synthetic farm of paddocks with one observation each, then compares the JSON the map used to
+download (every paddock's full geometry) with the tiles covering the farm at `--zoom`: bytes on the
+wire, cold render time, and warm (memory cache) time. `--database-url` points it at PostGIS; on the
+default SQLite database there is no spatial index, so every cold tile parses every paddock's geometry.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.models.enums import QualityFlag
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.services.geometry import batch_area_hectares, geometry_bbox
+from app.services.tile_cache import tiles_covering
+from app.services.vector_tiles import get_tile_cache, paddock_tile
+
+
+def _paddocks(farm_id: str, count: int, vertices: int) -> list[dict]:
+    side = math.ceil(math.sqrt(count))
+    rows = []
+    for index in range(count):
+        lon = 174.70 + (index % side) * 0.004
+        lat = -36.90 + (index // side) * 0.004
+        ring = [
+            [lon + 0.0018 * math.cos(2 * math.pi * k / vertices), lat + 0.0018 * math.sin(2 * math.pi * k / vertices)]
+            for k in range(vertices)
+        ]
+        geometry = {'type': 'Polygon', 'coordinates': [ring + ring[:1]]}
+        rows.append({'farm_id': farm_id, 'name': f'Paddock {index}', 'geom_geojson': geometry})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paddocks', type=int, default=5000)
+    parser.add_argument('--vertices', type=int, default=60)
+    parser.add_argument('--zoom', type=int, default=13)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    get_settings().tile_cache_dir = f'{tmpdir.name}/tiles'
+    get_tile_cache.cache_clear()
+    engine = create_engine(args.database_url or f'sqlite:///{tmpdir.name}/bench.db')
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        farm = Farm(name='Tile Bench', latitude=-36.85, longitude=174.75)
+        db.add(farm)
+        db.commit()
+        rows = _paddocks(farm.id, args.paddocks, args.vertices)
+        areas = batch_area_hectares([row['geom_geojson'] for row in rows])
+        db.execute(
+            insert(Paddock),
+            [
+                {**row, 'geom': json.dumps(row['geom_geojson']), 'area_ha': float(area)}
+                for row, area in zip(rows, areas)
+            ],
+        )
+        db.commit()
+        ids = db.scalars(select(Paddock.id)).all()
+        db.execute(
+            insert(PaddockObservation),
+            [
+                {
+                    'paddock_id': paddock_id,
+                    'farm_id': farm.id,
+                    'obs_date': date(2026, 9, 1),
+                    'ndvi_mean': 0.1 + (index % 7) / 10,
+                    'quality_flag': QualityFlag.OK,
+                }
+                for index, paddock_id in enumerate(ids)
+            ],
+        )
+        db.commit()
+
+        geojson = json.dumps(
+            [{'id': paddock_id, **row} for paddock_id, row in zip(ids, rows)], separators=(',', ':')
+        ).encode()
+        tiles = sorted(tiles_covering([geometry_bbox(row['geom_geojson']) for row in rows], args.zoom))
+        print(f'{args.paddocks} paddocks x {args.vertices} vertices, {len(tiles)} tiles at z{args.zoom}')
+        print(f'{"full geojson":<18}{len(geojson) / 1e6:9.2f} MB')
+
+        for label in ('tiles cold', 'tiles warm'):
+            start = time.perf_counter()
+            size = sum(len(paddock_tile(db, args.zoom, x, y, farm.id)[0]) for x, y in tiles)
+            elapsed = time.perf_counter() - start
+            print(f'{label:<18}{size / 1e6:9.2f} MB  {elapsed * 1000:9.1f} ms  {len(tiles) / elapsed:9.0f} tiles/s')
+        db.delete(farm)
+        db.commit()
+
+    engine.dispose()
+    tmpdir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
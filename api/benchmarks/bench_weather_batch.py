@@ -0,0 +1,55 @@
+"""Farms/sec for OpenWeather refreshes: one client per call, sequential (old) vs pooled concurrent batch.
+
+Run from `api/`: python -m benchmarks.bench_weather_batch [--farms 200] [--latency 0.05]
+Uses the local stub server from the test suite, so no API key or network access is needed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.services.openweather_client import OpenWeatherClient
+from tests.stub_openweather import StubOpenWeather
+
+
+async def _sequential_fresh_clients(base_url: str, coords: list[tuple[float, float]]) -> None:
+    for lat, lon in coords:
+        async with httpx.AsyncClient(timeout=20) as client:
+            response = await client.get(f'{base_url}/forecast', params={'lat': lat, 'lon': lon, 'appid': 'key'})
+            response.raise_for_status()
+            response.json()
+
+
+async def _pooled_batch(base_url: str, coords: list[tuple[float, float]], concurrency: int) -> None:
+    client = OpenWeatherClient(base_url, 'key', max_connections=concurrency, max_concurrency=concurrency)
+    try:
+        await asyncio.gather(*(client.forecast(lat, lon) for lat, lon in coords))
+    finally:
+        await client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--farms', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--concurrency', type=int, default=10)
+    args = parser.parse_args()
+
+    coords = [(-36.8 - i / 1000, 174.7 + i / 1000) for i in range(args.farms)]
+    with StubOpenWeather(latency=args.latency) as stub:
+        for label, run in (
+            ('sequential, new client per farm', lambda: _sequential_fresh_clients(stub.base_url, coords)),
+            (f'pooled batch, concurrency={args.concurrency}', lambda: _pooled_batch(stub.base_url, coords, args.concurrency)),
+        ):
+            stub.connections.clear()
+            start = time.perf_counter()
+            asyncio.run(run())
+            elapsed = time.perf_counter() - start
+            print(f'{label:<36} {args.farms / elapsed:8.1f} farms/s  connections={len(stub.connections)}')
+
+
+if __name__ == '__main__':
+    main()
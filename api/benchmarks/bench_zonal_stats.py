@@ -0,0 +1,69 @@
+"""Throughput of the NDVI zonal-statistics engine on a synthetic scene.
+
+Run from `api/`: python -m benchmarks.bench_zonal_stats [--size 4096] [--paddocks 500]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.raster import RasterGrid
+from app.services.zonal_stats import compute_ndvi, polygon_pixel_indices, zonal_ndvi_stats
+
+
+def _paddocks(grid: RasterGrid, count: int, rng: np.random.Generator) -> list[dict]:
+    a, _, c, _, e, f = grid.transform
+    geoms = []
+    for _ in range(count):
+        col, row = rng.uniform(0, grid.width - 60), rng.uniform(0, grid.height - 60)
+        w, h = rng.uniform(10, 60, size=2)
+        lon0, lat0 = c + col * a, f + row * e
+        lon1, lat1 = lon0 + w * a, lat0 + h * e
+        geoms.append(
+            {
+                'type': 'Polygon',
+                'coordinates': [[[lon0, lat1], [lon1, lat1], [lon1, lat0], [lon0 + w * a / 2, lat0], [lon0, lat1]]],
+            }
+        )
+    return geoms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=4096)
+    parser.add_argument('--paddocks', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    grid = RasterGrid('EPSG:4326', (0.0001, 0.0, 174.0, 0.0, -0.0001, -36.0), args.size, args.size)
+    red = rng.integers(200, 1500, size=(args.size, args.size), dtype=np.uint16)
+    nir = rng.integers(1500, 4000, size=(args.size, args.size), dtype=np.uint16)
+    mask = (rng.random((args.size, args.size)) < 0.05).astype(np.uint8)
+    geoms = _paddocks(grid, args.paddocks, rng)
+    megapixels = args.size * args.size / 1e6
+
+    start = time.perf_counter()
+    ndvi = compute_ndvi(red, nir, mask)
+    ndvi_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    zones = [polygon_pixel_indices(grid, geom) for geom in geoms]
+    rasterize_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    zonal_ndvi_stats(ndvi, zones)
+    stats_s = time.perf_counter() - start
+
+    total = ndvi_s + rasterize_s + stats_s
+    zone_pixels = sum(len(zone) for zone in zones) / 1e6
+    print(f'scene: {args.size}x{args.size} ({megapixels:.1f} MP), paddocks: {args.paddocks}')
+    print(f'ndvi:       {ndvi_s * 1000:8.1f} ms  {megapixels / ndvi_s:8.1f} MP/s')
+    print(f'rasterize:  {rasterize_s * 1000:8.1f} ms  {args.paddocks / rasterize_s:8.0f} paddocks/s')
+    print(f'zonal:      {stats_s * 1000:8.1f} ms  {zone_pixels / stats_s:8.1f} MP/s of paddock pixels')
+    print(f'end-to-end: {total * 1000:8.1f} ms  {args.paddocks / total:8.0f} paddocks/s  {megapixels / total:8.1f} MP/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.session import get_async_db, get_db
+from app.main import app
+from app.workers import tasks
+from app.workers.celery_app import celery_app
+
+# A ~200 x 220 m paddock near Auckland, inside the synthetic scenes' footprint.
+SQUARE = {'type': 'Polygon', 'coordinates': [[[174.75, -36.85], [174.752, -36.85], [174.752, -36.848], [174.75, -36.85]]]}
+
+
+@pytest.fixture()
+def engine() -> Generator[Engine, None, None]:
+    # StaticPool keeps one in-memory database shared by every session the test opens.
+    engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def session_factory(engine) -> sessionmaker:
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture()
+def db(session_factory) -> Generator[Session, None, None]:
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def client(session_factory) -> Generator[TestClient, None, None]:
+    """The API with `get_db` bound to the test database."""
+
+    def override():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def eager_tasks(monkeypatch, session_factory) -> None:
+    """Run Celery tasks inline, in sessions on the test database."""
+    monkeypatch.setattr(tasks, 'SessionLocal', session_factory)
+    monkeypatch.setitem(celery_app.conf, 'task_always_eager', True)
+
+
+@pytest.fixture()
+def async_session_factory() -> Generator[async_sessionmaker, None, None]:
+    # One shared aiosqlite connection keeps the in-memory database alive across asyncio.run calls.
+    async_engine = create_async_engine('sqlite+aiosqlite://', poolclass=StaticPool)
+
+    async def create_schema() -> None:
+        async with async_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_schema())
+    yield async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture()
+def async_client(async_session_factory) -> Generator[TestClient, None, None]:
+    """The API with `get_async_db` bound to the async test database."""
+
+    async def override():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def object_store(tmp_path, monkeypatch) -> str:
+    root = tmp_path / 'object_store'
+    monkeypatch.setattr(get_settings(), 'object_store_root', str(root))
+    return str(root)
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch) -> Generator[None, None, None]:
+    from app.services.forecast_cache import forecast_cache
+    from app.services.mask_cache import get_mask_cache
+    from app.services.ndvi_tiles import get_ndvi_tile_cache
+    from app.services.thresholds import threshold_cache
+    from app.services.vector_tiles import get_tile_cache
+
+    monkeypatch.setattr(get_settings(), 'mask_cache_dir', str(tmp_path / 'mask_cache'))
+    monkeypatch.setattr(get_settings(), 'tile_cache_dir', str(tmp_path / 'tile_cache'))
+    monkeypatch.setattr(get_settings(), 'ndvi_tile_cache_dir', str(tmp_path / 'ndvi_tile_cache'))
+    get_mask_cache.cache_clear()
+    get_tile_cache.cache_clear()
+    get_ndvi_tile_cache.cache_clear()
+    threshold_cache.invalidate()
+    forecast_cache.clear()
+    yield
+    get_mask_cache.cache_clear()
+    get_tile_cache.cache_clear()
+    get_ndvi_tile_cache.cache_clear()
+    threshold_cache.invalidate()
+    forecast_cache.clear()
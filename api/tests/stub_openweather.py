@@ -0,0 +1,68 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StubOpenWeather:
+    """Minimal local stand-in for the OpenWeather /forecast endpoint."""
+
+    def __init__(self, latency: float = 0.0, fail_first: int = 0, retry_after: str | None = None) -> None:
+        self.latency = latency
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.requests: list[dict] = []
+        self.connections: set[int] = set()
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self) -> None:  # noqa: N802
+                query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                with stub._lock:
+                    stub.requests.append(query)
+                    stub.connections.add(self.client_address[1])
+                    failing = len(stub.requests) <= stub.fail_first
+                if stub.latency:
+                    time.sleep(stub.latency)
+                body = b'{}' if failing else json.dumps(stub.payload()).encode()
+                self.send_response(503 if failing else 200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                if failing and stub.retry_after:
+                    self.send_header('Retry-After', stub.retry_after)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    @staticmethod
+    def payload() -> dict:
+        start = 1_767_225_600  # 2026-01-01T00:00:00Z
+        return {
+            'list': [
+                {
+                    'dt': start + i * 3 * 3600,
+                    'main': {'temp_min': 10.0 + i % 8, 'temp_max': 18.0 + i % 8},
+                    'wind': {'speed': 3.0},
+                    'rain': {'3h': 1.5},
+                }
+                for i in range(40)
+            ]
+        }
+
+    def __enter__(self) -> 'StubOpenWeather':
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,57 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.db.session import async_database_url
+from app.models.enums import JobStatus
+from app.models.farm import Farm
+from app.models.job_run import JobRun
+from app.models.paddock import Paddock
+from app.models.weather_daily import WeatherDaily
+from app.services.weather_service import fetch_weather_forecast_async
+from tests.conftest import SQUARE
+
+
+async def _seed_farm(session_factory, paddocks: int = 3) -> str:
+    async with session_factory() as db:
+        farm = Farm(name='Async Farm', latitude=-36.85, longitude=174.75)
+        db.add(farm)
+        await db.flush()
+        db.add_all([Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=SQUARE, area_ha=1.0) for i in range(paddocks)])
+        await db.commit()
+        return farm.id
+
+
+def test_async_database_url_swaps_in_async_drivers() -> None:
+    assert async_database_url('postgresql://u:p@db:5432/farms') == 'postgresql+psycopg://u:p@db:5432/farms'
+    assert async_database_url('sqlite:///./farms.db') == 'sqlite+aiosqlite:///./farms.db'
+
+
+def test_async_weather_fetch_records_its_job(async_session_factory) -> None:
+    async def run() -> None:
+        farm_id = await _seed_farm(async_session_factory)
+        async with async_session_factory() as db:
+            weather = await fetch_weather_forecast_async(db, farm_id)
+            assert len(weather) == 7
+
+            job = await db.scalar(select(JobRun))
+            assert job.status == JobStatus.success
+            assert job.stats_json['rows_upserted'] == 7
+
+    asyncio.run(run())
+
+
+def test_forecast_endpoint_uses_async_session(async_client, async_session_factory) -> None:
+    farm_id = asyncio.run(_seed_farm(async_session_factory, paddocks=0))
+
+    first = async_client.get(f'/api/v1/farms/{farm_id}/weather/forecast')
+    second = async_client.get(f'/api/v1/farms/{farm_id}/weather/forecast')
+
+    assert first.status_code == 200
+    assert first.json()['meta']['count'] == second.json()['meta']['count'] == 7
+
+    async def weather_rows() -> int:
+        async with async_session_factory() as db:
+            return await db.scalar(select(func.count()).select_from(WeatherDaily))
+
+    assert asyncio.run(weather_rows()) == 7
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.services.data_version import etag_matches
+from app.services.pipeline_service import ingest_satellite_scenes
+from app.services.recommendation_service import generate_weekly_recommendations
+from tests.conftest import SQUARE
+
+
+@pytest.fixture()
+def farm_id(db) -> str:
+    farm = Farm(name='Polled Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    db.add_all([Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=SQUARE, area_ha=1.0) for i in range(2)])
+    db.commit()
+    ingest_satellite_scenes(db, farm.id)
+    generate_weekly_recommendations(db, farm.id)
+    return farm.id
+
+
+def _revalidate(client, path: str) -> tuple:
+    first = client.get(path)
+    return first, client.get(path, headers={'If-None-Match': first.headers['etag']})
+
+
+def test_unchanged_data_is_answered_with_304_from_one_version_lookup(client, engine, farm_id) -> None:
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    path = f'/api/v1/farms/{farm_id}/recommendations/latest'
+
+    first = client.get(path)
+    statements.clear()
+    second = client.get(path, headers={'If-None-Match': f'"other", {first.headers["etag"]}'})
+
+    assert first.status_code == 200
+    assert first.headers['cache-control'] == 'private, no-cache'
+    assert second.status_code == 304
+    assert second.content == b''
+    assert second.headers['etag'] == first.headers['etag']
+    assert len(statements) == 1 and 'data_version' in statements[0]
+
+
+def test_writes_bump_the_version_and_change_the_etag(client, db, farm_id) -> None:
+    dates_path = f'/api/v1/farms/{farm_id}/observations/dates'
+    first, unchanged = _revalidate(client, dates_path)
+    day = first.json()['data']['dates'][0]
+    by_date, _ = _revalidate(client, f'/api/v1/farms/{farm_id}/observations?date={day}')
+    assert unchanged.status_code == 304
+    assert by_date.headers['etag'] != first.headers['etag']
+
+    paddock_id = by_date.json()['data'][0]['paddock_id']
+    client.patch(f'/api/v1/paddocks/{paddock_id}', json={'name': 'Renamed'})
+    renamed = client.get(
+        f'/api/v1/farms/{farm_id}/observations?date={day}', headers={'If-None-Match': by_date.headers['etag']}
+    )
+    assert renamed.status_code == 200
+    assert 'Renamed' in {row['paddock_name'] for row in renamed.json()['data']}
+
+    rec_path = f'/api/v1/farms/{farm_id}/recommendations/latest'
+    etag = client.get(rec_path).headers['etag']
+    generate_weekly_recommendations(db, farm_id)
+    assert client.get(rec_path, headers={'If-None-Match': etag}).status_code == 200
+    ingest_satellite_scenes(db, farm_id)
+    assert client.get(dates_path, headers={'If-None-Match': renamed.headers['etag']}).status_code == 200
+
+
+def test_unknown_farms_get_no_etag(client) -> None:
+    response = client.get('/api/v1/farms/missing/observations/dates')
+    assert response.status_code == 200
+    assert 'etag' not in response.headers
+
+
+def test_forecast_revalidates_after_the_first_fetch(async_client, async_session_factory) -> None:
+    async def seed() -> str:
+        async with async_session_factory() as db:
+            farm = Farm(name='Weather Farm', latitude=-36.85, longitude=174.75)
+            db.add(farm)
+            await db.commit()
+            return farm.id
+
+    path = f'/api/v1/farms/{asyncio.run(seed())}/weather/forecast'
+    fetched = async_client.get(path)
+    stored, unchanged = _revalidate(async_client, path)
+
+    # The first request stores the forecast, which moves the version on before it responds.
+    assert 'etag' not in fetched.headers
+    assert stored.json() == fetched.json()
+    assert unchanged.status_code == 304
+
+
+def test_if_none_match_parsing() -> None:
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches('*', '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
@@ -0,0 +1,86 @@
+import asyncio
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.models.farm import Farm
+from app.models.weather_daily import WeatherDaily
+from app.services.forecast_cache import ForecastCache, forecast_cache
+from app.services.openweather_client import close_openweather_client
+from app.services.weather_service import _store_forecast, fetch_weather_forecasts
+from tests.stub_openweather import StubOpenWeather
+
+
+def _forecast(start: date, rain_mm: float = 1.0) -> list[dict]:
+    return [
+        {
+            'date': start + timedelta(days=i),
+            'rain_mm': rain_mm,
+            'temp_min_c': 5.0,
+            'temp_max_c': 15.0,
+            'wind_kph': 10.0,
+            'source': 'openweather',
+        }
+        for i in range(7)
+    ]
+
+
+def test_neighbouring_farms_share_one_upstream_fetch(db, monkeypatch) -> None:
+    farms = [
+        Farm(name='North', latitude=-36.81, longitude=174.71),
+        Farm(name='Next door', latitude=-36.83, longitude=174.74),
+        Farm(name='Far away', latitude=-45.02, longitude=168.69),
+    ]
+    db.add_all(farms)
+    db.commit()
+
+    async def run() -> dict:
+        try:
+            return await fetch_weather_forecasts(db, [farm.id for farm in farms])
+        finally:
+            await close_openweather_client()
+
+    with StubOpenWeather(latency=0.02) as stub:
+        monkeypatch.setattr(get_settings(), 'openweather_api_key', 'key')
+        monkeypatch.setattr(get_settings(), 'openweather_base_url', stub.base_url)
+        first = asyncio.run(run())
+        second = asyncio.run(run())
+
+    assert len(stub.requests) == 2
+    assert set(first['refreshed']) == set(second['refreshed']) == {farm.id for farm in farms}
+    assert forecast_cache.stats()['cells'] == 2
+
+
+def test_cache_expires_after_ttl() -> None:
+    cache = ForecastCache(cell_degrees=0.1, ttl_seconds=0.0)
+    calls: list[tuple[float, float]] = []
+
+    async def fetch(lat: float, lon: float) -> list[dict]:
+        calls.append((lat, lon))
+        return []
+
+    asyncio.run(cache.get_or_fetch(-36.81, 174.71, fetch))
+    asyncio.run(cache.get_or_fetch(-36.82, 174.72, fetch))
+
+    assert calls == [(-36.85, 174.75), (-36.85, 174.75)]
+
+
+def test_store_forecast_upserts_by_day(db) -> None:
+    farm = Farm(name='Upsert', latitude=-36.8, longitude=174.7)
+    db.add(farm)
+    db.commit()
+    today = date.today()
+
+    _store_forecast(db, farm.id, _forecast(today))
+    db.commit()
+    ids_before = {row.date: row.id for row in db.scalars(select(WeatherDaily))}
+
+    _store_forecast(db, farm.id, _forecast(today + timedelta(days=1), rain_mm=3.0))
+    db.commit()
+    db.expire_all()
+    rows = db.scalars(select(WeatherDaily).order_by(WeatherDaily.date)).all()
+
+    assert [row.date for row in rows] == [today + timedelta(days=i) for i in range(1, 8)]
+    assert {row.rain_mm for row in rows} == {3.0}
+    assert all(ids_before.get(row.date, row.id) == row.id for row in rows)
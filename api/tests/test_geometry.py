@@ -1,4 +1,16 @@
-from app.services.geometry import polygon_area_hectares
+import numpy as np
+import pytest
+
+from app.services.geometry import (
+    batch_area_hectares,
+    batch_centroids,
+    bbox_polygon,
+    geometries_intersect,
+    pack_rings,
+    polygon_area_hectares,
+    polygon_centroid,
+)
+from app.services.projection import WGS84_A, WGS84_E2
 
 
 def test_polygon_area_hectares_is_positive() -> None:
@@ -17,3 +29,95 @@ def test_polygon_area_hectares_is_positive() -> None:
 
     area = polygon_area_hectares(geom)
     assert area > 0.0
+
+
+def test_polygon_area_is_geodesic_not_web_mercator() -> None:
+    # 0.002 deg square at -36.85: ~222 m east-west * ~178 m north-south, not the ~1.6x larger Mercator figure.
+    geom = {
+        'type': 'Polygon',
+        'coordinates': [[[174.75, -36.85], [174.752, -36.85], [174.752, -36.848], [174.75, -36.848], [174.75, -36.85]]],
+    }
+
+    assert polygon_area_hectares(geom) == pytest.approx(3.95, rel=0.01)
+
+
+def test_polygon_area_subtracts_holes() -> None:
+    outer = [[0.0, 0.0], [0.01, 0.0], [0.01, 0.01], [0.0, 0.01], [0.0, 0.0]]
+    hole = [[0.0025, 0.0025], [0.0025, 0.0075], [0.0075, 0.0075], [0.0075, 0.0025], [0.0025, 0.0025]]
+
+    full = polygon_area_hectares({'type': 'Polygon', 'coordinates': [outer]})
+    holed = polygon_area_hectares({'type': 'Polygon', 'coordinates': [outer, hole]})
+
+    assert holed == pytest.approx(full * 0.75, rel=1e-6)
+
+
+def test_geometries_intersect_crossing_containment_and_holes() -> None:
+    square = bbox_polygon((0.0, 0.0, 1.0, 1.0))
+    donut = {
+        'type': 'Polygon',
+        'coordinates': [
+            [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]],
+            [[0.2, 0.2], [0.2, 0.8], [0.8, 0.8], [0.8, 0.2], [0.2, 0.2]],
+        ],
+    }
+    far = bbox_polygon((5.0, 5.0, 6.0, 6.0))
+    multi = {'type': 'MultiPolygon', 'coordinates': [far['coordinates'], square['coordinates']]}
+
+    assert geometries_intersect(square, bbox_polygon((0.5, 0.5, 2.0, 2.0)))
+    assert geometries_intersect(square, bbox_polygon((0.4, 0.4, 0.6, 0.6)))
+    assert geometries_intersect(square, bbox_polygon((1.0, 0.0, 2.0, 1.0)))
+    assert not geometries_intersect(square, bbox_polygon((1.5, 1.5, 2.0, 2.0)))
+    assert not geometries_intersect(donut, bbox_polygon((0.4, 0.4, 0.6, 0.6)))
+    assert geometries_intersect(multi, bbox_polygon((0.4, 0.4, 0.6, 0.6)))
+
+
+def _ellipsoid_cell_hectares(lon0: float, lat0: float, lon1: float, lat1: float) -> float:
+    # Integrate the WGS84 area element M * N * cos(phi) numerically, independently of the authalic formulas.
+    phi = np.radians(np.linspace(lat0, lat1, 200_001))
+    element = WGS84_A**2 * (1.0 - WGS84_E2) * np.cos(phi) / (1.0 - WGS84_E2 * np.sin(phi) ** 2) ** 2
+    return float(np.trapezoid(element, phi) * np.radians(lon1 - lon0) / 10_000.0)
+
+
+@pytest.mark.parametrize('lat0', [-89.0, -78.0, 60.0, 70.0, 85.0])
+def test_batch_area_matches_the_ellipsoid_at_high_latitudes(lat0) -> None:
+    cells = [(10.0, lat0, 10.0 + width, lat0 + width) for width in (0.001, 0.05, 1.0)]
+
+    areas = batch_area_hectares([bbox_polygon(cell) for cell in cells])
+
+    expected = [_ellipsoid_cell_hectares(*cell) for cell in cells]
+    np.testing.assert_allclose(areas, expected, rtol=1e-9)
+
+
+def test_batch_matches_single_calls_with_multipolygons_and_antimeridian() -> None:
+    west = bbox_polygon((179.9, 64.0, 180.0, 64.1))
+    east = bbox_polygon((-180.0, 64.0, -179.9, 64.1))
+    spanning = {
+        'type': 'Polygon',
+        'coordinates': [[[179.9, 64.0], [-179.9, 64.0], [-179.9, 64.1], [179.9, 64.1], [179.9, 64.0]]],
+    }
+    multi = {'type': 'MultiPolygon', 'coordinates': [west['coordinates'], east['coordinates']]}
+    geometries = [west, spanning, {'type': 'Polygon', 'coordinates': []}, multi]
+
+    areas = batch_area_hectares(pack_rings(geometries))
+
+    assert areas.tolist() == pytest.approx([polygon_area_hectares(geom) for geom in geometries])
+    assert areas[2] == 0.0
+    assert areas[1] == pytest.approx(2 * areas[0], rel=1e-9)
+    assert areas[3] == pytest.approx(areas[1], rel=1e-9)
+    assert polygon_centroid(spanning)[0] == pytest.approx(-180.0, abs=1e-9)
+
+
+def test_centroids_are_area_weighted() -> None:
+    # An L of three 0.01 deg cells at the equator: the vertex mean is (0.01, 0.01), the centroid (0.0083, 0.0083).
+    l_ring = [[0, 0], [0.02, 0], [0.02, 0.01], [0.01, 0.01], [0.01, 0.02], [0, 0.02], [0, 0]]
+    l_shape = {'type': 'Polygon', 'coordinates': [l_ring]}
+    outer = [[0.0, 0.0], [0.03, 0.0], [0.03, 0.03], [0.0, 0.03], [0.0, 0.0]]
+    hole = [[0.0, 0.0], [0.0, 0.03], [0.01, 0.03], [0.01, 0.0], [0.0, 0.0]]
+    band = bbox_polygon((0.0, 60.0, 1.0, 80.0))
+
+    centroids = batch_centroids([l_shape, {'type': 'Polygon', 'coordinates': [outer, hole]}, band])
+
+    np.testing.assert_allclose(centroids[0], [0.025 / 3, 0.025 / 3], atol=1e-6)
+    np.testing.assert_allclose(centroids[1], [0.02, 0.015], atol=1e-6)
+    assert centroids[2][0] == pytest.approx(0.5)
+    assert 60.0 < centroids[2][1] < 69.0
@@ -0,0 +1,40 @@
+from sqlalchemy import event, func, select
+
+from app.models.farm import Farm
+from app.models.job_run import JobRun
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.models.satellite_scene import SatelliteScene
+from app.services.pipeline_service import SCENE_OFFSETS_DAYS, ingest_satellite_scenes
+from tests.conftest import SQUARE
+
+
+def test_ingest_is_one_transaction_and_one_job_per_farm(db) -> None:
+    farm = Farm(name='Test Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    db.add_all([Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=SQUARE, area_ha=1.0) for i in range(4)])
+    db.commit()
+
+    commits = []
+    statements = []
+    event.listen(db, 'after_commit', lambda session: commits.append(1))
+    event.listen(db.get_bind(), 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    scenes = ingest_satellite_scenes(db, farm.id)
+    assert len(scenes) == len(SCENE_OFFSETS_DAYS)
+    assert len(commits) == 2
+    assert sum('FROM satellite_scenes' in sql for sql in statements) == 1
+    assert sum('FROM paddocks' in sql for sql in statements) == 1
+
+    commits.clear()
+    ingest_satellite_scenes(db, farm.id)
+    assert len(commits) == 2
+
+    assert db.scalar(select(func.count()).select_from(SatelliteScene)) == len(SCENE_OFFSETS_DAYS)
+    assert db.scalar(select(func.count()).select_from(PaddockObservation)) == 4 * len(SCENE_OFFSETS_DAYS)
+    runs = db.scalars(select(JobRun).order_by(JobRun.started_at)).all()
+    assert len(runs) == 2
+    assert runs[0].stats_json['scenes_created'] == len(SCENE_OFFSETS_DAYS)
+    assert runs[1].stats_json['scenes_created'] == 0
+    assert runs[1].stats_json['rows_upserted'] == 4 * len(SCENE_OFFSETS_DAYS)
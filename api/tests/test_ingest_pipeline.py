@@ -0,0 +1,58 @@
+import pytest
+
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.services.job_runs import PIPELINE_STAGES, start_pipeline_run
+from app.workers import tasks
+from tests.conftest import SQUARE
+
+pytestmark = pytest.mark.usefixtures('eager_tasks')
+
+
+@pytest.fixture()
+def farm_id(db) -> str:
+    farm = Farm(name='Pipeline Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    db.add_all([Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=SQUARE, area_ha=1.0) for i in range(2)])
+    db.commit()
+    return farm.id
+
+
+def test_ingest_enqueues_chain_and_reports_stages(client, farm_id) -> None:
+    response = client.post(f'/api/v1/farms/{farm_id}/jobs/ingest')
+    assert response.status_code == 202
+    run_id = response.json()['data']['run_id']
+
+    run = client.get(f'/api/v1/jobs/runs/{run_id}').json()['data']
+    assert run['job_type'] == 'ingest_pipeline'
+    assert run['status'] == 'success'
+    assert run['done'] is True
+    assert run['progress'] == 1.0
+    assert [stage['name'] for stage in run['stages']] == list(PIPELINE_STAGES)
+    assert all(stage['status'] == 'success' for stage in run['stages'])
+    assert run['stages'][1]['days'] == 7
+    assert run['stages'][2]['recommendation_id']
+
+
+def test_failed_stage_fails_the_run(client, db, farm_id, monkeypatch) -> None:
+    def broken(*args, **kwargs):
+        raise RuntimeError('weather provider down')
+
+    monkeypatch.setattr(tasks, 'fetch_weather_forecast', broken)
+    run_id = start_pipeline_run(db, farm_id).id
+    # Eager chains re-raise stage errors; on a worker the chain just stops here.
+    with pytest.raises(RuntimeError):
+        tasks.enqueue_ingest_pipeline(farm_id, run_id)
+
+    run = client.get(f'/api/v1/jobs/runs/{run_id}').json()['data']
+    statuses = {stage['name']: stage['status'] for stage in run['stages']}
+    assert run['status'] == 'failed'
+    assert run['error'] == 'weather provider down'
+    assert statuses == {'ingest_satellite': 'success', 'fetch_weather': 'failed', 'generate_recommendations': 'pending'}
+    assert run['progress'] == pytest.approx(1 / 3, abs=1e-3)
+
+
+def test_unknown_farm_and_run_are_404(client) -> None:
+    assert client.post('/api/v1/farms/missing/jobs/ingest').status_code == 404
+    assert client.get('/api/v1/jobs/runs/missing').status_code == 404
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text
+
+from app.models.enums import JobStatus, JobType
+from app.models.farm import Farm
+from app.models.job_run import JobRun
+from app.models.paddock import Paddock
+from app.services.instrumentation import JobInstrumentation
+from app.services.pipeline_service import ingest_satellite_scenes
+from app.services.recommendation_service import generate_weekly_recommendations
+from app.services.weather_service import fetch_weather_forecast
+from tests.conftest import SQUARE
+
+
+def test_statements_are_counted_per_context(engine) -> None:
+    def other_thread() -> None:
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+
+    with engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+        with JobInstrumentation() as metrics:
+            with metrics.stage('first'):
+                connection.execute(text('SELECT 1'))
+                connection.execute(text('SELECT 2'))
+                thread = threading.Thread(target=other_thread)
+                thread.start()
+                thread.join()
+            with metrics.stage('second'):
+                connection.execute(text('SELECT 3'))
+        connection.execute(text('SELECT 4'))
+
+    stats = metrics.stats()
+    assert stats['sql_statements'] == 3
+    assert stats['timings']['first']['sql_statements'] == 2
+    assert stats['timings']['second']['sql_statements'] == 1
+    assert stats['peak_rss_mb'] > 0
+
+
+def test_every_job_records_instrumented_stats(db) -> None:
+    farm = Farm(name='Instrumented', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    db.add_all([Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=SQUARE, area_ha=1.0) for i in range(3)])
+    db.commit()
+
+    ingest_satellite_scenes(db, farm.id)
+    asyncio.run(fetch_weather_forecast(db, farm.id))
+    generate_weekly_recommendations(db, farm.id)
+
+    runs = {run.job_type: run for run in db.scalars(select(JobRun))}
+    assert set(runs) == {JobType.ingest_satellite, JobType.fetch_weather, JobType.generate_recommendations}
+    for run in runs.values():
+        assert run.status == JobStatus.success
+        assert run.stats_json['wall_s'] >= 0
+        assert run.stats_json['sql_statements'] >= sum(
+            stage['sql_statements'] for stage in run.stats_json['timings'].values()
+        )
+
+    ingest = runs[JobType.ingest_satellite].stats_json
+    assert set(ingest['timings']) == {'register_scenes', 'load_paddocks', 'measure', 'upsert'}
+    assert ingest['rows_upserted'] == 9
+    assert runs[JobType.fetch_weather].stats_json['rows_upserted'] == 7
+    assert runs[JobType.generate_recommendations].stats_json['rows_written'] == 4
+
+
+def test_run_stats_endpoint_reports_percentiles(client, db) -> None:
+    now = datetime.utcnow()
+    for seconds in range(1, 21):
+        db.add(
+            JobRun(
+                job_type=JobType.fetch_weather,
+                status=JobStatus.failed if seconds == 20 else JobStatus.success,
+                started_at=now - timedelta(minutes=5),
+                finished_at=now - timedelta(minutes=5) + timedelta(seconds=seconds),
+                stats_json={},
+            )
+        )
+    db.add(JobRun(job_type=JobType.ingest_satellite, status=JobStatus.running, started_at=now, stats_json={}))
+    db.add(
+        JobRun(
+            job_type=JobType.ingest_satellite,
+            status=JobStatus.success,
+            started_at=now - timedelta(days=30),
+            finished_at=now - timedelta(days=30) + timedelta(seconds=3),
+            stats_json={},
+        )
+    )
+    db.commit()
+
+    response = client.get('/api/v1/jobs/runs/stats')
+
+    assert response.status_code == 200
+    assert response.json()['data'] == [
+        {'job_type': 'fetch_weather', 'count': 20, 'failed': 1, 'p50_s': 10.5, 'p95_s': 19.05, 'max_s': 20.0}
+    ]
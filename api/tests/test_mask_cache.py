@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+
+from app.api.v1.paddocks import update_paddock
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.schemas.paddock import PaddockUpdate
+from app.services.disk_cache import DiskLRUCache
+from app.services.mask_cache import paddock_masks, to_window_indices
+from app.services.raster import PixelWindow, RasterGrid
+from app.services.zonal_stats import polygon_pixel_indices
+
+GRID = RasterGrid(crs='EPSG:4326', transform=(0.0001, 0.0, 174.70, 0.0, -0.0001, -36.80), width=1000, height=1000)
+
+
+def _square(lon: float, lat: float, size: float = 0.002) -> dict:
+    ring = [[lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat]]
+    return {'type': 'Polygon', 'coordinates': [ring]}
+
+
+def test_repeat_lookups_hit_cache_and_geometry_edit_invalidates(db) -> None:
+    farm = Farm(name='Test Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    paddock = Paddock(farm_id=farm.id, name='A', geom_geojson=_square(174.75, -36.851), area_ha=4.4)
+    db.add(paddock)
+    db.commit()
+
+    first, hits = paddock_masks(GRID, [paddock])
+    assert hits == 0
+    assert np.array_equal(first[0], polygon_pixel_indices(GRID, paddock.geom_geojson))
+    again, hits = paddock_masks(GRID, [paddock])
+    assert hits == 1
+    assert np.array_equal(again[0], first[0])
+
+    update_paddock(paddock.id, PaddockUpdate(name='Renamed'), db)
+    assert paddock_masks(GRID, [paddock])[1] == 1
+
+    update_paddock(paddock.id, PaddockUpdate(geom_geojson=_square(174.76, -36.851)), db)
+    moved, hits = paddock_masks(GRID, [paddock])
+    assert hits == 0
+    assert not np.array_equal(moved[0], first[0])
+
+
+def test_to_window_indices_translates_full_grid_indices() -> None:
+    indices = np.array([0, 1001, 2005, 999_999])
+    window = PixelWindow(col_off=1, row_off=1, width=10, height=5)
+    assert to_window_indices(indices, GRID, window).tolist() == [0, 14]
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = DiskLRUCache(tmp_path, max_bytes=250)
+    cache.put('a', b'x' * 100)
+    cache.put('b', b'x' * 100)
+    os.utime(tmp_path / 'a', (1, 1))
+    os.utime(tmp_path / 'b', (2, 2))
+    assert cache.get('a') is not None
+    cache.put('c', b'x' * 100)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
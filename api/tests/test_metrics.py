@@ -0,0 +1,57 @@
+import app.workers.metrics  # noqa: F401 - connects the Celery task signals
+
+from app.core.metrics import Gauge, Histogram, Registry, registry
+from app.models.farm import Farm
+from app.workers import tasks
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    local = Registry()
+    histogram = local.register(Histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1.0)))
+    gauge = local.register(Gauge('depth', 'Depth.'))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(('/a"b',), value)
+    gauge.set_function((), lambda: 4)
+
+    assert local.render().splitlines() == [
+        '# HELP latency_seconds Latency.',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a\\"b",le="1"} 3',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a\\"b"} 3.65',
+        'latency_seconds_count{route="/a\\"b"} 4',
+        '# HELP depth Depth.',
+        '# TYPE depth gauge',
+        'depth 4',
+    ]
+
+
+def test_requests_are_recorded_by_route_template(client) -> None:
+    registry.clear()
+    client.get('/api/v1/jobs/runs/first-missing')
+    client.get('/api/v1/jobs/runs/second-missing')
+    client.get('/api/v1/jobs/runs')
+    body = client.get('/metrics').text
+
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/jobs/runs/{run_id}",status="404"} 2' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/jobs/runs",status="200"} 1' in body
+    assert 'http_request_sql_statements_sum{method="GET",route="/api/v1/jobs/runs/{run_id}"} 2' in body
+    assert 'http_response_size_bytes_count{method="GET",route="/api/v1/jobs/runs"} 1' in body
+    assert 'http_requests_in_flight 1' in body  # the scrape itself
+    assert '# TYPE db_pool_checked_out gauge' in body
+
+
+def test_celery_task_durations_are_recorded(db, session_factory, monkeypatch) -> None:
+    registry.clear()
+    monkeypatch.setattr(tasks, 'SessionLocal', session_factory)
+    farm = Farm(name='Metrics Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.commit()
+
+    tasks.fetch_weather_forecast_task.apply(args=(farm.id,))
+
+    assert (
+        'celery_task_duration_seconds_count{task="app.workers.tasks.fetch_weather_forecast_task",state="SUCCESS"} 1'
+        in registry.render()
+    )
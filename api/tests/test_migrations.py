@@ -0,0 +1,151 @@
+import argparse
+from datetime import date
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+from app.db.base import Base
+from app.db.spatial import autogenerate_filter
+
+API_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture()
+def database_url(tmp_path) -> str:
+    return f'sqlite:///{tmp_path / "migrations.db"}'
+
+
+def _config(database_url: str, *x_args: str) -> Config:
+    config = Config(str(API_ROOT / 'alembic.ini'))
+    config.set_main_option('script_location', str(API_ROOT / 'alembic'))
+    config.set_main_option('sqlalchemy.url', database_url)
+    config.attributes['configure_logger'] = False
+    config.cmd_opts = argparse.Namespace(x=list(x_args))
+    return config
+
+
+def test_migrations_build_the_model_schema(database_url) -> None:
+    command.upgrade(_config(database_url), 'head')
+
+    engine = create_engine(database_url)
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={'include_object': autogenerate_filter('sqlite')})
+        diff = compare_metadata(context, Base.metadata)
+    engine.dispose()
+    assert diff == []
+
+
+def test_farm_id_backfill_runs_in_batches_and_downgrades(database_url) -> None:
+    command.upgrade(_config(database_url), '0001')
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        for farm in ('farm-a', 'farm-b'):
+            connection.execute(
+                text(
+                    'INSERT INTO farms (id, name, latitude, longitude, created_at) '
+                    "VALUES (:id, :id, 0, 0, '2026-01-01')"
+                ),
+                {'id': farm},
+            )
+            connection.execute(
+                text(
+                    'INSERT INTO paddocks (id, farm_id, name, geom_geojson, area_ha, created_at) '
+                    "VALUES (:id, :farm, :id, '{}', 1.0, '2026-01-01')"
+                ),
+                {'id': f'{farm}-paddock', 'farm': farm},
+            )
+            for day in range(1, 6):
+                connection.execute(
+                    text(
+                        'INSERT INTO paddock_observations '
+                        '(id, paddock_id, obs_date, ndvi_mean, quality_flag, created_at) '
+                        "VALUES (:id, :paddock, :obs_date, 0.5, 'OK', '2026-01-01')"
+                    ),
+                    {'id': f'{farm}-{day}', 'paddock': f'{farm}-paddock', 'obs_date': date(2026, 1, day)},
+                )
+
+    command.upgrade(_config(database_url, 'backfill_batch_size=3'), 'head')
+    with engine.connect() as connection:
+        rows = connection.execute(text('SELECT paddock_id, farm_id FROM paddock_observations')).all()
+    assert len(rows) == 10
+    assert all(paddock_id == f'{farm_id}-paddock' for paddock_id, farm_id in rows)
+
+    command.downgrade(_config(database_url), '0001')
+    with engine.connect() as connection:
+        columns = [row[1] for row in connection.execute(text('PRAGMA table_info(paddock_observations)'))]
+    engine.dispose()
+    assert 'farm_id' not in columns
+
+
+def test_weather_duplicates_are_collapsed_before_the_unique_constraint(database_url) -> None:
+    command.upgrade(_config(database_url), '0005')
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                'INSERT INTO farms (id, name, latitude, longitude, created_at) '
+                "VALUES ('farm', 'farm', 0, 0, '2026-01-01')"
+            )
+        )
+        for row_id, fetched_at in (('a', '2026-01-01 06:00'), ('b', '2026-01-01 12:00'), ('c', '2026-01-01 09:00')):
+            connection.execute(
+                text(
+                    'INSERT INTO weather_daily '
+                    '(id, farm_id, date, rain_mm, temp_min_c, temp_max_c, wind_kph, source, fetched_at) '
+                    "VALUES (:id, 'farm', '2026-01-02', 0, 0, 0, 0, 'openweather', :fetched_at)"
+                ),
+                {'id': row_id, 'fetched_at': fetched_at},
+            )
+
+    command.upgrade(_config(database_url), 'head')
+    with engine.connect() as connection:
+        assert connection.execute(text('SELECT id FROM weather_daily')).scalars().all() == ['b']
+
+    command.downgrade(_config(database_url), '0005')
+    with engine.connect() as connection:
+        tables = connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+    engine.dispose()
+    assert 'farm_observation_summaries' not in tables
+
+
+def test_existing_observations_get_summaries(database_url) -> None:
+    command.upgrade(_config(database_url), '0006')
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                'INSERT INTO farms (id, name, latitude, longitude, created_at) '
+                "VALUES ('farm', 'farm', 0, 0, '2026-01-01')"
+            )
+        )
+        for paddock, ndvi in (('p1', 0.1), ('p2', 0.6)):
+            connection.execute(
+                text(
+                    'INSERT INTO paddocks (id, farm_id, name, geom_geojson, area_ha, created_at) '
+                    "VALUES (:id, 'farm', :id, '{}', 1.0, '2026-01-01')"
+                ),
+                {'id': paddock},
+            )
+            connection.execute(
+                text(
+                    'INSERT INTO paddock_observations '
+                    '(id, paddock_id, farm_id, obs_date, ndvi_mean, quality_flag, created_at) '
+                    "VALUES (:id, :id, 'farm', '2026-01-05', :ndvi, 'OK', '2026-01-01')"
+                ),
+                {'id': paddock, 'ndvi': ndvi},
+            )
+
+    command.upgrade(_config(database_url), 'head')
+    with engine.connect() as connection:
+        summary = connection.execute(text('SELECT * FROM farm_observation_summaries')).mappings().one()
+    engine.dispose()
+    assert summary['farm_id'] == 'farm'
+    assert str(summary['obs_date']) == '2026-01-05'
+    assert summary['paddock_count'] == 2
+    assert summary['ndvi_mean'] == 0.35
+    assert (summary['bucket_very_low'], summary['bucket_high'], summary['quality_ok']) == (1, 1, 2)
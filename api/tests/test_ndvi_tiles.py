@@ -0,0 +1,164 @@
+import io
+import struct
+import zlib
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.api.v1 import tiles
+from app.core.config import get_settings
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.models.satellite_scene import SatelliteScene
+from app.services import ndvi_tiles
+from app.services.disk_cache import DiskLRUCache
+from app.services.geometry import bbox_polygon
+from app.services.image_encoding import encode_png
+from app.services.ndvi_tiles import NDVI_COLOR_STOPS, colorize_ndvi
+from app.services.pipeline_service import aggregate_paddock_ndvi
+from app.services.raster import RasterGrid, write_band
+from app.services.tile_cache import TileCache
+
+# 1000 x 1000 pixels of 0.0001 degrees starting at (174.70, -36.80).
+GRID = RasterGrid(crs='EPSG:4326', transform=(0.0001, 0.0, 174.70, 0.0, -0.0001, -36.80), width=1000, height=1000)
+PADDOCK = bbox_polygon((174.75, -36.851, 174.752, -36.849))
+TILE = (14, 16145, 9998)  # Covers PADDOCK
+
+
+def _decode_png(data: bytes) -> np.ndarray:
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    chunks, pos = {}, 8
+    while pos < len(data):
+        (length,) = struct.unpack('>I', data[pos : pos + 4])
+        kind, body = data[pos + 4 : pos + 8], data[pos + 8 : pos + 8 + length]
+        assert struct.unpack('>I', data[pos + 8 + length : pos + 12 + length])[0] == zlib.crc32(kind + body)
+        chunks[kind] = chunks.get(kind, b'') + body
+        pos += 12 + length
+    width, height, depth, color_type = struct.unpack('>IIBB', chunks[b'IHDR'][:10])
+    channels = {2: 3, 6: 4}[color_type]
+    assert depth == 8
+    rows = np.frombuffer(zlib.decompress(chunks[b'IDAT']), dtype=np.uint8).reshape(height, width * channels + 1)
+    assert (rows[:, 0] == 2).all()  # Up filter
+    return (np.cumsum(rows[:, 1:].astype(np.int64), axis=0) % 256).astype(np.uint8).reshape(height, width, channels)
+
+
+@pytest.fixture()
+def scene(db, object_store) -> SatelliteScene:
+    farm = Farm(name='Tile Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    scene = SatelliteScene(
+        farm_id=farm.id,
+        scene_date=date(2026, 9, 1),
+        red_uri='s3://scenes/red.npy',
+        nir_uri='s3://scenes/nir.npy',
+    )
+    db.add_all([scene, Paddock(farm_id=farm.id, name='A', geom_geojson=PADDOCK)])
+    db.commit()
+    # NDVI is 0 up to the paddock's west edge (column 500) and reaches 0.5 at its east edge (column 520).
+    nir = np.tile(np.clip(1000 + 100 * (np.arange(1000) - 500), 1000, None), (1000, 1)).astype(np.uint16)
+    write_band(scene.red_uri, np.full((1000, 1000), 1000, dtype=np.uint16), GRID)
+    write_band(scene.nir_uri, nir, GRID)
+    return scene
+
+
+def test_png_round_trips_through_an_independent_decoder() -> None:
+    pixels = np.random.default_rng(0).integers(0, 256, size=(7, 5, 4), dtype=np.uint8)
+    assert np.array_equal(_decode_png(encode_png(pixels)), pixels)
+    assert np.array_equal(_decode_png(encode_png(pixels[..., :3])), pixels[..., :3])
+
+
+def test_colormap_follows_the_bucket_stops_and_leaves_nan_transparent() -> None:
+    rgba = colorize_ndvi(np.array([np.nan, -0.5, 0.2, 0.9], dtype=np.float32))
+    assert rgba[0].tolist() == [0, 0, 0, 0]
+    assert rgba[1].tolist() == [*NDVI_COLOR_STOPS[0][1], 255]
+    assert np.abs(rgba[2, :3].astype(int) - NDVI_COLOR_STOPS[1][1]).max() <= 6
+    assert rgba[3].tolist() == [*NDVI_COLOR_STOPS[-1][1], 255]
+
+
+def test_ndvi_tile_is_clipped_to_paddocks_and_cached(client, db, scene) -> None:
+    path = '/api/v1/tiles/scenes/{}/ndvi/{}/{}/{}.png'.format(scene.id, *TILE)
+
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'image/png'
+    assert response.headers['x-tile-cache'] == 'miss'
+    pixels = _decode_png(response.content)
+    opaque = pixels[..., 3] == 255
+    # The 2 x 2 mm paddock is ~23 x 29 pixels at z14; everything else is transparent.
+    assert 500 < opaque.sum() < 900
+    assert set(np.unique(pixels[..., 3])) == {0, 255}
+    columns = np.nonzero(opaque.any(axis=0))[0]
+    # NDVI rises eastward, so the colour moves from red towards green across the paddock.
+    row = pixels[np.nonzero(opaque.any(axis=1))[0][0]]
+    west, east = row[columns[0]], row[columns[-1]]
+    assert west[0] > east[0] and west[1] < east[1]
+    assert client.get(path).headers['x-tile-cache'] == 'memory'
+
+    moved = bbox_polygon((174.76, -36.851, 174.762, -36.849))
+    paddock_id = db.query(Paddock.id).scalar()
+    client.patch(f'/api/v1/paddocks/{paddock_id}', json={'geom_geojson': moved})
+    assert client.get(path).headers['x-tile-cache'] == 'miss'
+
+
+def test_webp_tile_decodes_to_the_png_tile(client, scene) -> None:
+    image = pytest.importorskip('PIL.Image')
+    path = '/api/v1/tiles/scenes/{}/ndvi/{}/{}/{}'.format(scene.id, *TILE)
+
+    response = client.get(f'{path}.webp')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'image/webp'
+    assert response.content[:4] == b'RIFF' and response.content[8:12] == b'WEBP'
+    webp = np.asarray(image.open(io.BytesIO(response.content)).convert('RGBA'))
+    png = _decode_png(client.get(f'{path}.png').content)
+    assert webp.shape == png.shape == (256, 256, 4)
+    # Lossy colour, but the paddock outline (the alpha channel) survives.
+    assert (np.abs(webp[..., 3].astype(int) - png[..., 3]) > 64).mean() < 0.01
+
+
+def test_low_zoom_tiles_read_a_decimated_window(client, scene, monkeypatch) -> None:
+    steps = []
+    read = ndvi_tiles.read_band_window
+
+    def recording(uri, window, step=1):
+        steps.append(step)
+        return read(uri, window, step)
+
+    monkeypatch.setattr(ndvi_tiles, 'read_band_window', recording)
+    assert client.get(f'/api/v1/tiles/scenes/{scene.id}/ndvi/10/1009/624.png').status_code == 200
+    assert steps == [11, 11]
+
+
+def test_ndvi_tile_errors(client, db, scene, monkeypatch) -> None:
+    assert client.get(f'/api/v1/tiles/scenes/{scene.id}/ndvi/8/252/156.png').status_code == 404
+    assert client.get('/api/v1/tiles/scenes/missing/ndvi/14/16145/9998.png').status_code == 404
+    assert client.get(f'/api/v1/tiles/scenes/{scene.id}/ndvi/14/16145/9998.gif').status_code == 422
+    assert client.get(f'/api/v1/tiles/scenes/{scene.id}/ndvi/14/16100/9998.png').status_code == 204
+    monkeypatch.setattr(tiles, 'webp_available', lambda: False)
+    assert client.get(f'/api/v1/tiles/scenes/{scene.id}/ndvi/14/16145/9998.webp').status_code == 406
+
+    scenes = client.get(f'/api/v1/farms/{scene.farm_id}/scenes').json()
+    assert scenes['data'][0]['id'] == scene.id
+    assert scenes['data'][0]['has_bands'] is True
+
+
+def test_reprocessed_bands_reach_the_api_through_the_shared_cache(client, db, scene, monkeypatch) -> None:
+    path = '/api/v1/tiles/scenes/{}/ndvi/{}/{}/{}.png'.format(scene.id, *TILE)
+    before = client.get(path)
+    assert client.get(path).headers['x-tile-cache'] == 'memory'
+
+    write_band(scene.nir_uri, np.full((1000, 1000), 9000, dtype=np.uint16), GRID)
+    # Aggregation runs in a Celery worker, which holds its own TileCache over the same NDVI_TILE_CACHE_DIR.
+    settings = get_settings()
+    worker_cache = TileCache(DiskLRUCache(settings.ndvi_tile_cache_dir, 1024 * 1024), 16, 30.0)
+    with monkeypatch.context() as patch:
+        patch.setattr(ndvi_tiles, 'get_ndvi_tile_cache', lambda: worker_cache)
+        aggregate_paddock_ndvi(db, scene.id)
+
+    monkeypatch.setattr(ndvi_tiles.get_ndvi_tile_cache(), 'memory_ttl_seconds', 0.0)
+    after = client.get(path)
+    assert after.headers['x-tile-cache'] == 'miss'
+    assert after.content != before.content
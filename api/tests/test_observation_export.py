@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from app.api.v1 import observations
+from app.main import app
+from app.models.enums import QualityFlag
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.services import observation_export
+from tests.conftest import SQUARE
+
+START = date(2026, 1, 1)
+
+
+@pytest.fixture()
+def client(client, session_factory, monkeypatch):
+    # Exports stream from their own session.
+    monkeypatch.setattr(observations, 'SessionLocal', session_factory)
+    return client
+
+
+@pytest.fixture()
+def farm(db) -> Farm:
+    farm = Farm(name='Export Farm', latitude=-36.85, longitude=174.75)
+    other = Farm(name='Other Farm', latitude=-36.85, longitude=174.75)
+    db.add_all([farm, other])
+    db.flush()
+    paddocks = [Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=SQUARE, area_ha=1.0) for i in range(3)]
+    stray = Paddock(farm_id=other.id, name='Elsewhere', geom_geojson=SQUARE, area_ha=1.0)
+    db.add_all([*paddocks, stray])
+    db.flush()
+    db.add_all(
+        PaddockObservation(
+            paddock_id=paddock.id,
+            farm_id=paddock.farm_id,
+            obs_date=START + timedelta(days=day),
+            ndvi_mean=0.1 + 0.1 * day,
+            quality_flag=QualityFlag.OK,
+        )
+        for paddock in [*paddocks, stray]
+        for day in range(5)
+    )
+    db.commit()
+    return farm
+
+
+def test_ndjson_export_streams_every_paddock_date_in_range(client, farm) -> None:
+    response = client.get(
+        f'/api/v1/farms/{farm.id}/observations/export', params={'start': '2026-01-02', 'end': '2026-01-04'}
+    )
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == 9
+    assert {record['paddock_name'] for record in records} == {'P0', 'P1', 'P2'}
+    assert [record['obs_date'] for record in records[::3]] == ['2026-01-02', '2026-01-03', '2026-01-04']
+    assert records[0]['bucket'] == 'Low' and records[0]['quality_flag'] == 'OK'
+
+
+def test_csv_export_writes_one_header_then_rows(client, farm) -> None:
+    response = client.get(f'/api/v1/farms/{farm.id}/observations/export', params={'format': 'csv'})
+
+    assert response.status_code == 200
+    assert 'attachment' in response.headers['content-disposition']
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 15
+    assert tuple(rows[0]) == observation_export.EXPORT_FIELDS
+
+
+def test_export_batches_partition_the_result(db, farm) -> None:
+    stmt = observation_export.export_query(farm.id)
+
+    batches = list(observation_export.export_batches(db, stmt, batch_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 4, 3]
+
+
+def test_export_rejects_inverted_range_and_unknown_farm(client, farm) -> None:
+    inverted = client.get(
+        f'/api/v1/farms/{farm.id}/observations/export', params={'start': '2026-01-04', 'end': '2026-01-02'}
+    )
+    missing = client.get('/api/v1/farms/missing/observations/export')
+
+    assert inverted.status_code == 400
+    assert missing.status_code == 404
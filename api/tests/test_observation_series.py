@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.services.observation_series import downsample, farm_series
+from tests.conftest import SQUARE
+
+START = date(2026, 1, 1)
+
+
+@pytest.fixture()
+def farm(db) -> Farm:
+    farm = Farm(name='Series Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    paddocks = [Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=SQUARE, area_ha=1.0) for i in range(4)]
+    db.add_all(paddocks)
+    db.flush()
+    # P3 has no observations; P0 rises, P1 falls, P2 stays flat.
+    for paddock, step in zip(paddocks[:3], (0.01, -0.01, 0.0)):
+        db.add_all(
+            PaddockObservation(
+                paddock_id=paddock.id,
+                farm_id=farm.id,
+                obs_date=START + timedelta(days=5 * day),
+                ndvi_mean=0.5 + step * day,
+            )
+            for day in range(10)
+        )
+    db.commit()
+    return farm
+
+
+def test_farm_series_matches_per_paddock_endpoint(client, farm) -> None:
+    body = client.get(f'/api/v1/farms/{farm.id}/observations/series').json()
+
+    assert [entry['paddock_name'] for entry in body['data']] == ['P0', 'P1', 'P2', 'P3']
+    assert [entry['direction'] for entry in body['data']] == ['up', 'down', 'flat', None]
+    for entry in body['data']:
+        single = client.get(f"/api/v1/paddocks/{entry['paddock_id']}/observations").json()['data']
+        assert entry['points'] == single['points']
+        assert entry['slope'] == single['slope']
+
+
+def test_farm_series_uses_one_query(db, farm) -> None:
+    farm_id = farm.id
+    statements = []
+
+    def count(*args) -> None:
+        statements.append(args[2])
+
+    event.listen(db.get_bind(), 'before_cursor_execute', count)
+    try:
+        series = farm_series(db, farm_id)
+    finally:
+        event.remove(db.get_bind(), 'before_cursor_execute', count)
+
+    assert len(series) == 4
+    assert len(statements) == 1
+
+
+def test_since_and_max_points_trim_each_series(client, farm) -> None:
+    body = client.get(
+        f'/api/v1/farms/{farm.id}/observations/series', params={'since': '2026-01-11', 'max_points': 3}
+    ).json()
+
+    first = body['data'][0]
+    assert [point['obs_date'] for point in first['points']] == ['2026-01-11', '2026-01-31', '2026-02-15']
+    assert first['direction'] == 'up'
+    assert body['data'][3]['points'] == []
+
+
+def test_downsample_keeps_endpoints() -> None:
+    points = [{'i': i} for i in range(10)]
+
+    assert downsample(points, None) == points
+    assert downsample(points, 20) == points
+    assert downsample(points, 1) == [{'i': 9}]
+    assert [point['i'] for point in downsample(points, 4)] == [0, 3, 6, 9]
+
+
+def test_unknown_farm_is_404(client) -> None:
+    assert client.get('/api/v1/farms/missing/observations/series').status_code == 404
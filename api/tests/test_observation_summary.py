@@ -0,0 +1,64 @@
+from collections import Counter
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.models.farm import Farm
+from app.models.farm_observation_summary import FarmObservationSummary
+from app.models.paddock import Paddock
+from app.models.satellite_scene import SatelliteScene
+from app.services.pipeline_service import aggregate_paddock_ndvi
+from tests.conftest import SQUARE
+
+SCENE_DATE = date(2026, 1, 5)
+
+
+@pytest.fixture()
+def farm(db) -> Farm:
+    farm = Farm(name='Summary Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    db.add_all(Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=SQUARE, area_ha=1.0) for i in range(6))
+    db.add(SatelliteScene(farm_id=farm.id, scene_date=SCENE_DATE, cloud_pct=10.0))
+    db.commit()
+    return farm
+
+
+def _aggregate(db, farm: Farm) -> None:
+    scene = db.scalars(select(SatelliteScene).where(SatelliteScene.farm_id == farm.id)).one()
+    aggregate_paddock_ndvi(db, scene.id)
+
+
+def test_aggregate_summary_matches_per_row_bucketing(client, db, farm) -> None:
+    _aggregate(db, farm)
+    _aggregate(db, farm)
+
+    rows = client.get(f'/api/v1/farms/{farm.id}/observations', params={'date': SCENE_DATE.isoformat()}).json()['data']
+    overview = client.get(f'/api/v1/farms/{farm.id}/observations/overview').json()['data']
+
+    assert len(overview) == 1
+    summary = overview[0]
+    assert summary['obs_date'] == SCENE_DATE.isoformat()
+    assert summary['paddock_count'] == 6
+    assert summary['ndvi_mean'] == pytest.approx(sum(row['ndvi_mean'] for row in rows) / 6, abs=1e-4)
+    assert {name: count for name, count in summary['buckets'].items() if count} == Counter(
+        row['bucket'] for row in rows
+    )
+    assert summary['quality'] == {'OK': 6, 'CLOUDY': 0, 'NO_DATA': 0}
+
+
+def test_dates_listing_reads_summaries_and_follows_paddock_deletes(client, db, farm) -> None:
+    _aggregate(db, farm)
+    paddock_ids = [paddock.id for paddock in db.scalars(select(Paddock).where(Paddock.farm_id == farm.id))]
+    dates_path = f'/api/v1/farms/{farm.id}/observations/dates'
+
+    assert client.get(dates_path).json()['data']['dates'] == [SCENE_DATE.isoformat()]
+
+    client.delete(f'/api/v1/paddocks/{paddock_ids[0]}')
+    db.expire_all()
+    assert db.scalars(select(FarmObservationSummary.paddock_count)).one() == 5
+
+    for paddock_id in paddock_ids[1:]:
+        client.delete(f'/api/v1/paddocks/{paddock_id}')
+    assert client.get(dates_path).json()['data']['dates'] == []
@@ -0,0 +1,67 @@
+from datetime import date
+
+from sqlalchemy import func, select
+
+from app.db.upsert import _select_then_write, upsert_rows
+from app.models.enums import QualityFlag
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.models.satellite_scene import SatelliteScene
+from app.services.pipeline_service import OBSERVATION_UPDATE_COLUMNS, aggregate_paddock_ndvi
+from tests.conftest import SQUARE
+
+
+def _farm_with_paddocks(db, count: int) -> tuple[Farm, list[Paddock]]:
+    farm = Farm(name='Test Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    paddocks = [Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=SQUARE, area_ha=1.0) for i in range(count)]
+    db.add_all(paddocks)
+    db.commit()
+    return farm, paddocks
+
+
+def test_aggregate_upserts_one_row_per_paddock_and_date(db) -> None:
+    farm, paddocks = _farm_with_paddocks(db, 5)
+    scene = SatelliteScene(farm_id=farm.id, scene_date=date(2026, 1, 5), cloud_pct=10.0)
+    db.add(scene)
+    db.commit()
+
+    aggregate_paddock_ndvi(db, scene.id)
+    scene.cloud_pct = 90.0
+    db.commit()
+    aggregate_paddock_ndvi(db, scene.id)
+
+    rows = db.scalars(select(PaddockObservation)).all()
+    assert len(rows) == len(paddocks)
+    assert {row.quality_flag for row in rows} == {QualityFlag.CLOUDY}
+    assert {row.cloud_pct for row in rows} == {90.0}
+    assert {row.farm_id for row in rows} == {farm.id}
+
+
+def test_generic_fallback_matches_native_upsert(db) -> None:
+    _, paddocks = _farm_with_paddocks(db, 3)
+
+    def rows(ndvi: float) -> list[dict]:
+        return [
+            {
+                'paddock_id': paddock.id,
+                'farm_id': paddock.farm_id,
+                'obs_date': date(2026, 1, 5),
+                'ndvi_mean': ndvi,
+                'ndvi_p10': None,
+                'ndvi_p50': None,
+                'ndvi_p90': None,
+                'cloud_pct': 0.0,
+                'quality_flag': QualityFlag.OK,
+            }
+            for paddock in paddocks
+        ]
+
+    upsert_rows(db, PaddockObservation, rows(0.3), ('paddock_id', 'obs_date'), OBSERVATION_UPDATE_COLUMNS)
+    _select_then_write(db, PaddockObservation, rows(0.6)[:2], ('paddock_id', 'obs_date'), OBSERVATION_UPDATE_COLUMNS)
+    db.commit()
+
+    assert db.scalar(select(func.count()).select_from(PaddockObservation)) == 3
+    assert sorted(db.scalars(select(PaddockObservation.ndvi_mean))) == [0.3, 0.6, 0.6]
@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.models.farm import Farm
+from app.models.weather_daily import WeatherDaily
+from app.services import openweather_client
+from app.services.openweather_client import OpenWeatherClient, close_openweather_client
+from app.services.weather_service import fetch_weather_forecasts
+from app.workers import tasks
+from tests.stub_openweather import StubOpenWeather
+
+
+def test_client_retries_and_reuses_connections() -> None:
+    async def run(base_url: str) -> list[dict]:
+        client = OpenWeatherClient(base_url, 'key', max_concurrency=2, backoff_seconds=0.01)
+        try:
+            return await asyncio.gather(*(client.forecast(-36.8, 174.7 + i / 100) for i in range(8)))
+        finally:
+            await client.aclose()
+
+    with StubOpenWeather(fail_first=1) as stub:
+        results = asyncio.run(run(stub.base_url))
+
+    assert len(results) == 8
+    assert len(stub.requests) == 9
+    assert len(stub.connections) <= 3
+
+
+def test_batch_refresh_writes_every_farm(db, monkeypatch) -> None:
+    farms = [Farm(name=f'Farm {i}', latitude=-36.8 - i / 10, longitude=174.7) for i in range(6)]
+    db.add_all(farms)
+    db.commit()
+
+    async def run() -> dict:
+        try:
+            return await fetch_weather_forecasts(db, [farm.id for farm in farms] + ['missing'])
+        finally:
+            await close_openweather_client()
+
+    with StubOpenWeather() as stub:
+        monkeypatch.setattr(get_settings(), 'openweather_api_key', 'key')
+        monkeypatch.setattr(get_settings(), 'openweather_base_url', stub.base_url)
+        result = asyncio.run(run())
+
+    assert len(stub.requests) == 6
+    assert set(result['refreshed']) == {farm.id for farm in farms}
+    assert result['failures'] == {'missing': 'Farm not found'}
+    assert db.scalar(select(func.count()).select_from(WeatherDaily)) == sum(result['refreshed'].values())
+    assert {row.source for row in db.scalars(select(WeatherDaily))} == {'openweather'}
+
+
+def test_client_gives_up_after_max_retries() -> None:
+    async def run(base_url: str) -> None:
+        client = OpenWeatherClient(base_url, 'key', max_retries=2, backoff_seconds=0.0)
+        try:
+            await client.forecast(-36.8, 174.7)
+        finally:
+            await client.aclose()
+
+    with StubOpenWeather(fail_first=10) as stub:
+        with pytest.raises(Exception, match='503'):
+            asyncio.run(run(stub.base_url))
+    assert len(stub.requests) == 3
+
+
+def test_retry_after_is_capped_and_backoff_frees_the_slot() -> None:
+    async def run(base_url: str) -> list[dict]:
+        client = OpenWeatherClient(base_url, 'key', max_concurrency=1, max_backoff_seconds=0.2)
+        try:
+            return await asyncio.gather(client.forecast(-36.8, 174.7), client.forecast(-36.8, 174.8))
+        finally:
+            await client.aclose()
+
+    started = time.perf_counter()
+    with StubOpenWeather(fail_first=1, retry_after='3600') as stub:
+        asyncio.run(run(stub.base_url))
+
+    assert time.perf_counter() - started < 5
+    # The second farm is fetched while the first waits out its Retry-After.
+    assert [request['lon'] for request in stub.requests] == ['174.7', '174.8', '174.7']
+
+
+def test_weather_task_closes_its_loops_client(db, session_factory, monkeypatch) -> None:
+    closed = []
+    aclose = OpenWeatherClient.aclose
+
+    async def recording(self) -> None:
+        closed.append(self)
+        await aclose(self)
+
+    monkeypatch.setattr(OpenWeatherClient, 'aclose', recording)
+    monkeypatch.setattr(tasks, 'SessionLocal', session_factory)
+    farm = Farm(name='Task Farm', latitude=-36.8, longitude=174.7)
+    db.add(farm)
+    db.commit()
+
+    with StubOpenWeather() as stub:
+        monkeypatch.setattr(get_settings(), 'openweather_api_key', 'key')
+        monkeypatch.setattr(get_settings(), 'openweather_base_url', stub.base_url)
+        tasks.fetch_weather_forecast_task.apply(args=(farm.id,))
+
+    assert len(stub.requests) == 1
+    assert len(closed) == 1
+    assert not openweather_client._clients
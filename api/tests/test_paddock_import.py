@@ -0,0 +1,114 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.models.enums import JobStatus, JobType
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.services.geometry import bbox_polygon, polygon_area_hectares
+from app.services.job_runs import start_job_run
+from app.services.paddock_import import import_paddock_features, iter_features, run_paddock_import
+from app.workers import tasks
+
+pytestmark = pytest.mark.usefixtures('eager_tasks', 'object_store')
+
+
+def _feature(index: int, geometry: dict | None = None) -> dict:
+    lon = 174.75 + index * 0.002
+    geometry = geometry or bbox_polygon((lon, -36.85, lon + 0.001, -36.849))
+    return {'type': 'Feature', 'properties': {'name': f'Parcel {index}'}, 'geometry': geometry}
+
+
+def _collection(features: list[dict]) -> dict:
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+@pytest.fixture()
+def farm_id(db) -> str:
+    farm = Farm(name='Import Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.commit()
+    return farm.id
+
+
+def test_small_import_runs_inline_and_reports_failures_by_index(client, db, farm_id) -> None:
+    unclosed = bbox_polygon((174.7, -36.8, 174.71, -36.79))
+    unclosed['coordinates'][0].pop()
+    features = [_feature(0), _feature(1, {'type': 'Point', 'coordinates': [174.7, -36.8]}), _feature(2, unclosed)]
+    payload = {'feature_collection': _collection(features)}
+
+    response = client.post(f'/api/v1/farms/{farm_id}/paddocks/import', json=payload)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body['meta']['count'] == 1
+    assert body['meta']['failures'] == [
+        {'index': 1, 'error': 'Feature geometry must be Polygon'},
+        {'index': 2, 'error': 'Polygon rings must be closed'},
+    ]
+    assert body['data'][0]['name'] == 'Parcel 0'
+    paddock = db.get(Paddock, body['data'][0]['id'])
+    assert paddock.area_ha == pytest.approx(polygon_area_hectares(features[0]['geometry']))
+    assert paddock.geom == features[0]['geometry']
+
+
+def test_import_accepts_a_bare_collection_and_rejects_bad_uploads(client, farm_id) -> None:
+    path = f'/api/v1/farms/{farm_id}/paddocks/import'
+
+    assert client.post(path, json=_collection([_feature(0)])).json()['meta']['count'] == 1
+    assert client.post(path, content=b'{"type": "FeatureCollection", "features": [').status_code == 400
+    assert client.post(path, json={'feature_collection': {'type': 'Feature'}}).status_code == 400
+    assert client.post('/api/v1/farms/missing/paddocks/import', json=_collection([])).status_code == 404
+
+
+def test_large_import_runs_as_a_background_job(client, db, farm_id, monkeypatch, object_store) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'paddock_import_background_features', 3)
+    monkeypatch.setattr(settings, 'paddock_import_chunk_size', 2)
+    monkeypatch.setattr(settings, 'paddock_import_workers', 0)
+    features = [_feature(index) for index in range(5)]
+    features[3]['geometry'] = None
+
+    response = client.post(f'/api/v1/farms/{farm_id}/paddocks/import', json=_collection(features))
+
+    assert response.status_code == 202
+    run = client.get(f"/api/v1/jobs/runs/{response.json()['data']['run_id']}").json()['data']
+    assert run['job_type'] == 'import_paddocks'
+    assert run['status'] == 'success'
+    assert run['progress'] == 1.0
+    stats = run['stats_json']
+    assert (stats['total'], stats['processed'], stats['created'], stats['chunks']) == (5, 5, 4, 3)
+    assert stats['failures'] == [{'index': 3, 'error': 'Feature geometry must be Polygon'}]
+    assert db.scalar(select(func.count()).select_from(Paddock).where(Paddock.farm_id == farm_id)) == 4
+    assert not list(Path(object_store).rglob('*.geojson'))
+
+
+def test_validation_in_worker_processes_commits_each_chunk(db, farm_id) -> None:
+    upload = io.BytesIO(json.dumps(_collection([_feature(index) for index in range(7)])).encode())
+    commits = []
+
+    result = import_paddock_features(
+        db, farm_id, iter_features(upload), chunk_size=2, workers=2, on_chunk=lambda r: commits.append(r.created)
+    )
+
+    assert commits == [2, 4, 6, 7]
+    assert [row['name'] for row in result.rows] == [f'Parcel {index}' for index in range(7)]
+    assert db.scalar(select(func.count()).select_from(Paddock)) == 7
+
+
+def test_background_import_fails_its_job_when_the_upload_is_not_shared(db, farm_id, object_store) -> None:
+    run = start_job_run(db, JobType.import_paddocks, farm_id)
+    run.stats_json = {'total': 5}
+    db.commit()
+
+    # What an import worker that does not share the API's OBJECT_STORE_ROOT sees.
+    with pytest.raises(FileNotFoundError):
+        run_paddock_import(db, run.id, farm_id, f's3://imports/{farm_id}/{run.id}.geojson')
+
+    db.refresh(run)
+    assert run.status == JobStatus.failed
+    assert run.error.startswith(f'Upload s3://imports/{farm_id}/{run.id}.geojson not found')
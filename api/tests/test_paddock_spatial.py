@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.services.geometry import bbox_polygon
+from app.services.paddock_spatial import parse_bbox
+
+
+def _farm_with_grid(db) -> str:
+    # Three 0.01 deg paddocks in a row along the equator.
+    farm = Farm(name='Spatial', latitude=0.0, longitude=0.0)
+    db.add(farm)
+    db.flush()
+    for i in range(3):
+        geom = bbox_polygon((i * 0.01, 0.0, i * 0.01 + 0.009, 0.01))
+        db.add(Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=geom))
+    db.commit()
+    return farm.id
+
+
+def test_geom_and_area_are_written_with_the_geojson(db) -> None:
+    farm_id = _farm_with_grid(db)
+    paddock = db.scalars(select(Paddock).where(Paddock.farm_id == farm_id, Paddock.name == 'P0')).one()
+
+    assert paddock.geom == paddock.geom_geojson
+    assert paddock.area_ha == pytest.approx(111.3, rel=0.01)
+
+    paddock.geom_geojson = bbox_polygon((0.0, 0.0, 0.001, 0.001))
+    db.commit()
+    db.expire_all()
+
+    assert paddock.geom['coordinates'][0][2] == [0.001, 0.001]
+    assert paddock.area_ha == pytest.approx(1.23, rel=0.01)
+
+
+def test_list_paddocks_filters_by_bbox(client, db) -> None:
+    farm_id = _farm_with_grid(db)
+
+    body = client.get(f'/api/v1/farms/{farm_id}/paddocks', params={'bbox': '0.015,0.002,0.025,0.004'}).json()
+    assert [row['name'] for row in body['data']] == ['P1', 'P2']
+
+    assert client.get(f'/api/v1/farms/{farm_id}/paddocks', params={'bbox': '1,2,3'}).status_code == 400
+    assert client.get(f'/api/v1/farms/{farm_id}/paddocks', params={'bbox': '3,0,1,1'}).status_code == 400
+
+
+def test_intersecting_paddocks_for_a_scene_footprint(client, db) -> None:
+    farm_id = _farm_with_grid(db)
+    footprint = {'type': 'MultiPolygon', 'coordinates': [bbox_polygon((0.0, 0.0, 0.005, 0.005))['coordinates']]}
+
+    response = client.post(f'/api/v1/farms/{farm_id}/paddocks/intersecting', json={'geometry': footprint})
+
+    assert response.status_code == 200
+    assert [row['name'] for row in response.json()['data']] == ['P0']
+    invalid = client.post(f'/api/v1/farms/{farm_id}/paddocks/intersecting', json={'geometry': {'type': 'Point'}})
+    assert invalid.status_code == 422
+
+
+def test_parse_bbox() -> None:
+    assert parse_bbox('174.7,-36.9,174.8,-36.8') == (174.7, -36.9, 174.8, -36.8)
+    with pytest.raises(ValueError):
+        parse_bbox('a,b,c,d')
+
+
+def test_geometry_column_uses_postgis_functions() -> None:
+    dialect = postgresql.dialect()
+    stmt = select(Paddock.geom).where(Paddock.id == 'x')
+
+    assert 'ST_AsGeoJSON(paddocks.geom)' in str(stmt.compile(dialect=dialect))
+    insert = Paddock.__table__.insert().values(geom={'type': 'Polygon', 'coordinates': []})
+    assert 'ST_SetSRID(ST_GeomFromGeoJSON(' in str(insert.compile(dialect=dialect))
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.models.enums import JobStatus, JobType
+from app.models.farm import Farm
+from app.models.job_run import JobRun
+from app.models.paddock import Paddock
+from tests.conftest import SQUARE
+
+BASE = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def _pages(client: TestClient, path: str, **params) -> list[list[dict]]:
+    pages = []
+    cursor = None
+    while True:
+        query = {**params, **({'cursor': cursor} if cursor else {})}
+        body = client.get(path, params=query).json()
+        pages.append(body['data'])
+        cursor = body['meta']['next_cursor']
+        if cursor is None:
+            return pages
+
+
+def test_farms_page_newest_first_with_ties_broken_by_id(client, db) -> None:
+    # Pairs of farms share a timestamp so the id tiebreak has to carry the cursor.
+    farms = [
+        Farm(name=f'Farm {i}', latitude=-36.8, longitude=174.7, created_at=BASE + timedelta(minutes=i // 2))
+        for i in range(7)
+    ]
+    db.add_all(farms)
+    db.commit()
+
+    pages = _pages(client, '/api/v1/farms', limit=3)
+    rows = [row for page in pages for row in page]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    expected = sorted(farms, key=lambda farm: (farm.created_at, farm.id), reverse=True)
+    assert [row['id'] for row in rows] == [farm.id for farm in expected]
+    assert set(rows[0]) == {'id', 'name', 'description', 'latitude', 'longitude', 'created_at'}
+
+
+def test_paddocks_page_oldest_first(client, db) -> None:
+    farm = Farm(name='Paged', latitude=-36.8, longitude=174.7)
+    db.add(farm)
+    db.flush()
+    paddocks = [
+        Paddock(farm_id=farm.id, name=f'P{i}', geom_geojson=SQUARE, area_ha=1.0, created_at=BASE + timedelta(seconds=i))
+        for i in range(5)
+    ]
+    db.add_all(paddocks)
+    db.commit()
+
+    pages = _pages(client, f'/api/v1/farms/{farm.id}/paddocks', limit=2)
+
+    assert [row['name'] for page in pages for row in page] == [f'P{i}' for i in range(5)]
+
+
+def test_job_runs_filter_and_page(client, db) -> None:
+    for i in range(6):
+        db.add(
+            JobRun(
+                job_type=JobType.fetch_weather if i % 2 else JobType.ingest_satellite,
+                status=JobStatus.failed if i == 5 else JobStatus.success,
+                started_at=BASE + timedelta(hours=i),
+                stats_json={},
+            )
+        )
+    db.commit()
+
+    weather = [row for page in _pages(client, '/api/v1/jobs/runs', job_type='fetch_weather', limit=2) for row in page]
+    recent = client.get('/api/v1/jobs/runs', params={'started_after': (BASE + timedelta(hours=4)).isoformat()}).json()
+    failed = client.get('/api/v1/jobs/runs', params={'status': 'failed'}).json()
+
+    assert [row['job_type'] for row in weather] == ['fetch_weather'] * 3
+    assert weather[0]['started_at'] > weather[-1]['started_at']
+    assert recent['meta']['count'] == 2
+    assert failed['meta']['count'] == 1
+
+
+def test_invalid_cursor_is_rejected(client) -> None:
+    response = client.get('/api/v1/farms', params={'cursor': 'not-a-cursor'})
+    assert response.status_code == 400
@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.models.farm import Farm
+from app.models.job_run import JobRun
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.models.satellite_scene import SatelliteScene
+from app.services.pipeline_service import aggregate_paddock_ndvi, ingest_satellite_scenes
+from app.services.raster import PixelWindow, RasterGrid, geometry_window, read_band_window, write_band
+
+# 1000 x 1000 pixels of 0.0001 degrees starting at (174.70, -36.80).
+GRID = RasterGrid(crs='EPSG:4326', transform=(0.0001, 0.0, 174.70, 0.0, -0.0001, -36.80), width=1000, height=1000)
+PADDOCK = {
+    'type': 'Polygon',
+    'coordinates': [[[174.75, -36.851], [174.752, -36.851], [174.752, -36.849], [174.75, -36.849], [174.75, -36.851]]],
+}
+
+
+def test_geometry_window_covers_paddocks_and_aligns_to_blocks() -> None:
+    window = geometry_window(GRID, [PADDOCK])
+    assert window == PixelWindow(col_off=499, row_off=489, width=22, height=22)
+
+    aligned = window.align((256, 256), GRID)
+    assert aligned == PixelWindow(col_off=256, row_off=256, width=512, height=256)
+    assert window.align((256, 256), RasterGrid('EPSG:4326', GRID.transform, 600, 600)).width == 344
+
+
+def test_read_band_window_reads_only_the_window(object_store) -> None:
+    band = np.arange(1000 * 1000, dtype=np.uint16).reshape(1000, 1000)
+    write_band('s3://scenes/red.npy', band, GRID)
+
+    window = PixelWindow(col_off=10, row_off=20, width=5, height=3)
+    result = read_band_window('s3://scenes/red.npy', window)
+    assert np.array_equal(result.data, band[20:23, 10:15])
+    assert result.bytes_read == 5 * 3 * 2
+    assert result.full_bytes == 1000 * 1000 * 2
+    assert result.grid.transform[2] == GRID.transform[2] + 10 * 0.0001
+
+
+def test_aggregate_reads_farm_window_and_reports_io(db, object_store) -> None:
+    farm = Farm(name='Test Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    paddock = Paddock(farm_id=farm.id, name='A', geom_geojson=PADDOCK, area_ha=4.4)
+    scene = SatelliteScene(
+        farm_id=farm.id,
+        scene_date=date(2026, 1, 5),
+        cloud_pct=0.0,
+        red_uri='s3://scenes/red.npy',
+        nir_uri='s3://scenes/nir.npy',
+    )
+    db.add_all([paddock, scene])
+    db.commit()
+    write_band(scene.red_uri, np.full((1000, 1000), 1000, dtype=np.uint16), GRID)
+    write_band(scene.nir_uri, np.full((1000, 1000), 3000, dtype=np.uint16), GRID)
+
+    aggregate_paddock_ndvi(db, scene.id)
+
+    obs = db.query(PaddockObservation).one()
+    assert obs.ndvi_mean == 0.5
+    assert obs.cloud_pct == 0.0
+    stats = db.query(JobRun).one().stats_json
+    assert stats['source'] == 'raster'
+    assert stats['bytes_read'] == 2 * 22 * 22 * 2
+    assert stats['bytes_read'] < stats['full_scene_bytes']
+    assert stats['peak_rss_mb'] > 0
+
+
+def test_ingest_reports_reads_per_scene(db, object_store) -> None:
+    farm = Farm(name='Test Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.flush()
+    scene = SatelliteScene(
+        farm_id=farm.id,
+        scene_date=date.today() - timedelta(days=3),
+        red_uri='s3://scenes/red.npy',
+        nir_uri='s3://scenes/nir.npy',
+    )
+    db.add_all([Paddock(farm_id=farm.id, name='A', geom_geojson=PADDOCK, area_ha=4.4), scene])
+    db.commit()
+    write_band(scene.red_uri, np.full((1000, 1000), 1000, dtype=np.uint16), GRID)
+    write_band(scene.nir_uri, np.full((1000, 1000), 3000, dtype=np.uint16), GRID)
+
+    ingest_satellite_scenes(db, farm.id)
+
+    stats = db.query(JobRun).one().stats_json
+    raster, *synthetic = stats['per_scene']
+    assert raster == {
+        'scene_id': scene.id,
+        'source': 'raster',
+        'window': [499, 489, 22, 22],
+        'bytes_read': 2 * 22 * 22 * 2,
+        'full_scene_bytes': 2 * 1000 * 1000 * 2,
+    }
+    assert [entry['bytes_read'] for entry in synthetic] == [0, 0]
+    assert stats['bytes_read'] == raster['bytes_read']
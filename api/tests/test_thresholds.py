@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.models.config_threshold import ConfigThreshold
+from app.services.thresholds import ThresholdCache, get_threshold_value, seed_thresholds, threshold_cache
+
+
+def test_lookups_are_served_from_memory(db) -> None:
+    seed_thresholds(db)
+    before = threshold_cache.stats()
+    statements: list[str] = []
+    event.listen(db.get_bind(), 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    for _ in range(50):
+        assert get_threshold_value(db, 'rain_heavy_threshold', 1.0) == 40.0
+        assert get_threshold_value(db, 'missing_key', 1.5) == 1.5
+
+    assert len(statements) == 2
+    after = threshold_cache.stats()
+    assert after['misses'] - before['misses'] == 1
+    assert after['hits'] - before['hits'] == 99
+
+
+def test_version_bump_reloads_after_check_interval(db) -> None:
+    seed_thresholds(db)
+    cache = ThresholdCache(check_interval=0.0)
+    assert cache.values(db)['ndvi_good_threshold'] == {'value': 0.5}
+    assert cache.values(db)['ndvi_good_threshold'] == {'value': 0.5}
+    assert cache.reloads == 1
+
+    row = db.get(ConfigThreshold, 'ndvi_good_threshold')
+    row.value = {'value': 0.6}
+    row.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db.commit()
+
+    assert cache.values(db)['ndvi_good_threshold'] == {'value': 0.6}
+    assert cache.reloads == 2
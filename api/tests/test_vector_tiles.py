@@ -0,0 +1,222 @@
+import math
+import struct
+from datetime import date
+
+import pytest
+
+from app.core.config import get_settings
+from app.main import app
+from app.models.enums import QualityFlag, RecommendationType, Severity
+from app.models.farm import Farm
+from app.models.paddock import Paddock
+from app.models.paddock_observation import PaddockObservation
+from app.models.paddock_recommendation import PaddockRecommendation
+from app.models.recommendation import Recommendation
+from app.services.geometry import bbox_polygon
+from app.services import vector_tiles
+from app.services.disk_cache import DiskLRUCache
+from app.services.tile_cache import TileCache, tile_bounds
+from app.services.vector_tiles import TILE_BUFFER, TILE_EXTENT, get_tile_cache, invalidate_paddock_tiles, tile_rings
+
+Z, X, Y = 14, 16145, 9998  # The tile over (174.75, -36.85)
+
+
+def _varint(data: bytes, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        result |= (byte & 0x7F) << shift
+        pos += 1
+        shift += 7
+        if byte < 0x80:
+            return result, pos
+
+
+def _fields(data: bytes) -> list[tuple[int, object]]:
+    fields, pos = [], 0
+    while pos < len(data):
+        key, pos = _varint(data, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = _varint(data, pos)
+        elif wire_type == 1:
+            value, pos = struct.unpack('<d', data[pos : pos + 8])[0], pos + 8
+        else:
+            length, pos = _varint(data, pos)
+            value, pos = data[pos : pos + length], pos + length
+        fields.append((number, value))
+    return fields
+
+
+def _packed(data: bytes) -> list[int]:
+    values, pos = [], 0
+    while pos < len(data):
+        value, pos = _varint(data, pos)
+        values.append(value)
+    return values
+
+
+def _decode(tile: bytes) -> dict[str, list[dict]]:
+    """Independent reading of the MVT protobuf: {layer: [{'properties': ..., 'rings': [[(x, y), ...]]}]}."""
+    layers = {}
+    for _, layer_bytes in _fields(tile):
+        layer = _fields(layer_bytes)
+        keys = [value.decode() for number, value in layer if number == 3]
+        values = []
+        for number, value in layer:
+            if number == 4:
+                kind, raw = _fields(value)[0]
+                values.append(raw.decode() if kind == 1 else raw)
+        assert dict(layer)[15] == 2 and dict(layer)[5] == TILE_EXTENT
+        features = []
+        for number, feature_bytes in layer:
+            if number != 2:
+                continue
+            feature = dict(_fields(feature_bytes))
+            tags = _packed(feature.get(2, b''))
+            properties = {keys[tags[i]]: values[tags[i + 1]] for i in range(0, len(tags), 2)}
+            features.append({'properties': properties, 'rings': _rings(_packed(feature[4])), 'type': feature[3]})
+        layers[dict(layer)[1].decode()] = features
+    return layers
+
+
+def _rings(commands: list[int]) -> list[list[tuple[int, int]]]:
+    rings, cursor, pos = [], [0, 0], 0
+    while pos < len(commands):
+        command, count = commands[pos] & 7, commands[pos] >> 3
+        pos += 1
+        if command == 1:
+            rings.append([])
+        for _ in range(count if command != 7 else 0):
+            dx, dy = (commands[pos] >> 1) ^ -(commands[pos] & 1), (commands[pos + 1] >> 1) ^ -(commands[pos + 1] & 1)
+            cursor = [cursor[0] + dx, cursor[1] + dy]
+            rings[-1].append(tuple(cursor))
+            pos += 2
+    return rings
+
+
+def _area(ring: list[tuple[int, int]]) -> float:
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1])) / 2.0
+
+
+def _circle(lon: float, lat: float, radius: float, vertices: int = 200) -> dict:
+    ring = [
+        [lon + radius * math.cos(2 * math.pi * k / vertices), lat + radius * math.sin(2 * math.pi * k / vertices)]
+        for k in range(vertices)
+    ]
+    return {'type': 'Polygon', 'coordinates': [ring + ring[:1]]}
+
+
+@pytest.fixture()
+def farm(db) -> Farm:
+    farm = Farm(name='Tile Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.commit()
+    return farm
+
+
+def test_tile_carries_latest_ndvi_bucket_and_recommendation(client, db, farm) -> None:
+    paddock = Paddock(farm_id=farm.id, name='North', geom_geojson=bbox_polygon((174.749, -36.851, 174.751, -36.849)))
+    hole = bbox_polygon((174.7495, -36.8505, 174.7505, -36.8495))['coordinates'][0]
+    paddock.geom_geojson = {**paddock.geom_geojson, 'coordinates': [*paddock.geom_geojson['coordinates'], hole]}
+    db.add(paddock)
+    db.flush()
+    for obs_date, ndvi, flag in (
+        (date(2026, 9, 1), 0.3, QualityFlag.OK),
+        (date(2026, 9, 8), 0.62, QualityFlag.CLOUDY),
+        (date(2026, 9, 15), 0.0, QualityFlag.NO_DATA),
+    ):
+        db.add(
+            PaddockObservation(
+                paddock_id=paddock.id, farm_id=farm.id, obs_date=obs_date, ndvi_mean=ndvi, quality_flag=flag
+            )
+        )
+    weeks = ((date(2026, 9, 7), RecommendationType.LOW_DATA), (date(2026, 9, 14), RecommendationType.GRAZE_NOW))
+    for week, rec_type in weeks:
+        rec = Recommendation(farm_id=farm.id, created_for_week_start=week, summary_md='-')
+        db.add(rec)
+        db.flush()
+        db.add(
+            PaddockRecommendation(
+                recommendation_id=rec.id, paddock_id=paddock.id, rec_type=rec_type, message='-', severity=Severity.info
+            )
+        )
+    db.commit()
+
+    response = client.get(f'/api/v1/tiles/paddocks/{Z}/{X}/{Y}.mvt')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/vnd.mapbox-vector-tile'
+    [feature] = _decode(response.content)['paddocks']
+    assert feature['type'] == 3
+    assert feature['properties'] == {
+        'id': paddock.id,
+        'farm_id': farm.id,
+        'name': 'North',
+        'ndvi_mean': 0.62,
+        'bucket': 'High',
+        'obs_date': '2026-09-08',
+        'rec_type': 'GRAZE_NOW',
+    }
+    exterior, interior = feature['rings']
+    assert _area(exterior) > 0 > _area(interior)
+
+
+def test_geometry_is_clipped_to_the_buffered_tile_and_simplified_by_zoom() -> None:
+    west, south, east, north = tile_bounds(Z, X, Y)
+    spanning = bbox_polygon((west - 0.01, south + 0.005, west + 0.005, south + 0.01))
+    [ring] = tile_rings(spanning, Z, X, Y)
+    assert ring[:, 0].min() == -TILE_BUFFER
+    assert ring.max() <= TILE_EXTENT + TILE_BUFFER
+    assert _area(ring.tolist()) > 0
+
+    circle = _circle(174.76, -36.84, 0.004)
+    detailed = tile_rings(circle, 16, 64582, 39990)
+    coarse = tile_rings(circle, 10, 1009, 624)
+    assert len(coarse[0]) < len(detailed[0]) <= 200
+    assert tile_rings(_circle(174.76, -36.84, 0.00001, vertices=8), 8, 252, 156) == []
+    assert tile_rings(bbox_polygon((east + 0.05, north, east + 0.06, north + 0.01)), Z, X, Y) == []
+
+
+def test_tiles_are_cached_and_invalidated_when_paddocks_change(client, db, farm) -> None:
+    path = f'/api/v1/tiles/paddocks/{Z}/{X}/{Y}.mvt'
+    assert client.get(path).status_code == 204
+    assert client.get('/api/v1/tiles/paddocks/4/15/9.mvt').status_code == 404
+    assert client.get(f'/api/v1/tiles/paddocks/{Z}/{2**Z}/{Y}.mvt').status_code == 404
+
+    created = client.post(
+        f'/api/v1/farms/{farm.id}/paddocks',
+        json={'name': 'East', 'geom_geojson': bbox_polygon((174.76, -36.845, 174.762, -36.843))},
+    ).json()['data']
+    first = client.get(path)
+    assert first.status_code == 200 and first.headers['x-tile-cache'] == 'miss'
+    assert client.get(path).headers['x-tile-cache'] == 'memory'
+    get_tile_cache()._memory.clear()
+    assert client.get(path).headers['x-tile-cache'] == 'disk'
+    assert client.get(f'{path}?farm_id={farm.id}').headers['x-tile-cache'] == 'miss'
+
+    client.patch(f"/api/v1/paddocks/{created['id']}", json={'name': 'East Renamed'})
+    renamed = client.get(path)
+    assert renamed.headers['x-tile-cache'] == 'miss'
+    assert _decode(renamed.content)['paddocks'][0]['properties']['name'] == 'East Renamed'
+
+    client.delete(f"/api/v1/paddocks/{created['id']}")
+    assert client.get(path).status_code == 204
+
+
+def test_invalidation_in_another_process_reaches_the_api(client, farm, monkeypatch) -> None:
+    geometry = bbox_polygon((174.76, -36.845, 174.762, -36.843))
+    client.post(f'/api/v1/farms/{farm.id}/paddocks', json={'name': 'East', 'geom_geojson': geometry})
+    path = f'/api/v1/tiles/paddocks/{Z}/{X}/{Y}.mvt'
+    assert client.get(path).headers['x-tile-cache'] == 'miss'
+
+    # A Celery worker holds its own TileCache over the same TILE_CACHE_DIR.
+    settings = get_settings()
+    worker_cache = TileCache(DiskLRUCache(settings.tile_cache_dir, 1024 * 1024), 16, 30.0)
+    with monkeypatch.context() as patch:
+        patch.setattr(vector_tiles, 'get_tile_cache', lambda: worker_cache)
+        assert invalidate_paddock_tiles([geometry]) > 0
+
+    assert client.get(path).headers['x-tile-cache'] == 'memory'
+    monkeypatch.setattr(get_tile_cache(), 'memory_ttl_seconds', 0.0)
+    assert client.get(path).headers['x-tile-cache'] == 'miss'
@@ -0,0 +1,48 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.farm import Farm
+from app.models.recommendation import Recommendation
+from app.workers import tasks
+from app.workers.celery_app import celery_app
+
+
+@pytest.fixture()
+def eager_celery(monkeypatch, session_factory):
+    monkeypatch.setattr(tasks, 'SessionLocal', session_factory)
+    monkeypatch.setattr(tasks.get_settings(), 'recommendation_fanout_chunk_size', 2)
+    monkeypatch.setitem(celery_app.conf, 'task_always_eager', True)
+    monkeypatch.setitem(celery_app.conf, 'task_eager_propagates', True)
+
+
+def test_fanout_generates_each_farm_and_reports_summary(db, eager_celery) -> None:
+    farms = [Farm(name=f'Farm {i}', latitude=-36.85, longitude=174.75) for i in range(5)]
+    db.add_all(farms)
+    db.commit()
+
+    chunks, result = tasks._dispatch_weekly_fanout([farm.id for farm in farms], '2026-01-05')
+    assert chunks == 3
+
+    summary = result.get()
+    assert summary['farm_count'] == 5
+    assert summary['succeeded'] == 5
+    assert set(summary['farm_durations_s']) == {farm.id for farm in farms}
+    count = db.scalar(
+        select(func.count()).select_from(Recommendation).where(Recommendation.created_for_week_start == date(2026, 1, 5))
+    )
+    assert count == 5
+
+
+def test_failed_farm_is_reported_without_stopping_the_chunk(db, eager_celery) -> None:
+    farm = Farm(name='Farm', latitude=-36.85, longitude=174.75)
+    db.add(farm)
+    db.commit()
+
+    results = tasks.generate_weekly_recommendations_chunk_task(['missing-farm', farm.id])
+    assert [result['status'] for result in results] == ['failed', 'success']
+
+    summary = tasks.summarize_weekly_recommendations([results], dispatched_at=0.0)
+    assert summary['failures'] == [{'farm_id': 'missing-farm', 'error': 'Farm not found.'}]
+    assert summary['succeeded'] == 1
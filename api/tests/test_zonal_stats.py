@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from app.services.raster import RasterGrid, read_band, write_band
+from app.services.zonal_stats import compute_ndvi, polygon_pixel_indices, zonal_ndvi_stats
+
+# 10 x 10 grid of 0.001 degree pixels with its top-left corner at (174.75, -36.84).
+GRID = RasterGrid(crs='EPSG:4326', transform=(0.001, 0.0, 174.75, 0.0, -0.001, -36.84), width=10, height=10)
+
+
+def _box(min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> list[list[float]]:
+    return [[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]]
+
+
+def test_polygon_pixel_indices_selects_pixel_centres() -> None:
+    geom = {'type': 'Polygon', 'coordinates': [_box(174.75, -36.844, 174.753, -36.84)]}
+    indices = polygon_pixel_indices(GRID, geom)
+    rows, cols = np.divmod(indices, GRID.width)
+    assert sorted(set(rows.tolist())) == [0, 1, 2, 3]
+    assert sorted(set(cols.tolist())) == [0, 1, 2]
+    assert len(indices) == 12
+
+
+def test_polygon_pixel_indices_honours_holes_and_multipolygons() -> None:
+    outer = _box(174.75, -36.85, 174.76, -36.84)
+    hole = _box(174.752, -36.848, 174.758, -36.842)
+    with_hole = polygon_pixel_indices(GRID, {'type': 'Polygon', 'coordinates': [outer, hole]})
+    assert len(with_hole) == 100 - 36
+
+    multi = {
+        'type': 'MultiPolygon',
+        'coordinates': [[_box(174.75, -36.842, 174.752, -36.84)], [_box(174.758, -36.85, 174.76, -36.848)]],
+    }
+    assert len(polygon_pixel_indices(GRID, multi)) == 8
+
+
+def test_polygon_outside_grid_is_empty() -> None:
+    geom = {'type': 'Polygon', 'coordinates': [_box(175.0, -37.0, 175.1, -36.9)]}
+    assert len(polygon_pixel_indices(GRID, geom)) == 0
+
+
+def test_zonal_stats_match_numpy_reference() -> None:
+    rng = np.random.default_rng(7)
+    red = rng.integers(200, 1500, size=(10, 10)).astype(np.uint16)
+    nir = rng.integers(1500, 4000, size=(10, 10)).astype(np.uint16)
+    mask = np.zeros((10, 10), dtype=np.uint8)
+    mask[0, :5] = 1
+
+    ndvi = compute_ndvi(red, nir, mask)
+    zones = [np.arange(0, 20), np.arange(50, 100), np.arange(0, 5), np.empty(0, dtype=np.int64)]
+    stats = zonal_ndvi_stats(ndvi, zones)
+
+    for zone, result in zip(zones[:2], stats[:2]):
+        values = ndvi.ravel()[zone]
+        values = values[~np.isnan(values)].astype(np.float64)
+        assert result.mean == pytest.approx(values.mean())
+        assert result.p10 == pytest.approx(np.percentile(values, 10))
+        assert result.p50 == pytest.approx(np.percentile(values, 50))
+        assert result.p90 == pytest.approx(np.percentile(values, 90))
+
+    assert stats[0].valid_pixels == 15
+    assert stats[0].invalid_pct == pytest.approx(25.0)
+    assert stats[2].mean is None and stats[2].invalid_pct == 100.0
+    assert stats[3].total_pixels == 0
+
+
+def test_read_band_round_trips_numpy_and_geotiff(tmp_path) -> None:
+    band = np.arange(100, dtype=np.uint16).reshape(10, 10)
+    uri = str(tmp_path / 'red.npy')
+    write_band(uri, band, GRID)
+    loaded, grid = read_band(uri)
+    assert grid == GRID
+    assert np.array_equal(loaded, band)
+
+    rasterio = pytest.importorskip('rasterio')
+    from rasterio.transform import Affine
+
+    tif_path = tmp_path / 'red.tif'
+    with rasterio.open(
+        tif_path, 'w', driver='GTiff', width=10, height=10, count=1, dtype='uint16', crs='EPSG:4326',
+        transform=Affine(*GRID.transform),
+    ) as dataset:
+        dataset.write(band, 1)
+    loaded, grid = read_band(str(tif_path))
+    assert grid.transform == pytest.approx(GRID.transform)
+    assert np.array_equal(loaded, band)
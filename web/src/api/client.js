@@ -15,6 +15,14 @@ async function request(path, options = {}) {
   return response.json();
 }
 
+export function paddockTileUrl(farmId) {
+  return `${API_BASE}/tiles/paddocks/{z}/{x}/{y}.mvt?farm_id=${encodeURIComponent(farmId)}`;
+}
+
+export function ndviTileUrl(sceneId) {
+  return `${API_BASE}/tiles/scenes/${encodeURIComponent(sceneId)}/ndvi/{z}/{x}/{y}.png`;
+}
+
 export async function getFarms() {
   return request('/farms');
 }
@@ -24,7 +32,18 @@ export async function createFarm(payload) {
 }
 
 export async function getPaddocks(farmId) {
-  return request(`/farms/${farmId}/paddocks`);
+  const data = [];
+  let cursor = null;
+  do {
+    const query = new URLSearchParams({ limit: '500' });
+    if (cursor) {
+      query.set('cursor', cursor);
+    }
+    const page = await request(`/farms/${farmId}/paddocks?${query}`);
+    data.push(...page.data);
+    cursor = page.meta?.next_cursor;
+  } while (cursor);
+  return { data, meta: { count: data.length } };
 }
 
 export async function importPaddocks(farmId, featureCollection) {
@@ -42,10 +61,26 @@ export async function getObservationsByDate(farmId, date) {
   return request(`/farms/${farmId}/observations?date=${date}`);
 }
 
+export async function getScenes(farmId) {
+  return request(`/farms/${farmId}/scenes`);
+}
+
 export async function getPaddockSeries(paddockId) {
   return request(`/paddocks/${paddockId}/observations`);
 }
 
+export async function getFarmSeries(farmId, { since, maxPoints } = {}) {
+  const query = new URLSearchParams();
+  if (since) {
+    query.set('since', since);
+  }
+  if (maxPoints) {
+    query.set('max_points', String(maxPoints));
+  }
+  const suffix = query.toString() ? `?${query}` : '';
+  return request(`/farms/${farmId}/observations/series${suffix}`);
+}
+
 export async function getWeather(farmId) {
   return request(`/farms/${farmId}/weather/forecast`);
 }
@@ -54,6 +89,10 @@ export async function triggerIngest(farmId) {
   return request(`/farms/${farmId}/jobs/ingest`, { method: 'POST' });
 }
 
+export async function getJobRun(runId) {
+  return request(`/jobs/runs/${runId}`);
+}
+
 export async function getLatestRecommendation(farmId) {
   return request(`/farms/${farmId}/recommendations/latest`);
 }
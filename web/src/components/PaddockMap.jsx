@@ -2,6 +2,8 @@ import { useEffect, useRef } from 'react';
 import mapboxgl from 'mapbox-gl';
 import 'mapbox-gl/dist/mapbox-gl.css';
 
+import { ndviTileUrl, paddockTileUrl } from '../api/client';
+
 const COLORS = {
   'Very Low': '#8b0000',
   Low: '#dd6b20',
@@ -9,28 +11,74 @@ const COLORS = {
   High: '#2f855a',
 };
 
-function toFeatureCollection(paddocks, observations) {
-  const obsByPaddockId = new Map(observations.map((item) => [item.paddock_id, item]));
-  return {
-    type: 'FeatureCollection',
-    features: paddocks.map((paddock) => {
-      const obs = obsByPaddockId.get(paddock.id);
-      const bucket = obs?.bucket || 'Low';
-      return {
-        type: 'Feature',
-        geometry: paddock.geom_geojson,
-        properties: {
-          id: paddock.id,
-          name: paddock.name,
-          bucket,
-          fill: COLORS[bucket] || COLORS.Low,
-        },
-      };
-    }),
-  };
+// Tiles carry each paddock's latest bucket; a date picked in the toolbar overrides it via feature state.
+const BUCKET_COLOR = [
+  'match',
+  ['coalesce', ['feature-state', 'bucket'], ['get', 'bucket'], 'Low'],
+  ...Object.entries(COLORS).flat(),
+  COLORS.Low,
+];
+
+function addPaddockLayers(map, farmId) {
+  map.addSource('paddocks', {
+    type: 'vector',
+    tiles: [paddockTileUrl(farmId)],
+    minzoom: 8,
+    maxzoom: 16,
+    promoteId: 'id',
+  });
+  map.addLayer({
+    id: 'paddock-fill',
+    type: 'fill',
+    source: 'paddocks',
+    'source-layer': 'paddocks',
+    paint: {
+      'fill-color': BUCKET_COLOR,
+      'fill-opacity': 0.65,
+    },
+  });
+  map.addLayer({
+    id: 'paddock-line',
+    type: 'line',
+    source: 'paddocks',
+    'source-layer': 'paddocks',
+    paint: {
+      'line-color': '#1a202c',
+      'line-width': 1.5,
+    },
+  });
 }
 
-export default function PaddockMap({ paddocks, observations, onSelectPaddock, fallbackCenter }) {
+// The selected date's NDVI raster sits under the paddock outlines, replacing the bucket fill while shown.
+function applyScene(map, sceneId) {
+  if (map.getLayer('ndvi-raster')) {
+    map.removeLayer('ndvi-raster');
+  }
+  if (map.getSource('ndvi')) {
+    map.removeSource('ndvi');
+  }
+  map.setPaintProperty('paddock-fill', 'fill-opacity', sceneId ? 0 : 0.65);
+  if (!sceneId) {
+    return;
+  }
+  map.addSource('ndvi', {
+    type: 'raster',
+    tiles: [ndviTileUrl(sceneId)],
+    tileSize: 256,
+    minzoom: 10,
+    maxzoom: 18,
+  });
+  map.addLayer({ id: 'ndvi-raster', type: 'raster', source: 'ndvi' }, 'paddock-line');
+}
+
+function applyObservations(map, observations) {
+  map.removeFeatureState({ source: 'paddocks', sourceLayer: 'paddocks' });
+  observations.forEach((obs) => {
+    map.setFeatureState({ source: 'paddocks', sourceLayer: 'paddocks', id: obs.paddock_id }, { bucket: obs.bucket });
+  });
+}
+
+export default function PaddockMap({ farmId, sceneId, observations, onSelectPaddock, fallbackCenter }) {
   const containerRef = useRef(null);
   const mapRef = useRef(null);
   const token = import.meta.env.VITE_MAPBOX_TOKEN;
@@ -48,35 +96,11 @@ export default function PaddockMap({ paddocks, observations, onSelectPaddock, fa
       zoom: 13,
     });
 
-    mapRef.current.on('load', () => {
-      mapRef.current.addSource('paddocks', {
-        type: 'geojson',
-        data: toFeatureCollection(paddocks, observations),
-      });
-      mapRef.current.addLayer({
-        id: 'paddock-fill',
-        type: 'fill',
-        source: 'paddocks',
-        paint: {
-          'fill-color': ['get', 'fill'],
-          'fill-opacity': 0.65,
-        },
-      });
-      mapRef.current.addLayer({
-        id: 'paddock-line',
-        type: 'line',
-        source: 'paddocks',
-        paint: {
-          'line-color': '#1a202c',
-          'line-width': 1.5,
-        },
-      });
-      mapRef.current.on('click', 'paddock-fill', (event) => {
-        const feature = event.features?.[0];
-        if (feature?.properties?.id) {
-          onSelectPaddock(feature.properties.id);
-        }
-      });
+    mapRef.current.on('click', 'paddock-fill', (event) => {
+      const feature = event.features?.[0];
+      if (feature?.properties?.id) {
+        onSelectPaddock(feature.properties.id);
+      }
     });
 
     return () => {
@@ -86,15 +110,23 @@ export default function PaddockMap({ paddocks, observations, onSelectPaddock, fa
   }, [token]);
 
   useEffect(() => {
-    if (!mapRef.current) {
+    if (!mapRef.current || !farmId) {
       return;
     }
 
     const updateSource = () => {
-      const source = mapRef.current?.getSource('paddocks');
+      const map = mapRef.current;
+      if (!map) {
+        return;
+      }
+      const source = map.getSource('paddocks');
       if (source) {
-        source.setData(toFeatureCollection(paddocks, observations));
+        source.setTiles([paddockTileUrl(farmId)]);
+      } else {
+        addPaddockLayers(map, farmId);
       }
+      applyObservations(map, observations);
+      applyScene(map, sceneId);
     };
 
     if (mapRef.current.isStyleLoaded()) {
@@ -103,7 +135,7 @@ export default function PaddockMap({ paddocks, observations, onSelectPaddock, fa
     }
 
     mapRef.current.once('load', updateSource);
-  }, [paddocks, observations]);
+  }, [farmId, sceneId, observations]);
 
   if (!token) {
     return (
@@ -1,6 +1,12 @@
 import { useEffect, useState } from 'react';
 
-import { getFarms, getLatestRecommendation, getWeather, triggerIngest } from '../api/client';
+import { getFarms, getJobRun, getLatestRecommendation, getWeather, triggerIngest } from '../api/client';
+
+const POLL_INTERVAL_MS = 1500;
+
+function wait(ms) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
 
 export default function DashboardPage() {
   const [farm, setFarm] = useState(null);
@@ -9,6 +15,7 @@ export default function DashboardPage() {
   const [error, setError] = useState('');
   const [isLoading, setIsLoading] = useState(true);
   const [isRunning, setIsRunning] = useState(false);
+  const [pipelineRun, setPipelineRun] = useState(null);
 
   useEffect(() => {
     async function load() {
@@ -49,8 +56,19 @@ export default function DashboardPage() {
       return;
     }
     setIsRunning(true);
+    setError('');
     try {
-      await triggerIngest(farm.id);
+      const started = await triggerIngest(farm.id);
+      let run = started.data;
+      setPipelineRun(run);
+      while (!run.done) {
+        await wait(POLL_INTERVAL_MS);
+        run = (await getJobRun(run.run_id || run.id)).data;
+        setPipelineRun(run);
+      }
+      if (run.status === 'failed') {
+        throw new Error(run.error || 'Pipeline failed');
+      }
       const recommendationResponse = await getLatestRecommendation(farm.id);
       setRecommendation(recommendationResponse.data);
       const weatherResponse = await getWeather(farm.id);
@@ -76,8 +94,17 @@ export default function DashboardPage() {
         <h2>{farm.name}</h2>
         <p className="muted">{farm.description || 'No description yet.'}</p>
         <button onClick={onRunPipeline} disabled={isRunning}>
-          {isRunning ? 'Running pipeline...' : 'Run Data Pipeline'}
+          {isRunning ? `Running pipeline... ${Math.round((pipelineRun?.progress || 0) * 100)}%` : 'Run Data Pipeline'}
         </button>
+        {pipelineRun && (
+          <ul className="muted">
+            {pipelineRun.stages.map((stage) => (
+              <li key={stage.name}>
+                {stage.name}: {stage.status}
+              </li>
+            ))}
+          </ul>
+        )}
       </article>
 
       <article className="card">
@@ -4,9 +4,10 @@ import {
   getFarms,
   getObservationDates,
   getObservationsByDate,
+  getFarmSeries,
   getPaddocks,
-  getPaddockSeries,
   getLatestRecommendation,
+  getScenes,
 } from '../api/client';
 import PaddockMap from '../components/PaddockMap';
 import TrendChart from '../components/TrendChart';
@@ -17,8 +18,9 @@ export default function MapPage() {
   const [dates, setDates] = useState([]);
   const [selectedDate, setSelectedDate] = useState('');
   const [observations, setObservations] = useState([]);
+  const [scenes, setScenes] = useState([]);
   const [selectedPaddockId, setSelectedPaddockId] = useState('');
-  const [series, setSeries] = useState(null);
+  const [seriesByPaddock, setSeriesByPaddock] = useState({});
   const [recommendations, setRecommendations] = useState([]);
   const [error, setError] = useState('');
 
@@ -32,10 +34,11 @@ export default function MapPage() {
         }
         setFarm(firstFarm);
 
-        const [paddockResponse, datesResponse, recResponse] = await Promise.all([
+        const [paddockResponse, datesResponse, recResponse, sceneResponse] = await Promise.all([
           getPaddocks(firstFarm.id),
           getObservationDates(firstFarm.id),
           getLatestRecommendation(firstFarm.id).catch(() => ({ data: null })),
+          getScenes(firstFarm.id).catch(() => ({ data: [] })),
         ]);
 
         const paddockList = paddockResponse.data || [];
@@ -52,6 +55,7 @@ export default function MapPage() {
 
         const recRows = recResponse.data?.paddock_recommendations || [];
         setRecommendations(recRows);
+        setScenes(sceneResponse.data || []);
       } catch (loadError) {
         setError(loadError.message);
       }
@@ -78,25 +82,33 @@ export default function MapPage() {
 
   useEffect(() => {
     async function loadSeries() {
-      if (!selectedPaddockId) {
+      if (!farm) {
         return;
       }
       try {
-        const response = await getPaddockSeries(selectedPaddockId);
-        setSeries(response.data || null);
+        const response = await getFarmSeries(farm.id, { maxPoints: 120 });
+        const entries = response.data || [];
+        setSeriesByPaddock(Object.fromEntries(entries.map((entry) => [entry.paddock_id, entry])));
       } catch (loadError) {
         setError(loadError.message);
       }
     }
 
     loadSeries();
-  }, [selectedPaddockId]);
+  }, [farm]);
+
+  const series = seriesByPaddock[selectedPaddockId] || null;
 
   const selectedPaddock = useMemo(
     () => paddocks.find((paddock) => paddock.id === selectedPaddockId),
     [paddocks, selectedPaddockId]
   );
 
+  const selectedScene = useMemo(
+    () => scenes.find((scene) => scene.scene_date === selectedDate && scene.has_bands),
+    [scenes, selectedDate]
+  );
+
   const selectedRecommendation = useMemo(
     () => recommendations.find((row) => row.paddock_id === selectedPaddockId),
     [recommendations, selectedPaddockId]
@@ -119,7 +131,8 @@ export default function MapPage() {
           </label>
         </div>
         <PaddockMap
-          paddocks={paddocks}
+          farmId={farm?.id}
+          sceneId={selectedScene?.id}
           observations={observations}
           onSelectPaddock={setSelectedPaddockId}
           fallbackCenter={farm ? [farm.longitude, farm.latitude] : [174.76, -36.85]}
@@ -64,7 +64,11 @@ export default function SetupPage() {
       }
       const parsed = JSON.parse(featureCollectionText);
       const response = await importPaddocks(targetFarmId, parsed);
-      setMessage(`Imported ${response.meta.count} paddocks.`);
+      if (response.data?.run_id) {
+        setMessage(`Large import queued as job ${response.data.run_id}.`);
+      } else {
+        setMessage(`Imported ${response.meta.count} paddocks.`);
+      }
     } catch (importError) {
       setError(importError.message);
     }